@@ -17,8 +17,11 @@ def build_graph() -> Digraph:
 
     dot.node("start", "Start", shape="circle", fillcolor="#111827")
     dot.node("reasoning", "Reasoning")
-    dot.node("schema_retrieval", "Schema Retrieval")
+    dot.node("schema_prefetch", "Schema Prefetch")
+    dot.node("schema_retrieval", "Schema Join")
+    dot.node("planning", "Template Routing")
     dot.node("sql_generation", "SQL Generation")
+    dot.node("preflight", "Dry-run Preflight")
     dot.node("execution", "Execution")
     dot.node("visualization", "Visualization")
     dot.node("insights", "Insights")
@@ -26,12 +29,20 @@ def build_graph() -> Digraph:
     dot.node("error_end", "Error End", shape="doublecircle", fillcolor="#ef4444")
 
     dot.edge("start", "reasoning")
+    dot.edge("start", "schema_prefetch", label="parallel")
     dot.edge("reasoning", "schema_retrieval")
-    dot.edge("schema_retrieval", "sql_generation")
-    dot.edge("sql_generation", "execution")
+    dot.edge("schema_prefetch", "schema_retrieval")
+    dot.edge("schema_retrieval", "planning")
+    dot.edge("planning", "preflight", label="template / memo hit")
+    dot.edge("planning", "sql_generation", label="no hit")
+    dot.edge("sql_generation", "preflight")
+    dot.edge("preflight", "execution", label="execute / sample")
+    dot.edge("preflight", "sql_generation", label="regenerate", style="dashed")
+    dot.edge("preflight", "error_end", label="attempts exhausted", style="dashed")
     dot.edge("execution", "visualization", label="validation_passed")
     dot.edge("visualization", "insights")
     dot.edge("insights", "end")
+    dot.edge("execution", "sql_generation", label="job failed (retry)", style="dashed")
     dot.edge("execution", "error_end", label="validation_failed", style="dashed")
 
     return dot
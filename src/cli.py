@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
 from rich.console import Console
@@ -11,18 +13,38 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
-from .graph import compile_agent
-from .models.state import AgentState
+from .constants import DEFAULT_BATCH_CONCURRENCY
+from .graph import compile_agent, compile_async_agent
+from .models.state import AgentState, LLMUsage
+from .services.batch_runner import BatchSummary, load_questions, run_batch
+from .services.chart_renderer import ensure_chart_image, shutdown_chart_renderer
+from .services.intent_classifier import SEED_EXAMPLES, IntentModel, load_labelled_queries
+from .services.tracing import trace_request
+
+
 app = typer.Typer(help="LangGraph Data Analysis Agent CLI")
 console = Console()
 
 
+@app.callback(invoke_without_command=True)
+def main(ctx: typer.Context) -> None:
+    """Start the interactive chat when no command is given."""
+
+    if ctx.invoked_subcommand is None:
+        chat(save_chart=None, png=False)
+
+
 @app.command()
 def chat(
     save_chart: Optional[Path] = typer.Option(
         None,
         help="Optional path to write the latest chart JSON output.",
     ),
+    png: bool = typer.Option(
+        False,
+        "--png",
+        help="Export a PNG for every chart, even when CHART_IMAGE_MODE=on_demand.",
+    ),
 ) -> None:
     """Interactive chat loop for querying the agent."""
 
@@ -68,11 +90,96 @@ def chat(
             "validation_passed": False,
         }
 
-        result = agent.invoke(state)
-        _display_result(result, save_chart)
+        with trace_request(query):
+            result = agent.invoke(state)
+        _display_result(result, save_chart, png)
+
+
+@app.command()
+def batch(
+    input_path: Path = typer.Argument(..., exists=True, dir_okay=False, help="Questions as JSONL or CSV."),
+    output_path: Path = typer.Option(
+        Path("batch_results.jsonl"),
+        "--output",
+        "-o",
+        help="JSONL file results are appended to as they complete.",
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_BATCH_CONCURRENCY,
+        min=1,
+        help="Questions processed at the same time.",
+    ),
+    resume: bool = typer.Option(
+        True,
+        help="Skip questions whose ids are already in the output file.",
+    ),
+) -> None:
+    """Answer every question in a file and stream results to JSONL."""
+
+    questions = load_questions(input_path)
+    console.print(f"Loaded {len(questions)} questions from {input_path}")
+
+    async def _run() -> BatchSummary:
+        # Thread-offloaded work (BigQuery polling, plotting) scales with the concurrency too
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=max(concurrency, 4)))
+        return await run_batch(compile_async_agent(), questions, output_path, concurrency, resume=resume)
+
+    summary = asyncio.run(_run())
+    # Background PNG exports may still be running; let them finish before exiting
+    shutdown_chart_renderer()
+    _display_batch_summary(summary, output_path)
+
+
+@app.command("train-intents")
+def train_intents(
+    log_paths: List[Path] = typer.Argument(..., exists=True, dir_okay=False, help="Batch/request logs (JSONL)."),
+    output_path: Path = typer.Option(
+        Path(".cache/intent_model.json"),
+        "--output",
+        "-o",
+        help="Where to write the model; point INTENT_MODEL_PATH at it.",
+    ),
+) -> None:
+    """Train the local intent classifier from logged LLM classifications."""
 
+    examples = load_labelled_queries(log_paths)
+    IntentModel.train(list(SEED_EXAMPLES) + examples).save(output_path)
+    console.print(f"Trained on {len(examples)} logged questions (+{len(SEED_EXAMPLES)} seeds); wrote {output_path}")
 
-def _display_result(result: AgentState, save_chart: Optional[Path]) -> None:
+
+def _display_batch_summary(summary: BatchSummary, output_path: Path) -> None:
+    processed = summary["completed"] + summary["failed"]
+    rate = processed / summary["elapsed_sec"] if summary["elapsed_sec"] else 0.0
+    console.print(
+        Panel.fit(
+            f"Completed: {summary['completed']}  Failed: {summary['failed']}  "
+            f"Skipped (resumed): {summary['skipped']}\n"
+            f"SQL from templates: {summary['template_hit_rate']:.0%}\n"
+            f"Elapsed: {summary['elapsed_sec']:.1f}s ({rate:.2f} questions/s)\n"
+            f"Results: {output_path}",
+            title="Batch Summary",
+            style="bold cyan",
+        )
+    )
+
+    if summary["node_latency"]:
+        table = Table(title="Node Latency (ms)")
+        for column in ("Node", "Count", "Mean", "p50", "p95", "Max"):
+            table.add_column(column, justify="left" if column == "Node" else "right")
+        for node, stats in summary["node_latency"].items():
+            table.add_row(
+                node,
+                str(stats["count"]),
+                f"{stats['mean_ms']:.1f}",
+                f"{stats['p50_ms']:.1f}",
+                f"{stats['p95_ms']:.1f}",
+                f"{stats['max_ms']:.1f}",
+            )
+        console.print(table)
+
+
+def _display_result(result: AgentState, save_chart: Optional[Path], png: bool = False) -> None:
     console.print(Panel.fit(f"Analysis type: {result.get('analysis_type', 'unknown')}", style="bold blue"))
     console.print(f"Plan: {result.get('analysis_plan', 'N/A')}")
 
@@ -82,9 +189,20 @@ def _display_result(result: AgentState, save_chart: Optional[Path]) -> None:
         table.add_column("Metric")
         table.add_column("Value")
         for key, value in metrics.items():
+            if key == "llm_usage":
+                # One row per node so the most expensive prompts stand out
+                for node, usage in value.items():
+                    table.add_row(f"llm_tokens.{node}", _format_llm_usage(usage))
+                continue
             table.add_row(key, str(value))
         console.print(table)
 
+    sample_percent = metrics.get("sample_percent")
+    if sample_percent:
+        console.print(
+            f"[yellow]Results come from a {sample_percent}% table sample of a query too large to scan in full.[/yellow]"
+        )
+
     insights = result.get("insights")
     if insights:
         console.print(Panel(insights, title="Insights", style="bold cyan"))
@@ -99,7 +217,10 @@ def _display_result(result: AgentState, save_chart: Optional[Path]) -> None:
             save_chart.write_text(chart_json, encoding="utf-8")
             console.print(f"Chart JSON written to {save_chart}")
 
+    # The PNG is exported in the background while the text above is printed
     chart_image_path = result.get("chart_image_path")
+    if not chart_image_path and (png or result.get("chart_image_pending")):
+        chart_image_path = ensure_chart_image(result)
     if chart_image_path:
         console.print(
             f"Chart image saved to [link=file://{chart_image_path}]open image[/link] "
@@ -107,6 +228,18 @@ def _display_result(result: AgentState, save_chart: Optional[Path]) -> None:
         )
 
 
+def _format_llm_usage(usage: LLMUsage) -> str:
+    text = (
+        f"{usage['prompt_tokens']} prompt + {usage['completion_tokens']} completion "
+        f"in {usage['calls']} call{'s' if usage['calls'] != 1 else ''}"
+    )
+    if "cost_usd" in usage:
+        text += f", ${usage['cost_usd']:.4f}"
+    if usage.get("estimated_calls"):
+        text += " (estimated)"
+    return text
+
+
 if __name__ == "__main__":
     app()
 
@@ -9,10 +9,40 @@ from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from .constants import (
+    DEFAULT_BIGQUERY_HTTP_POOL_SIZE,
+    DEFAULT_BIGQUERY_MAX_ROWS,
+    DEFAULT_BIGQUERY_PAGE_SIZE,
+    DEFAULT_CHART_MAX_POINTS,
+    DEFAULT_CHART_RENDER_WORKERS,
+    DEFAULT_PREFLIGHT_REGENERATE_ABOVE_BYTES,
+    DEFAULT_PREFLIGHT_SAMPLE_ABOVE_BYTES,
+    DEFAULT_SQL_MAX_ATTEMPTS,
+    DEFAULT_SQL_MEMO_MAX_ENTRIES,
     DEFAULT_GOOGLE_MODEL,
+    DEFAULT_INSIGHTS_TOKEN_BUDGET,
+    DEFAULT_INTENT_CONFIDENCE_THRESHOLD,
+    DEFAULT_LLM_CACHE_MAX_ENTRIES,
+    DEFAULT_LLM_CACHE_NODES,
+    DEFAULT_LLM_CACHE_TTL_SEC,
     DEFAULT_MAX_BYTES_BILLED,
     DEFAULT_OPENAI_MODEL,
+    DEFAULT_QUERY_CACHE_MAX_BYTES,
+    DEFAULT_QUERY_CACHE_TTL_SEC,
+    DEFAULT_SCHEMA_CACHE_MAX_ENTRIES,
+    DEFAULT_SCHEMA_CACHE_TTL_SEC,
+    DEFAULT_SCHEMA_CONTEXT_TOKEN_BUDGET,
+    DEFAULT_SCHEMA_MODIFIED_CHECK_SEC,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_MAX_QUEUE,
+    DEFAULT_SERVER_PORT,
+    DEFAULT_SERVER_WORKERS,
+    DEFAULT_TABLE_INDEX_MAX_TABLES,
+    DEFAULT_TRACE_MAX_BYTES,
+    BigQueryBackend,
+    ChartImageMode,
+    FetchMode,
     LLMProvider,
+    SQLRoutingMode,
 )
 
 
@@ -39,6 +69,85 @@ class Settings(BaseSettings):
         alias="BIGQUERY_MAX_BYTES",
     )
     bigquery_location: Optional[str] = Field(default=None, alias="BIGQUERY_LOCATION")
+    bigquery_backend: BigQueryBackend = Field(
+        default=BigQueryBackend.BIGQUERY,
+        alias="BIGQUERY_BACKEND",
+    )
+    bigquery_fetch_mode: FetchMode = Field(default=FetchMode.ARROW, alias="BIGQUERY_FETCH_MODE")
+    bigquery_max_rows: int = Field(default=DEFAULT_BIGQUERY_MAX_ROWS, alias="BIGQUERY_MAX_ROWS")
+    bigquery_page_size: int = Field(default=DEFAULT_BIGQUERY_PAGE_SIZE, alias="BIGQUERY_PAGE_SIZE")
+    bigquery_use_storage_api: bool = Field(default=False, alias="BIGQUERY_USE_STORAGE_API")
+    bigquery_http_pool_size: int = Field(
+        default=DEFAULT_BIGQUERY_HTTP_POOL_SIZE,
+        alias="BIGQUERY_HTTP_POOL_SIZE",
+    )
+    schema_cache_ttl_sec: int = Field(
+        default=DEFAULT_SCHEMA_CACHE_TTL_SEC,
+        alias="SCHEMA_CACHE_TTL_SEC",
+    )
+    schema_cache_max_entries: int = Field(
+        default=DEFAULT_SCHEMA_CACHE_MAX_ENTRIES,
+        alias="SCHEMA_CACHE_MAX_ENTRIES",
+    )
+    schema_modified_check_sec: int = Field(
+        default=DEFAULT_SCHEMA_MODIFIED_CHECK_SEC,
+        alias="SCHEMA_MODIFIED_CHECK_SEC",
+    )
+    schema_cache_dir: Optional[str] = Field(default=None, alias="SCHEMA_CACHE_DIR")
+    schema_cache_persist: bool = Field(default=True, alias="SCHEMA_CACHE_PERSIST")
+    table_index_path: Optional[str] = Field(default=None, alias="TABLE_INDEX_PATH")
+    table_index_max_tables: int = Field(default=DEFAULT_TABLE_INDEX_MAX_TABLES, alias="TABLE_INDEX_MAX_TABLES")
+    query_cache_enabled: bool = Field(default=True, alias="QUERY_CACHE_ENABLED")
+    query_cache_ttl_sec: int = Field(
+        default=DEFAULT_QUERY_CACHE_TTL_SEC,
+        alias="QUERY_CACHE_TTL_SEC",
+    )
+    query_cache_max_bytes: int = Field(
+        default=DEFAULT_QUERY_CACHE_MAX_BYTES,
+        alias="QUERY_CACHE_MAX_BYTES",
+    )
+    query_cache_dir: Optional[str] = Field(default=None, alias="QUERY_CACHE_DIR")
+    intent_classifier_enabled: bool = Field(default=True, alias="INTENT_CLASSIFIER_ENABLED")
+    intent_confidence_threshold: float = Field(
+        default=DEFAULT_INTENT_CONFIDENCE_THRESHOLD,
+        alias="INTENT_CONFIDENCE_THRESHOLD",
+    )
+    intent_model_path: Optional[str] = Field(default=None, alias="INTENT_MODEL_PATH")
+    llm_cache_enabled: bool = Field(default=True, alias="LLM_CACHE_ENABLED")
+    llm_cache_ttl_sec: int = Field(default=DEFAULT_LLM_CACHE_TTL_SEC, alias="LLM_CACHE_TTL_SEC")
+    llm_cache_max_entries: int = Field(default=DEFAULT_LLM_CACHE_MAX_ENTRIES, alias="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_path: Optional[str] = Field(default=None, alias="LLM_CACHE_PATH")
+    llm_cache_nodes: str = Field(default=DEFAULT_LLM_CACHE_NODES, alias="LLM_CACHE_NODES")
+    preflight_enabled: bool = Field(default=True, alias="PREFLIGHT_ENABLED")
+    preflight_sample_above_bytes: int = Field(
+        default=DEFAULT_PREFLIGHT_SAMPLE_ABOVE_BYTES,
+        alias="PREFLIGHT_SAMPLE_ABOVE_BYTES",
+    )
+    preflight_regenerate_above_bytes: int = Field(
+        default=DEFAULT_PREFLIGHT_REGENERATE_ABOVE_BYTES,
+        alias="PREFLIGHT_REGENERATE_ABOVE_BYTES",
+    )
+    sql_routing_mode: SQLRoutingMode = Field(default=SQLRoutingMode.HYBRID, alias="SQL_ROUTING_MODE")
+    sql_memo_enabled: bool = Field(default=True, alias="SQL_MEMO_ENABLED")
+    sql_memo_path: Optional[str] = Field(default=None, alias="SQL_MEMO_PATH")
+    sql_memo_max_entries: int = Field(default=DEFAULT_SQL_MEMO_MAX_ENTRIES, alias="SQL_MEMO_MAX_ENTRIES")
+    sql_max_attempts: int = Field(default=DEFAULT_SQL_MAX_ATTEMPTS, alias="SQL_MAX_ATTEMPTS")
+    sql_local_validation: bool = Field(default=True, alias="SQL_LOCAL_VALIDATION")
+    tracing_enabled: bool = Field(default=True, alias="TRACING_ENABLED")
+    trace_export_path: Optional[str] = Field(default=None, alias="TRACE_EXPORT_PATH")
+    trace_max_bytes: int = Field(default=DEFAULT_TRACE_MAX_BYTES, alias="TRACE_MAX_BYTES")
+    chart_max_points: int = Field(default=DEFAULT_CHART_MAX_POINTS, alias="CHART_MAX_POINTS")
+    chart_image_mode: ChartImageMode = Field(default=ChartImageMode.BACKGROUND, alias="CHART_IMAGE_MODE")
+    chart_render_workers: int = Field(default=DEFAULT_CHART_RENDER_WORKERS, alias="CHART_RENDER_WORKERS")
+    insights_token_budget: int = Field(default=DEFAULT_INSIGHTS_TOKEN_BUDGET, alias="INSIGHTS_TOKEN_BUDGET")
+    schema_context_token_budget: int = Field(
+        default=DEFAULT_SCHEMA_CONTEXT_TOKEN_BUDGET,
+        alias="SCHEMA_CONTEXT_TOKEN_BUDGET",
+    )
+    server_host: str = Field(default=DEFAULT_SERVER_HOST, alias="SERVER_HOST")
+    server_port: int = Field(default=DEFAULT_SERVER_PORT, alias="SERVER_PORT")
+    server_workers: int = Field(default=DEFAULT_SERVER_WORKERS, alias="SERVER_WORKERS")
+    server_max_queue: int = Field(default=DEFAULT_SERVER_MAX_QUEUE, alias="SERVER_MAX_QUEUE")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -22,11 +22,53 @@ class ChartType(str, Enum):
     SCATTER = "scatter"
 
 
+class ChartImageMode(str, Enum):
+    """When the visualization node exports the chart PNG."""
+
+    SYNC = "sync"
+    BACKGROUND = "background"
+    ON_DEMAND = "on_demand"
+
+
+class SQLRoutingMode(str, Enum):
+    """How SQL is produced for a classified question."""
+
+    HYBRID = "hybrid"
+    """Parameterized template when one covers the question, LLM otherwise"""
+    LLM = "llm"
+    TEMPLATE = "template"
+    """Never call the LLM; uncovered questions get the analysis type's default SQL"""
+
+
+class BigQueryBackend(str, Enum):
+    """Backends that can serve BigQuery client calls."""
+
+    BIGQUERY = "bigquery"
+    FAKE = "fake"
+
+
+class FetchMode(str, Enum):
+    """How query results are downloaded from BigQuery."""
+
+    ARROW = "arrow"
+    DATAFRAME = "dataframe"
+
+
+class PreflightRoute(str, Enum):
+    """Routing decisions made by the dry-run preflight stage."""
+
+    EXECUTE = "execute"
+    SAMPLE = "sample"
+    REGENERATE = "regenerate"
+    ERROR = "error"
+
+
 class LLMProvider(str, Enum):
     """LLM providers available for the agent."""
 
     GOOGLE = "google"
     OPENAI = "openai"
+    FAKE = "fake"
 
 
 SUPPORTED_ANALYSIS_TYPES: Final[tuple[AnalysisType, ...]] = (
@@ -43,6 +85,13 @@ CHART_TYPE_BY_ANALYSIS: Final[dict[AnalysisType, ChartType]] = {
     AnalysisType.GEO_ANALYSIS: ChartType.BAR,
 }
 
+# Column-name words each analysis type usually needs beyond what the question says
+ANALYSIS_SCHEMA_TERMS: Final[dict[AnalysisType, frozenset]] = {
+    AnalysisType.PRODUCT_TRENDS: frozenset("product category brand department name sale price retail cost".split()),
+    AnalysisType.CUSTOMER_SEGMENTATION: frozenset("user gender age country state city traffic source sale price".split()),
+    AnalysisType.GEO_ANALYSIS: frozenset("country state city latitude longitude sale price".split()),
+}
+
 
 SQL_TEMPLATES: Final[dict[AnalysisType, str]] = {
     AnalysisType.PRODUCT_TRENDS: """
@@ -94,6 +143,93 @@ SQL_TEMPLATES: Final[dict[AnalysisType, str]] = {
 
 DEFAULT_GOOGLE_MODEL: Final[str] = "gemini-1.5-flash"
 DEFAULT_OPENAI_MODEL: Final[str] = "gpt-4o-mini"
+SQL_GENERATION_MODEL: Final[str] = "gemini-1.5-pro"
+LLM_MODEL_CACHE_SIZE: Final[int] = 8
 DEFAULT_MAX_BYTES_BILLED: Final[int] = 1_000_000_000
+DEFAULT_DATASET_ID: Final[str] = "bigquery-public-data.thelook_ecommerce"
+
+DEFAULT_SCHEMA_CACHE_TTL_SEC: Final[int] = 24 * 60 * 60
+DEFAULT_SCHEMA_CACHE_MAX_ENTRIES: Final[int] = 256
+# How often cached schemas are checked against the tables' modification times
+DEFAULT_SCHEMA_MODIFIED_CHECK_SEC: Final[int] = 5 * 60
+MAX_SCHEMA_FETCH_WORKERS: Final[int] = 8
+DEFAULT_BIGQUERY_HTTP_POOL_SIZE: Final[int] = 32
+DEFAULT_BIGQUERY_MAX_ROWS: Final[int] = 200_000
+DEFAULT_BIGQUERY_PAGE_SIZE: Final[int] = 20_000
+# Backoff bounds when async callers poll a running query job
+BIGQUERY_POLL_INITIAL_SEC: Final[float] = 0.1
+BIGQUERY_POLL_MAX_SEC: Final[float] = 2.0
+
+DEFAULT_QUERY_CACHE_TTL_SEC: Final[int] = 60 * 60
+DEFAULT_QUERY_CACHE_MAX_BYTES: Final[int] = 256 * 1024 * 1024
+
+# LLM response cache; only the listed (comma-separated) nodes opt in by default
+DEFAULT_LLM_CACHE_TTL_SEC: Final[int] = 7 * 24 * 60 * 60
+DEFAULT_LLM_CACHE_MAX_ENTRIES: Final[int] = 10_000
+DEFAULT_LLM_CACHE_NODES: Final[str] = "reasoning,sql_generation"
+
+# (prompt, completion) USD per million tokens, matched against the model name by prefix
+LLM_TOKEN_PRICES_USD: Final[dict[str, tuple[float, float]]] = {
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+DEFAULT_PREFLIGHT_SAMPLE_ABOVE_BYTES: Final[int] = 500_000_000
+DEFAULT_PREFLIGHT_REGENERATE_ABOVE_BYTES: Final[int] = 20_000_000_000
+DEFAULT_SQL_MAX_ATTEMPTS: Final[int] = 3
+
+# Template routing: LIMIT used when the question has no "top N"
+SQL_TEMPLATE_DEFAULT_LIMIT: Final[int] = 20
+SQL_TEMPLATE_MAX_LIMIT: Final[int] = 1_000
+
+# Question→SQL memo: reuse stored SQL at or above REUSE similarity, show it as
+# a few-shot example at or above EXAMPLE similarity
+DEFAULT_SQL_MEMO_MAX_ENTRIES: Final[int] = 2_000
+SQL_MEMO_REUSE_SIMILARITY: Final[float] = 0.85
+SQL_MEMO_EXAMPLE_SIMILARITY: Final[float] = 0.3
+SQL_MEMO_MAX_EXAMPLES: Final[int] = 2
+SQL_MEMO_BM25_K1: Final[float] = 1.2
+SQL_MEMO_BM25_B: Final[float] = 0.75
+
+# Questions answered at once by `cli batch`
+DEFAULT_BATCH_CONCURRENCY: Final[int] = 8
+
+# HTTP serving: worker threads and requests allowed to wait for one
+DEFAULT_SERVER_HOST: Final[str] = "127.0.0.1"
+DEFAULT_SERVER_PORT: Final[int] = 8080
+DEFAULT_SERVER_WORKERS: Final[int] = 8
+DEFAULT_SERVER_MAX_QUEUE: Final[int] = 32
+# Result rows included in HTTP responses
+SERVER_RESULT_ROWS: Final[int] = 1_000
+
+# Rows passed to Plotly per chart; larger results are downsampled first
+DEFAULT_CHART_MAX_POINTS: Final[int] = 2_000
+
+# PNG export: browser tabs kept warm by the chart renderer, and image size
+DEFAULT_CHART_RENDER_WORKERS: Final[int] = 2
+CHART_IMAGE_WIDTH: Final[int] = 1100
+CHART_IMAGE_HEIGHT: Final[int] = 600
+
+# Local intent classification: minimum confidence to skip the reasoning LLM call
+DEFAULT_INTENT_CONFIDENCE_THRESHOLD: Final[float] = 0.7
+# Softmax scale applied to cosine similarities by the TF-IDF intent model
+INTENT_MODEL_SHARPNESS: Final[float] = 8.0
+
+# Table selection: at most MAX tables per question; a further table must add
+# MIN_GAIN (idf-weighted column matches) for terms the selection does not match yet
+DEFAULT_TABLE_INDEX_MAX_TABLES: Final[int] = 4
+TABLE_INDEX_MIN_GAIN: Final[float] = 1.0
+
+# Schema context in the SQL generation prompt; wider schemas are ranked and trimmed to fit
+DEFAULT_SCHEMA_CONTEXT_TOKEN_BUDGET: Final[int] = 300
+
+# Trace file size that triggers rotation; one rotated file (<path>.1) is kept
+DEFAULT_TRACE_MAX_BYTES: Final[int] = 50 * 1024 * 1024
+
+# Result profiling for the insights prompt
+DEFAULT_PROFILE_TOP_K: Final[int] = 5
+DEFAULT_INSIGHTS_TOKEN_BUDGET: Final[int] = 600
 
 
@@ -2,44 +2,102 @@
 
 from __future__ import annotations
 
-from langgraph.graph import END, StateGraph
+from langgraph.graph import END, START, StateGraph
 
+from .constants import PreflightRoute
 from .models.state import AgentState
 from .nodes import (
     execution_node,
+    execution_node_async,
     insights_node,
+    insights_node_async,
+    planning_node,
+    planning_node_async,
+    preflight_node,
+    preflight_node_async,
     reasoning_node,
+    reasoning_node_async,
+    schema_prefetch_node,
+    schema_prefetch_node_async,
     schema_retrieval_node,
+    schema_retrieval_node_async,
     sql_generation_node,
+    sql_generation_node_async,
     visualization_node,
+    visualization_node_async,
 )
-
-
-def build_agent_graph() -> StateGraph:
-    """Construct the agent's state graph."""
+from .services.tracing import traced_node
+
+
+SYNC_NODES = {
+    "reasoning": reasoning_node,
+    "schema_prefetch": schema_prefetch_node,
+    "schema_retrieval": schema_retrieval_node,
+    "planning": planning_node,
+    "sql_generation": sql_generation_node,
+    "preflight": preflight_node,
+    "execution": execution_node,
+    "visualization": visualization_node,
+    "insights": insights_node,
+}
+
+ASYNC_NODES = {
+    "reasoning": reasoning_node_async,
+    "schema_prefetch": schema_prefetch_node_async,
+    "schema_retrieval": schema_retrieval_node_async,
+    "planning": planning_node_async,
+    "sql_generation": sql_generation_node_async,
+    "preflight": preflight_node_async,
+    "execution": execution_node_async,
+    "visualization": visualization_node_async,
+    "insights": insights_node_async,
+}
+
+
+def build_agent_graph(async_nodes: bool = False) -> StateGraph:
+    """Construct the agent's state graph.
+
+    With ``async_nodes`` the graph uses coroutine nodes and must be run with
+    ``ainvoke``/``astream``. Every node runs inside a trace span (see
+    ``services.tracing``); the batch runner reads node latencies from these
+    spans, so they are kept even when ``TRACING_ENABLED=false`` turns off
+    the export.
+    """
 
     graph = StateGraph(AgentState)
 
-    graph.add_node("reasoning", reasoning_node)
-    graph.add_node("schema_retrieval", schema_retrieval_node)
-    graph.add_node("sql_generation", sql_generation_node)
-    graph.add_node("execution", execution_node)
-    graph.add_node("visualization", visualization_node)
-    graph.add_node("insights", insights_node)
+    for name, node in (ASYNC_NODES if async_nodes else SYNC_NODES).items():
+        graph.add_node(name, traced_node(name, node))
+
+    # Schema prefetch does not depend on the intent, so it overlaps the reasoning
+    # LLM call; schema_retrieval joins both branches and narrows the tables.
+    graph.add_edge(START, "reasoning")
+    graph.add_edge(START, "schema_prefetch")
+    graph.add_edge(["reasoning", "schema_prefetch"], "schema_retrieval")
+    graph.add_edge("schema_retrieval", "planning")
+    # Questions covered by a SQL template or the memo skip LLM generation entirely
+    graph.add_conditional_edges(
+        "planning",
+        _route_after_planning,
+        {"preflight": "preflight", "sql_generation": "sql_generation"},
+    )
+    graph.add_edge("sql_generation", "preflight")
 
-    graph.add_edge("reasoning", "schema_retrieval")
-    graph.add_edge("schema_retrieval", "sql_generation")
-    graph.add_edge("sql_generation", "execution")
+    graph.add_conditional_edges(
+        "preflight",
+        _route_after_preflight,
+        {"execution": "execution", "sql_generation": "sql_generation", "error_end": END},
+    )
 
+    # Failed jobs retry through SQL generation until SQL_MAX_ATTEMPTS is reached
     graph.add_conditional_edges(
         "execution",
-        _should_visualize,
-        {"visualization": "visualization", "error_end": END},
+        _route_after_execution,
+        {"visualization": "visualization", "sql_generation": "sql_generation", "error_end": END},
     )
 
     graph.add_edge("visualization", "insights")
     graph.add_edge("insights", END)
-    graph.set_entry_point("reasoning")
 
     return graph
 
@@ -50,9 +108,30 @@ def compile_agent():
     return build_agent_graph().compile()
 
 
-def _should_visualize(state: AgentState) -> str:
+def compile_async_agent():
+    """Compile the agent with async nodes, for many concurrent runs on one event loop."""
+
+    return build_agent_graph(async_nodes=True).compile()
+
+
+def _route_after_execution(state: AgentState) -> str:
     if state.get("validation_passed"):
         return "visualization"
+    if state.get("execution_retry"):
+        return "sql_generation"
     return "error_end"
 
 
+def _route_after_planning(state: AgentState) -> str:
+    if state.get("sql_source") in {"template", "memo"} and state.get("sql_query"):
+        return "preflight"
+    return "sql_generation"
+
+
+def _route_after_preflight(state: AgentState) -> str:
+    route = state.get("preflight", {}).get("route", PreflightRoute.EXECUTE.value)
+    if route == PreflightRoute.REGENERATE.value:
+        return "sql_generation"
+    if route == PreflightRoute.ERROR.value:
+        return "error_end"
+    return "execution"
@@ -2,21 +2,32 @@
 
 from __future__ import annotations
 
-from .graph import compile_agent
+from .graph import compile_agent, compile_async_agent
 from .models.state import AgentState
+from .services.tracing import trace_request
 
 
 agent = compile_agent()
+async_agent = compile_async_agent()
 
 
-def run_agent(user_query: str) -> AgentState:
-    """Convenience function for single-turn execution."""
-
-    initial_state: AgentState = {
+def _initial_state(user_query: str) -> AgentState:
+    return {
         "user_query": user_query,
         "metrics": {},
         "validation_passed": False,
     }
-    return agent.invoke(initial_state)
 
 
+def run_agent(user_query: str) -> AgentState:
+    """Convenience function for single-turn execution."""
+
+    with trace_request(user_query):
+        return agent.invoke(_initial_state(user_query))
+
+
+async def run_agent_async(user_query: str) -> AgentState:
+    """Async single-turn execution; safe to run many concurrently on one event loop."""
+
+    with trace_request(user_query):
+        return await async_agent.ainvoke(_initial_state(user_query))
@@ -1,13 +1,14 @@
-"""Evaluation utilities for comparing agent output to baselines."""
+"""Metric helpers: per-attempt timings and comparison of agent output to baselines."""
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Sequence
+from typing import List, Optional, Sequence
 
 import pandas as pd
 
-from .models.state import Metrics, QueryResult
+from .models.columnar import ColumnarData
+from .models.state import AgentState, AttemptTiming, Metrics, QueryResult
 
 
 @dataclass
@@ -16,6 +17,22 @@ class MVPMetrics:
     data_completeness: float
     rows_returned: int
     matches_baseline: bool = False
+    sql_fingerprint: Optional[str] = None
+
+
+def record_attempt_timing(state: AgentState, stage: str, elapsed_ms: int, outcome: Optional[str] = None) -> None:
+    """Store ``elapsed_ms`` as ``<stage>_ms`` on the current attempt's timing entry."""
+
+    attempt = state.get("sql_generation_attempt", 1)
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    timings: List[AttemptTiming] = [dict(timing) for timing in metrics.get("attempt_timings", [])]  # type: ignore[misc]
+    if not timings or timings[-1].get("attempt") != attempt:
+        timings.append({"attempt": attempt})
+    timings[-1][f"{stage}_ms"] = elapsed_ms  # type: ignore[literal-required]
+    if outcome is not None:
+        timings[-1]["outcome"] = outcome
+    metrics["attempt_timings"] = timings
+    state["metrics"] = metrics
 
 
 def evaluate_result(
@@ -25,7 +42,7 @@ def evaluate_result(
 ) -> MVPMetrics:
     """Compare agentic result vs. baseline query output."""
 
-    agent_df = pd.DataFrame(agent_output.get("data", []))
+    agent_df = ColumnarData.coerce(agent_output.get("data")).to_frame()
     baseline_df = baseline_output
 
     matches = _rough_match(agent_df, baseline_df)
@@ -35,6 +52,7 @@ def evaluate_result(
         data_completeness=float(metrics.get("data_completeness", 1.0)),
         rows_returned=int(agent_df.shape[0]) if not agent_df.empty else 0,
         matches_baseline=matches,
+        sql_fingerprint=metrics.get("sql_fingerprint"),
     )
 
 
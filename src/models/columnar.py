@@ -0,0 +1,125 @@
+"""Column-oriented container for query results stored in agent state."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union, overload
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency guard
+    pa = None
+
+ColumnArray = Union[np.ndarray, pd.api.extensions.ExtensionArray]
+
+
+class ColumnarData(Sequence):
+    """Query result held as one array per column.
+
+    Nodes read columns (or a DataFrame built over the same buffers) without
+    per-row Python objects. Indexing/iterating yields ``dict`` rows for code that
+    still expects list-of-dicts; those rows are only built when requested.
+    """
+
+    __slots__ = ("_arrays", "_row_count", "_frame", "_records")
+
+    def __init__(self, arrays: Mapping[str, ColumnArray]) -> None:
+        lengths = {len(array) for array in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        self._arrays: Dict[str, ColumnArray] = dict(arrays)
+        self._row_count = lengths.pop() if lengths else 0
+        self._frame: Optional[pd.DataFrame] = None
+        self._records: Optional[List[Dict[str, Any]]] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ColumnarData":
+        """Wrap a DataFrame's column buffers without copying them."""
+
+        arrays = {
+            str(column): (
+                df[column].to_numpy(copy=False) if isinstance(df[column].dtype, np.dtype) else df[column].array
+            )
+            for column in df.columns
+        }
+        data = cls(arrays)
+        data._frame = df
+        return data
+
+    @classmethod
+    def from_arrow(cls, table: "pa.Table") -> "ColumnarData":
+        """Convert an Arrow table, releasing Arrow buffers as columns are converted."""
+
+        return cls.from_frame(table.to_pandas(split_blocks=True, self_destruct=True))
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> "ColumnarData":
+        """Build from legacy list-of-dicts rows."""
+
+        return cls.from_frame(pd.DataFrame(list(records)))
+
+    @classmethod
+    def coerce(cls, data: Any) -> "ColumnarData":
+        """Accept ``ColumnarData``, list-of-dicts rows, a DataFrame or ``None``."""
+
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, pd.DataFrame):
+            return cls.from_frame(data)
+        return cls.from_records(data or [])
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._arrays)
+
+    @property
+    def arrays(self) -> Mapping[str, ColumnArray]:
+        return self._arrays
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._row_count, len(self._arrays)
+
+    def column(self, name: str) -> ColumnArray:
+        return self._arrays[name]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return a DataFrame sharing the column buffers (built once)."""
+
+        if self._frame is None:
+            self._frame = pd.DataFrame(self._arrays, copy=False)
+        return self._frame
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Row-oriented view, materialized on first access."""
+
+        if self._records is None:
+            self._records = self.to_frame().to_dict(orient="records")
+        return self._records
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index):
+        if self._records is not None:
+            return self._records[index]
+        # Small slices (e.g. the first rows for a prompt) skip the full records view
+        if isinstance(index, slice):
+            return self.to_frame().iloc[index].to_dict(orient="records")
+        return self.to_frame().iloc[index].to_dict()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.records)
+
+    def __repr__(self) -> str:
+        return f"ColumnarData(rows={self._row_count}, columns={self.columns})"
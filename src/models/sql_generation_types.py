@@ -23,6 +23,9 @@ class SQLGenerationStep(TypedDict, total=False):
     model: str
     """Which LLM model was used"""
 
+    fingerprint: str
+    """Fingerprint of the canonical SQL (equal for formatting-only differences)"""
+
 
 class TableSchema(TypedDict, total=False):
     """Schema information for a single table."""
@@ -39,6 +42,9 @@ class TableSchema(TypedDict, total=False):
     description: Optional[str]
     """Table description from BigQuery metadata"""
 
+    last_modified: Optional[float]
+    """Unix timestamp of the last table modification (for cache invalidation)"""
+
 
 class SchemaInfo(TypedDict, total=False):
     """Complete schema information for the database."""
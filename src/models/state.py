@@ -4,16 +4,105 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional, TypedDict
 
-from .sql_generation_types import SQLGenerationStep, SchemaInfo
+from .columnar import ColumnarData
+from .sql_generation_types import SQLGenerationStep, SchemaInfo, TableSchema
 
 class QueryResult(TypedDict, total=False):
     """Structure for BigQuery execution results stored in state."""
 
-    data: List[Dict[str, Any]]
+    data: ColumnarData
+    """Column arrays; indexing/iterating still yields dict rows for older callers"""
     shape: tuple[int, int]
     columns: List[str]
 
 
+class PeriodDelta(TypedDict):
+    """Change of a numeric column between consecutive periods."""
+
+    period: str
+    value: float
+    change_pct: Optional[float]
+
+
+class ColumnProfile(TypedDict, total=False):
+    """Summary statistics for one result column."""
+
+    name: str
+    dtype: str
+    """One of numeric, datetime, boolean or string"""
+    null_rate: float
+    distinct: int
+    min: Any
+    max: Any
+    mean: Optional[float]
+    top_values: List[tuple[Any, int]]
+    """Most frequent values with counts (non-numeric columns)"""
+    deltas: List[PeriodDelta]
+    """Latest period-over-period changes, oldest first (numeric columns)"""
+
+
+class ResultProfile(TypedDict, total=False):
+    """Single-pass profile of a query result, used for validation and prompts."""
+
+    row_count: int
+    column_count: int
+    completeness: float
+    """Share of non-null cells"""
+    period_column: Optional[str]
+    """Time column used for period-over-period deltas"""
+    columns: List[ColumnProfile]
+
+
+class SchemaPrefetch(TypedDict):
+    """Schemas fetched for every candidate table, in parallel with reasoning."""
+
+    tables: Dict[str, TableSchema]
+    retrieved_at: float
+    """Oldest retrieval time among the tables"""
+    cache_hit: bool
+    time_ms: int
+
+
+class PreflightResult(TypedDict, total=False):
+    """Outcome of the dry-run preflight stage."""
+
+    route: str
+    """PreflightRoute value chosen for the current SQL"""
+    estimated_bytes: int
+    """total_bytes_processed reported by the dry run"""
+    sample_percent: Optional[int]
+    """TABLESAMPLE percentage applied on the sample route"""
+    error: Optional[str]
+    """Dry-run error or budget violation that triggered regeneration"""
+
+
+class AttemptTiming(TypedDict, total=False):
+    """Time spent on one SQL attempt, per stage."""
+
+    attempt: int
+    generation_ms: int
+    """LLM generation (absent for template and memo SQL)"""
+    validation_ms: int
+    """Local check against schema_info"""
+    preflight_ms: int
+    """Dry run"""
+    execution_ms: int
+    outcome: str
+    """``executed``, ``invalid_sql``, ``dry_run_rejected`` or ``execution_failed``"""
+
+
+class LLMUsage(TypedDict, total=False):
+    """Tokens used by one node's LLM calls during a run."""
+
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    estimated_calls: int
+    """Calls without provider usage metadata, counted with the local tokenizer"""
+    cost_usd: float
+    """Estimated from LLM_TOKEN_PRICES_USD; absent when the model has no listed price"""
+
+
 class Metrics(TypedDict, total=False):
     """Execution metrics collected during the agent run."""
 
@@ -23,8 +112,54 @@ class Metrics(TypedDict, total=False):
     baseline_match: bool
     schema_retrieval_time_ms: int
     """Time taken to retrieve schema"""
+    schema_cache_hit: bool
+    """Whether every table schema was served from the schema cache"""
     sql_generation_time_ms: int
     """Time taken to generate SQL"""
+    schema_context_tokens: int
+    """Tokens of schema context in the SQL generation prompt"""
+    schema_context_tokens_saved: int
+    """Tokens cut from the full schema to fit SCHEMA_CONTEXT_TOKEN_BUDGET"""
+    cache_hit: bool
+    """Whether the query result was served from the result cache"""
+    sql_fingerprint: str
+    """Fingerprint of the canonical form of the executed SQL"""
+    estimated_bytes_processed: int
+    """Dry-run estimate of bytes the query scans"""
+    sample_percent: int
+    """TABLESAMPLE percentage the result was computed from (absent for full scans)"""
+    preflight_time_ms: int
+    """Time taken by the dry-run preflight"""
+    sql_validation_time_ms: int
+    """Time taken by the local SQL validator"""
+    attempt_timings: List[AttemptTiming]
+    """Per-attempt stage timings, one entry per SQL attempt"""
+    fetch_pages: int
+    """Number of result pages downloaded"""
+    page_fetch_ms: List[int]
+    """Per-page download time (the first page includes waiting for the job)"""
+    result_truncated: bool
+    """Whether the result was cut at BIGQUERY_MAX_ROWS"""
+    sql_template_hit: bool
+    """Whether a parameterized template produced the SQL (no LLM call)"""
+    sql_memo_hit: bool
+    """Whether SQL from a near-duplicate past question was reused"""
+    sql_memo_examples: int
+    """Past question/SQL pairs added to the generation prompt as examples"""
+    intent_path: str
+    """How the analysis type was chosen: ``keywords``, ``model`` or ``llm``"""
+    intent_confidence: float
+    """Confidence of the local intent classifier"""
+    llm_cache_hits: int
+    """LLM calls answered from the response cache"""
+    llm_cache_saved_ms: int
+    """Original latency of the cached LLM calls, i.e. time saved"""
+    llm_usage: Dict[str, LLMUsage]
+    """Token usage per node (``reasoning``, ``sql_generation``, ``insights``)"""
+    llm_prompt_tokens: int
+    """Prompt tokens over all LLM calls in the run (cache hits excluded)"""
+    llm_completion_tokens: int
+    llm_cost_usd: float
 
 
 class AgentState(TypedDict, total=False):
@@ -39,12 +174,26 @@ class AgentState(TypedDict, total=False):
 
     # Execution
     sql_query: str
+    sql_source: str
+    """Where ``sql_query`` came from: ``template``, ``memo`` or ``llm``"""
+    llm_cache_key: Optional[str]
+    """Response cache key of the LLM answer behind ``sql_query``, evicted if the SQL fails"""
+    sql_template: Optional[str]
+    """Name of the template that produced ``sql_query``"""
     chart_type: str
     bq_results: QueryResult
+    result_profile: ResultProfile
+    preflight: PreflightResult
 
     # Output
     chart_json: str
     chart_image_path: str
+    chart_image_pending: str
+    """PNG path still being written by the background chart renderer"""
+    chart_downsampled: bool
+    """Whether the chart was built from a reduced point set"""
+    chart_source_rows: int
+    """Result rows available before downsampling"""
     insights: str
 
     # Quality
@@ -59,6 +208,9 @@ class AgentState(TypedDict, total=False):
     available_tables: List[str]
     """List of table names accessible for this query"""
 
+    schema_prefetch: SchemaPrefetch
+    """Schemas for all candidate tables, narrowed by schema_retrieval"""
+
     # SQL Generation Tracking
     sql_generation_history: List[SQLGenerationStep]
     """History of all SQL generation attempts"""
@@ -69,4 +221,7 @@ class AgentState(TypedDict, total=False):
     last_execution_error: Optional[str]
     """Error from previous execution (if retry)"""
 
+    execution_retry: bool
+    """Whether the last execution failure sent the SQL back for regeneration"""
+
 
@@ -1,19 +1,34 @@
-from .execution import execution_node
-from .insights import insights_node
-from .planning import planning_node
-from .reasoning import reasoning_node
-from .schema_retrieval import schema_retrieval_node
-from .sql_generation import sql_generation_node
-from .visualization import visualization_node
+from .execution import execution_node, execution_node_async
+from .insights import insights_node, insights_node_async
+from .planning import planning_node, planning_node_async
+from .preflight import preflight_node, preflight_node_async
+from .reasoning import reasoning_node, reasoning_node_async
+from .schema_retrieval import (
+    schema_prefetch_node,
+    schema_prefetch_node_async,
+    schema_retrieval_node,
+    schema_retrieval_node_async,
+)
+from .sql_generation import sql_generation_node, sql_generation_node_async
+from .visualization import visualization_node, visualization_node_async
 
 __all__ = [
     "execution_node",
+    "execution_node_async",
     "insights_node",
+    "insights_node_async",
     "planning_node",
+    "planning_node_async",
+    "preflight_node",
+    "preflight_node_async",
     "reasoning_node",
+    "reasoning_node_async",
+    "schema_prefetch_node",
+    "schema_prefetch_node_async",
     "schema_retrieval_node",
+    "schema_retrieval_node_async",
     "sql_generation_node",
+    "sql_generation_node_async",
     "visualization_node",
+    "visualization_node_async",
 ]
-
-
@@ -4,11 +4,22 @@ from __future__ import annotations
 
 import logging
 import time
+from typing import Optional, Tuple
 
 import pandas as pd
+import pyarrow as pa
 
+from ..config import get_settings
+from ..constants import DEFAULT_ANALYSIS_TYPE, DEFAULT_DATASET_ID, FetchMode, PreflightRoute, SQLRoutingMode
+from ..metrics import record_attempt_timing
+from ..models.columnar import ColumnarData
 from ..models.state import AgentState, Metrics, QueryResult
-from ..services.bigquery_runner import BigQueryRunner
+from ..services.bigquery_runner import BigQueryRunner, FetchStats
+from ..services.llm_cache import evict_llm_response
+from ..services.result_cache import QueryResultCache, get_result_cache
+from ..services.result_profiler import profile_result
+from ..services.sql_memo import get_sql_memo
+from ..services.sql_normalizer import canonicalize_sql, fingerprint_sql
 
 try:
     from google.auth.exceptions import DefaultCredentialsError
@@ -20,20 +31,102 @@ LOGGER = logging.getLogger(__name__)
 
 
 def execution_node(state: AgentState) -> AgentState:
-    """Execute the prepared SQL query against BigQuery."""
+    """Execute the prepared SQL query against BigQuery (or serve it from the result cache)."""
 
     sql_query = state.get("sql_query")
     if not sql_query:
-        state["validation_passed"] = False
-        state["error_message"] = "SQL query not set"
-        state["last_execution_error"] = "SQL query not set"
-        return state
+        return _record_missing_sql(state)
+
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    cache, cache_key = _result_cache_key(sql_query, metrics)
+
+    start_time = time.perf_counter()
+    df = cache.get(cache_key) if cache is not None else None
+    metrics["cache_hit"] = df is not None
+
+    if df is None:
+        runner = _create_runner(state, metrics)
+        if runner is None:
+            return state
+
+        start_time = time.perf_counter()
+        try:
+            if get_settings().bigquery_fetch_mode == FetchMode.ARROW:
+                table, fetch_stats = runner.execute_query_arrow(sql_query)
+                df = _arrow_to_frame(table, fetch_stats, metrics)
+            else:
+                df = runner.execute_query(sql_query)
+        except Exception as exc:  # pragma: no cover - network/external dependency
+            return _record_failure(state, metrics, exc, start_time)
+
+        if cache is not None:
+            cache.put(cache_key, df)
+
+    return _record_result(state, metrics, df, start_time)
+
+
+async def execution_node_async(state: AgentState) -> AgentState:
+    """Async ``execution_node``: polls the BigQuery job without blocking the event loop."""
+
+    sql_query = state.get("sql_query")
+    if not sql_query:
+        return _record_missing_sql(state)
+
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    cache, cache_key = _result_cache_key(sql_query, metrics)
+
+    start_time = time.perf_counter()
+    df = cache.get(cache_key) if cache is not None else None
+    metrics["cache_hit"] = df is not None
+
+    if df is None:
+        runner = _create_runner(state, metrics)
+        if runner is None:
+            return state
+
+        start_time = time.perf_counter()
+        try:
+            if get_settings().bigquery_fetch_mode == FetchMode.ARROW:
+                table, fetch_stats = await runner.execute_query_arrow_async(sql_query)
+                df = _arrow_to_frame(table, fetch_stats, metrics)
+            else:
+                df = await runner.execute_query_async(sql_query)
+        except Exception as exc:  # pragma: no cover - network/external dependency
+            return _record_failure(state, metrics, exc, start_time)
+
+        if cache is not None:
+            cache.put(cache_key, df)
+
+    return _record_result(state, metrics, df, start_time)
+
+
+def _record_missing_sql(state: AgentState) -> AgentState:
+    evict_llm_response(state)
+    # Generation already failed; retrying from here would loop without consuming attempts
+    state["execution_retry"] = False
+    state["validation_passed"] = False
+    state["error_message"] = "SQL query not set"
+    state["last_execution_error"] = "SQL query not set"
+    return state
+
 
+def _result_cache_key(sql_query: str, metrics: Metrics) -> Tuple[Optional[QueryResultCache], str]:
+    settings = get_settings()
+    # Key on the canonical SQL so formatting-only differences share one entry
+    cache_key = QueryResultCache.make_key(
+        canonicalize_sql(sql_query),
+        DEFAULT_DATASET_ID,
+        settings.bigquery_maximum_bytes_billed,
+    )
+    metrics["sql_fingerprint"] = fingerprint_sql(sql_query)
+    return get_result_cache(), cache_key
+
+
+def _create_runner(state: AgentState, metrics: Metrics) -> Optional[BigQueryRunner]:
     try:
-        runner = BigQueryRunner()
+        return BigQueryRunner()
     except DefaultCredentialsError as cred_error:  # pragma: no cover - external dependency
         LOGGER.exception("BigQuery credentials not found", exc_info=cred_error)
-        metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
         metrics["latency_sec"] = 0.0
         state["metrics"] = metrics
         state["validation_passed"] = False
@@ -43,42 +136,79 @@ def execution_node(state: AgentState) -> AgentState:
         )
         state["error_message"] = error_msg
         state["last_execution_error"] = error_msg
-        return state
+        return None
 
-    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
 
-    start_time = time.perf_counter()
-    try:
-        df = runner.execute_query(sql_query)
-    except Exception as exc:  # pragma: no cover - network/external dependency
-        LOGGER.exception("BigQuery execution failed")
-        metrics["latency_sec"] = time.perf_counter() - start_time
-        state["metrics"] = metrics
-        state["validation_passed"] = False
-        error_msg = str(exc)
-        state["error_message"] = error_msg
-        state["last_execution_error"] = error_msg
-        return state
+def _arrow_to_frame(table: pa.Table, fetch_stats: FetchStats, metrics: Metrics) -> pd.DataFrame:
+    metrics["fetch_pages"] = fetch_stats["pages"]
+    metrics["page_fetch_ms"] = fetch_stats["page_ms"]
+    metrics["result_truncated"] = fetch_stats["truncated"]
+    return ColumnarData.from_arrow(table).to_frame()
+
 
+def _update_memo(state: AgentState, succeeded: bool) -> None:
+    # Remember SQL that answered the question as written; forget SQL that failed,
+    # both in the memo and in the LLM response cache
+    if not succeeded:
+        evict_llm_response(state)
+    memo = get_sql_memo()
+    sql_query = state.get("sql_query")
+    if memo is None or not sql_query:
+        return
+    if not succeeded:
+        memo.evict_sql(sql_query)
+    elif state.get("sql_source") != "template" and state.get("preflight", {}).get("route") != PreflightRoute.SAMPLE.value:
+        memo.record_success(state.get("user_query", ""), sql_query, state.get("analysis_type", DEFAULT_ANALYSIS_TYPE.value))
+
+
+def _record_failure(state: AgentState, metrics: Metrics, exc: Exception, start_time: float) -> AgentState:
+    LOGGER.exception("BigQuery execution failed")
+    _update_memo(state, succeeded=False)
+    metrics["latency_sec"] = time.perf_counter() - start_time
+    state["metrics"] = metrics
+    record_attempt_timing(state, "execution", int(metrics["latency_sec"] * 1000), outcome="execution_failed")
+    state["validation_passed"] = False
+    error_msg = str(exc)
+    state["error_message"] = error_msg
+    state["last_execution_error"] = error_msg
+
+    # The job error goes back to SQL generation while attempts remain (never in template mode)
+    settings = get_settings()
+    attempt_number = state.get("sql_generation_attempt", 1)
+    state["execution_retry"] = (
+        attempt_number < settings.sql_max_attempts and settings.sql_routing_mode != SQLRoutingMode.TEMPLATE
+    )
+    if state["execution_retry"]:
+        state["sql_generation_attempt"] = attempt_number + 1
+    return state
+
+
+def _record_result(state: AgentState, metrics: Metrics, df: pd.DataFrame, start_time: float) -> AgentState:
     latency = time.perf_counter() - start_time
     metrics["latency_sec"] = latency
     row_count, column_count = df.shape
     metrics["rows_returned"] = row_count
 
-    completeness = _calculate_completeness(df)
+    # One pass over the data serves both validation and the insights prompt
+    profile = profile_result(df)
+    completeness = profile["completeness"]
     metrics["data_completeness"] = completeness
 
     result: QueryResult = {
-        "data": df.to_dict(orient="records"),
+        "data": ColumnarData.from_frame(df),
         "shape": df.shape,
         "columns": list(df.columns),
     }
 
     state["bq_results"] = result
+    state["result_profile"] = profile
     state["metrics"] = metrics
+    state["execution_retry"] = False
+    record_attempt_timing(state, "execution", int(latency * 1000), outcome="executed")
 
     is_valid = row_count > 0 and completeness >= 0.8
     state["validation_passed"] = bool(is_valid)
+    _update_memo(state, succeeded=bool(is_valid))
     if is_valid:
         state["error_message"] = None
         state["last_execution_error"] = None
@@ -91,16 +221,3 @@ def execution_node(state: AgentState) -> AgentState:
         state["last_execution_error"] = error_msg
 
     return state
-
-
-def _calculate_completeness(df: pd.DataFrame) -> float:
-    if df.empty:
-        return 0.0
-    total_cells = df.shape[0] * df.shape[1]
-    if total_cells == 0:
-        return 0.0
-    null_count = df.isnull().sum().sum()
-    completeness = 1.0 - (float(null_count) / float(total_cells))
-    return round(float(completeness), 4)
-
-
@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import logging
-from typing import List
+from typing import Any, Optional
 
 from langchain_core.messages import HumanMessage
 
+from ..config import get_settings
+from ..models.columnar import ColumnarData
 from ..models.state import AgentState
-from ..services.llm_client import get_chat_model
+from ..services.llm_cache import record_llm_cache_hit, with_response_cache
+from ..services.llm_client import LLMUnavailableError, get_chat_model
+from ..services.llm_usage import llm_span, record_llm_usage
+from ..services.result_profiler import profile_result, render_profile
 from ..constants import LLMProvider
 from .prompts import INSIGHTS_PROMPT
 
@@ -24,43 +29,113 @@ LOGGER = logging.getLogger(__name__)
 def insights_node(state: AgentState) -> AgentState:
     """Generate concise business insights using the LLM."""
 
-    results = state.get("bq_results", {})
-    data_sample: List[dict] = results.get("data", [])[:5]
-    if not data_sample:
-        state["insights"] = "No data available for insights."
+    prompt = _build_prompt(state)
+    if prompt is None:
         return state
 
-    chart_type = state.get("chart_type", "")
-    analysis_type = state.get("analysis_type", "")
+    try:
+        with llm_span("insights"):
+            response = _invoke_model(prompt)
+            record_llm_usage(state, "insights", prompt, response)
+    except LLMUnavailableError:
+        state["insights"] = "LLM unavailable; unable to generate insights."
+        return state
+    except Exception as exc:  # pragma: no cover
+        LOGGER.exception("Insight generation failed")
+        state["insights"] = f"Insight generation failed: {exc}"
+        return state
 
-    prompt = INSIGHTS_PROMPT.format(
-        analysis_type=analysis_type,
-        chart_type=chart_type,
-        data_sample=data_sample,
-    )
+    state["insights"] = response.content if hasattr(response, "content") else str(response)
+    record_llm_cache_hit(state, response)
+
+    return state
+
+
+async def insights_node_async(state: AgentState) -> AgentState:
+    """Async ``insights_node`` using ``ainvoke``."""
+
+    prompt = _build_prompt(state)
+    if prompt is None:
+        return state
 
     try:
-        chat_model = get_chat_model(temperature=0.1)
-        response = chat_model.invoke([HumanMessage(content=prompt)])
-    except GoogleAPIError as exc:  # pragma: no cover - external dependency
-        LOGGER.warning("Primary LLM provider failed", exc_info=exc)
-        try:
-            chat_model = get_chat_model(temperature=0.1, provider=LLMProvider.OPENAI)
-            response = chat_model.invoke([HumanMessage(content=prompt)])
-        except ValueError:
-            state["insights"] = "LLM unavailable; unable to generate insights."
-            return state
-        except Exception as openai_error:  # pragma: no cover
-            LOGGER.warning("Fallback LLM provider failed", exc_info=openai_error)
-            state["insights"] = "LLM unavailable; unable to generate insights."
-            return state
+        with llm_span("insights"):
+            response = await _ainvoke_model(prompt)
+            record_llm_usage(state, "insights", prompt, response)
+    except LLMUnavailableError:
+        state["insights"] = "LLM unavailable; unable to generate insights."
+        return state
     except Exception as exc:  # pragma: no cover
         LOGGER.exception("Insight generation failed")
         state["insights"] = f"Insight generation failed: {exc}"
         return state
 
     state["insights"] = response.content if hasattr(response, "content") else str(response)
+    record_llm_cache_hit(state, response)
 
     return state
 
 
+def _build_prompt(state: AgentState) -> Optional[str]:
+    results = state.get("bq_results", {})
+    data = results.get("data")
+    if not data:
+        state["insights"] = "No data available for insights."
+        return None
+
+    data_frame = ColumnarData.coerce(data).to_frame()
+    profile = state.get("result_profile") or profile_result(data_frame)
+    data_profile = render_profile(
+        profile,
+        get_settings().insights_token_budget,
+        sample_rows=data_frame.head(10),
+    )
+
+    return INSIGHTS_PROMPT.format(
+        analysis_type=state.get("analysis_type", ""),
+        chart_type=state.get("chart_type", ""),
+        data_scope=_data_scope(state),
+        data_profile=data_profile,
+    )
+
+
+def _data_scope(state: AgentState) -> str:
+    sample_percent = state.get("preflight", {}).get("sample_percent")
+    if not sample_percent:
+        return "full data"
+    return (
+        f"a {sample_percent}% TABLESAMPLE of the source tables; values cover only that share of rows, "
+        "so state that the figures come from a sample and do not present them as totals"
+    )
+
+
+def _invoke_model(prompt: str) -> Any:
+    messages = [HumanMessage(content=prompt)]
+    try:
+        return with_response_cache(get_chat_model(temperature=0.1), "insights").invoke(messages)
+    except GoogleAPIError as exc:  # pragma: no cover - external dependency
+        LOGGER.warning("Primary LLM provider failed", exc_info=exc)
+        try:
+            return with_response_cache(
+                get_chat_model(temperature=0.1, provider=LLMProvider.OPENAI), "insights"
+            ).invoke(messages)
+        except Exception as openai_error:  # pragma: no cover
+            if not isinstance(openai_error, ValueError):
+                LOGGER.warning("Fallback LLM provider failed", exc_info=openai_error)
+            raise LLMUnavailableError(str(openai_error)) from openai_error
+
+
+async def _ainvoke_model(prompt: str) -> Any:
+    messages = [HumanMessage(content=prompt)]
+    try:
+        return await with_response_cache(get_chat_model(temperature=0.1), "insights").ainvoke(messages)
+    except GoogleAPIError as exc:  # pragma: no cover - external dependency
+        LOGGER.warning("Primary LLM provider failed", exc_info=exc)
+        try:
+            return await with_response_cache(
+                get_chat_model(temperature=0.1, provider=LLMProvider.OPENAI), "insights"
+            ).ainvoke(messages)
+        except Exception as openai_error:  # pragma: no cover
+            if not isinstance(openai_error, ValueError):
+                LOGGER.warning("Fallback LLM provider failed", exc_info=openai_error)
+            raise LLMUnavailableError(str(openai_error)) from openai_error
@@ -1,23 +1,37 @@
-"""Planning node: select SQL template and visualization config."""
+"""Planning node: answer canonical and repeated questions without LLM SQL generation."""
 
 from __future__ import annotations
 
 import logging
+import re
 
+from ..config import get_settings
 from ..constants import (
     CHART_TYPE_BY_ANALYSIS,
     DEFAULT_ANALYSIS_TYPE,
+    SQL_MEMO_REUSE_SIMILARITY,
     SQL_TEMPLATES,
     AnalysisType,
+    SQLRoutingMode,
 )
-from ..models.state import AgentState
+from ..models.state import AgentState, Metrics
+from ..services.sql_memo import get_sql_memo
+from ..services.sql_templates import match_template, record_routing
 
 
 LOGGER = logging.getLogger(__name__)
 
+_NUMBER = re.compile(r"\d+")
+
 
 def planning_node(state: AgentState) -> AgentState:
-    """Populate SQL query and chart type based on the analysis selection."""
+    """Populate SQL query and chart type from a template when one covers the question.
+
+    Without a template, SQL stored for a near-duplicate past question is
+    reused. Otherwise ``hybrid`` mode leaves ``sql_query`` unset so the graph
+    routes the question to LLM generation; ``template`` mode falls back to the
+    analysis type's default SQL instead, and ``llm`` mode skips both lookups.
+    """
 
     raw_type = state.get("analysis_type", DEFAULT_ANALYSIS_TYPE.value)
     try:
@@ -26,9 +40,62 @@ def planning_node(state: AgentState) -> AgentState:
         LOGGER.warning("Unknown analysis type during planning; falling back to default", extra={"raw_type": raw_type})
         analysis_type = DEFAULT_ANALYSIS_TYPE
 
-    state["sql_query"] = SQL_TEMPLATES[analysis_type]
-    state["chart_type"] = CHART_TYPE_BY_ANALYSIS[analysis_type].value
+    mode = get_settings().sql_routing_mode
+    state["sql_template"] = None
+    if mode == SQLRoutingMode.LLM:
+        return state
+
+    user_query = state.get("user_query", "")
+    match = match_template(user_query, analysis_type)
+    record_routing(match is not None)
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    metrics["sql_template_hit"] = match is not None
+    state["metrics"] = metrics
+
+    if match is not None:
+        LOGGER.info("SQL produced from template", extra={"template": match["template"], "slots": match["slots"]})
+        state["sql_query"] = match["sql"]
+        state["sql_source"] = "template"
+        state["sql_template"] = match["template"]
+        state["chart_type"] = match["chart_type"]
+    elif _reuse_memo(state, user_query, analysis_type):
+        state["chart_type"] = CHART_TYPE_BY_ANALYSIS[analysis_type].value
+    elif mode == SQLRoutingMode.TEMPLATE:
+        state["sql_query"] = SQL_TEMPLATES[analysis_type]
+        state["sql_source"] = "template"
+        state["sql_template"] = f"default_{analysis_type.value}"
+        state["chart_type"] = CHART_TYPE_BY_ANALYSIS[analysis_type].value
 
     return state
 
 
+def _reuse_memo(state: AgentState, user_query: str, analysis_type: AnalysisType) -> bool:
+    # A near-duplicate of a question that already ran successfully reuses its SQL
+    memo = get_sql_memo()
+    if memo is None or not user_query.strip():
+        return False
+
+    matches = memo.search(user_query, analysis_type.value, limit=1)
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    hit = bool(
+        matches
+        and matches[0]["similarity"] >= SQL_MEMO_REUSE_SIMILARITY
+        # "top 5" and "top 10" read alike but need different SQL
+        and _NUMBER.findall(user_query) == _NUMBER.findall(matches[0]["entry"]["question"])
+    )
+    metrics["sql_memo_hit"] = hit
+    state["metrics"] = metrics
+    if not hit:
+        return False
+
+    entry = matches[0]["entry"]
+    LOGGER.info("Reusing SQL from memo", extra={"question": entry["question"], "similarity": matches[0]["similarity"]})
+    state["sql_query"] = entry["sql"]
+    state["sql_source"] = "memo"
+    return True
+
+
+async def planning_node_async(state: AgentState) -> AgentState:
+    """Async ``planning_node``; template matching is pure CPU work taking microseconds."""
+
+    return planning_node(state)
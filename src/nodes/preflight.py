@@ -0,0 +1,214 @@
+"""Preflight node: validate SQL locally, dry-run it and route it by estimated cost."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from typing import List
+
+from ..config import get_settings
+from ..constants import PreflightRoute, SQLRoutingMode
+from ..metrics import record_attempt_timing
+from ..models.state import AgentState, Metrics, PreflightResult
+from ..services.bigquery_runner import BigQueryRunner
+from ..services.llm_cache import evict_llm_response
+from ..services.sql_memo import get_sql_memo
+from ..services.sql_normalizer import IDENT, OP, tokenize_sql
+from ..services.sql_validator import validate_sql
+
+try:
+    from google.auth.exceptions import DefaultCredentialsError
+except ImportError:  # pragma: no cover
+    DefaultCredentialsError = Exception
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Aggregates whose results shrink with the sample; these queries are never sampled
+_ADDITIVE_AGGREGATES = frozenset({"SUM", "COUNT", "COUNTIF", "APPROX_COUNT_DISTINCT"})
+
+# Base table after FROM/JOIN (backticked or dotted path) with its optional alias
+_TABLE_REFERENCE = re.compile(
+    r"""
+    (?P<prefix>\b(?:FROM|JOIN)\s+)
+    (?P<table>`[^`]+`|[A-Za-z_][\w-]*(?:\.[\w-]+)+)(?![\w.`-])
+    (?!\s*\))  # not EXTRACT(part FROM alias.column)
+    (?P<alias>\s+(?:AS\s+)?
+        (?!(?:ON|USING|WHERE|GROUP|ORDER|LIMIT|LEFT|RIGHT|INNER|OUTER|FULL|CROSS|JOIN|WINDOW|HAVING|QUALIFY|UNION|TABLESAMPLE)\b)
+        [A-Za-z_]\w*)?
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def preflight_node(state: AgentState) -> AgentState:
+    """
+    Validate the SQL locally, dry-run it and choose how to proceed.
+
+    Input state fields:
+        - sql_query: SQL produced by sql_generation
+        - sql_generation_attempt: Current attempt number (1, 2, ...)
+
+    Output state fields:
+        - preflight: PreflightResult with route, estimated bytes and error
+        - sql_query: Rewritten with TABLESAMPLE on the "sample" route
+        - last_execution_error / sql_generation_attempt: Set on "regenerate"
+        - metrics["estimated_bytes_processed"], metrics["preflight_time_ms"],
+          metrics["sql_validation_time_ms"], metrics["attempt_timings"],
+          metrics["sample_percent"]
+
+    Routes: "execute" below PREFLIGHT_SAMPLE_ABOVE_BYTES, "sample" up to
+    PREFLIGHT_REGENERATE_ABOVE_BYTES, "regenerate" above it, on dry-run
+    errors or when the SQL names tables/columns missing from schema_info, and
+    "error" once SQL_MAX_ATTEMPTS is exhausted. Queries with SUM/COUNT are
+    regenerated instead of sampled: a sample would scale their totals down.
+    The applied percentage is reported as metrics["sample_percent"].
+    """
+
+    settings = get_settings()
+    sql_query = state.get("sql_query")
+    preflight: PreflightResult = {"route": PreflightRoute.EXECUTE.value, "error": None}
+
+    # Nothing to check: execution reports the missing SQL itself
+    if not sql_query:
+        state["preflight"] = preflight
+        return state
+
+    # Hallucinated tables/columns go back to the LLM without a BigQuery round-trip.
+    # Template and memo SQL may use tables outside the selected schema and are known to run.
+    if settings.sql_local_validation and state.get("sql_source") not in {"template", "memo"}:
+        errors = _validate_locally(state, sql_query)
+        if errors:
+            error_msg = "SQL failed validation against the schema: " + "; ".join(errors)
+            return _request_regeneration(state, preflight, error_msg)
+
+    if not settings.preflight_enabled:
+        state["preflight"] = preflight
+        return state
+
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    start_time = time.perf_counter()
+
+    try:
+        runner = BigQueryRunner()
+        estimated_bytes = runner.dry_run(sql_query)
+    except DefaultCredentialsError as cred_error:  # pragma: no cover - external dependency
+        LOGGER.warning("Skipping preflight without BigQuery credentials", exc_info=cred_error)
+        state["preflight"] = preflight
+        return state
+    except Exception as exc:
+        LOGGER.info("Dry run rejected SQL", extra={"error": str(exc)})
+        metrics["preflight_time_ms"] = int((time.perf_counter() - start_time) * 1000)
+        state["metrics"] = metrics
+        record_attempt_timing(state, "preflight", metrics["preflight_time_ms"], outcome="dry_run_rejected")
+        return _request_regeneration(state, preflight, f"Dry run failed: {exc}")
+
+    metrics["preflight_time_ms"] = int((time.perf_counter() - start_time) * 1000)
+    metrics["estimated_bytes_processed"] = estimated_bytes
+    state["metrics"] = metrics
+    preflight["estimated_bytes"] = estimated_bytes
+    over_budget = estimated_bytes > settings.preflight_regenerate_above_bytes
+    record_attempt_timing(
+        state, "preflight", metrics["preflight_time_ms"], outcome="dry_run_rejected" if over_budget else None
+    )
+
+    if over_budget:
+        return _request_regeneration(
+            state,
+            preflight,
+            f"Query would process {estimated_bytes:,} bytes, above the "
+            f"{settings.preflight_regenerate_above_bytes:,} byte budget. "
+            "Filter earlier, select fewer columns or aggregate before joining.",
+        )
+
+    if estimated_bytes > settings.preflight_sample_above_bytes:
+        if has_additive_aggregates(sql_query):
+            return _request_regeneration(
+                state,
+                preflight,
+                f"Query would process {estimated_bytes:,} bytes, above the "
+                f"{settings.preflight_sample_above_bytes:,} byte limit for full scans, and its SUM/COUNT "
+                "results would be wrong on a sample. Filter to a narrower date range or fewer rows.",
+            )
+        sample_percent = max(1, int(settings.preflight_sample_above_bytes * 100 / estimated_bytes))
+        sampled_sql = apply_table_sample(sql_query, sample_percent)
+        if sampled_sql != sql_query:
+            LOGGER.info(
+                "Routing query to sampled execution",
+                extra={"estimated_bytes": estimated_bytes, "sample_percent": sample_percent},
+            )
+            preflight["route"] = PreflightRoute.SAMPLE.value
+            preflight["sample_percent"] = sample_percent
+            state["sql_query"] = sampled_sql
+            sample_metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+            sample_metrics["sample_percent"] = sample_percent
+            state["metrics"] = sample_metrics
+
+    state["preflight"] = preflight
+    return state
+
+
+async def preflight_node_async(state: AgentState) -> AgentState:
+    """Async ``preflight_node``; the dry run is one short API call, made in a worker thread."""
+
+    return await asyncio.to_thread(preflight_node, state)
+
+
+def has_additive_aggregates(sql_query: str) -> bool:
+    """Whether the SQL calls SUM/COUNT-style aggregates, which a table sample scales down."""
+
+    tokens = tokenize_sql(sql_query)
+    return any(
+        token.kind == IDENT and token.value.upper() in _ADDITIVE_AGGREGATES and following == (OP, "(")
+        for token, following in zip(tokens, tokens[1:])
+    )
+
+
+def apply_table_sample(sql_query: str, percent: int) -> str:
+    """Add ``TABLESAMPLE SYSTEM (percent PERCENT)`` to every base table reference."""
+
+    clause = f" TABLESAMPLE SYSTEM ({percent} PERCENT)"
+    return _TABLE_REFERENCE.sub(
+        lambda match: f"{match.group('prefix')}{match.group('table')}{match.group('alias') or ''}{clause}",
+        sql_query,
+    )
+
+
+def _validate_locally(state: AgentState, sql_query: str) -> List[str]:
+    start_time = time.perf_counter()
+    errors = validate_sql(sql_query, state.get("schema_info"))
+    elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    metrics["sql_validation_time_ms"] = elapsed_ms
+    state["metrics"] = metrics
+    record_attempt_timing(state, "validation", elapsed_ms, outcome="invalid_sql" if errors else None)
+    if errors:
+        LOGGER.info("Local validation rejected SQL", extra={"errors": errors})
+    return errors
+
+
+def _request_regeneration(state: AgentState, preflight: PreflightResult, error_msg: str) -> AgentState:
+    attempt_number = state.get("sql_generation_attempt", 1)
+    preflight["error"] = error_msg
+
+    memo = get_sql_memo()
+    if memo is not None:
+        memo.evict_sql(state.get("sql_query", ""))
+    evict_llm_response(state)
+
+    settings = get_settings()
+    # Template mode never calls the LLM, so there is nothing to regenerate with
+    if attempt_number >= settings.sql_max_attempts or settings.sql_routing_mode == SQLRoutingMode.TEMPLATE:
+        preflight["route"] = PreflightRoute.ERROR.value
+        state["validation_passed"] = False
+        state["error_message"] = error_msg
+    else:
+        preflight["route"] = PreflightRoute.REGENERATE.value
+        state["sql_generation_attempt"] = attempt_number + 1
+
+    state["last_execution_error"] = error_msg
+    state["preflight"] = preflight
+    return state
@@ -20,13 +20,15 @@ REASONING_PROMPT = (
 # Insight prompt is kept concise; add instrumentation if prompts are versioned later.
 INSIGHTS_PROMPT = (
     """
-    You are a senior analytics consultant. Review the dataset sample and produce 2-3 concise
+    You are a senior analytics consultant. Review the dataset profile and produce 2-3 concise
     business insights. Each insight should be on a separate line with no bullet symbols.
 
     Provided fields:
     - analysis_type: {analysis_type}
     - preferred chart type: {chart_type}
-    - data sample (first rows): {data_sample}
+    - data scope: {data_scope}
+    - data profile (per-column statistics, recent period changes, sample rows):
+    {data_profile}
 
     Focus on actionable observations (trends, segments, regions).
     """
@@ -76,7 +78,7 @@ GROUP BY u.country
 ORDER BY customer_count DESC
 LIMIT 20
 ```
-
+{memo_examples}
 ## Your Task
 
 User Query: "{user_query}"
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from langchain_core.messages import HumanMessage
 
@@ -19,8 +19,11 @@ from ..constants import (
     AnalysisType,
     LLMProvider,
 )
-from ..models.state import AgentState
-from ..services.llm_client import get_chat_model
+from ..models.state import AgentState, Metrics
+from ..services.intent_classifier import get_intent_classifier
+from ..services.llm_cache import record_llm_cache_hit, with_response_cache
+from ..services.llm_client import LLMUnavailableError, get_chat_model
+from ..services.llm_usage import llm_span, record_llm_usage
 from .prompts import REASONING_PROMPT
 
 
@@ -48,36 +51,112 @@ def _parse_response(content: str) -> Dict[str, Any]:
 def reasoning_node(state: AgentState) -> AgentState:
     """Classify the analysis type based on the user query."""
 
+    prompt = _build_prompt(state)
+    if prompt is None:
+        return state
+
+    try:
+        with llm_span("reasoning"):
+            response = _invoke_model(prompt)
+            record_llm_usage(state, "reasoning", prompt, response)
+    except LLMUnavailableError:
+        return _apply_default(state)
+    return _apply_response(state, response)
+
+
+async def reasoning_node_async(state: AgentState) -> AgentState:
+    """Async ``reasoning_node`` using ``ainvoke``."""
+
+    prompt = _build_prompt(state)
+    if prompt is None:
+        return state
+
+    try:
+        with llm_span("reasoning"):
+            response = await _ainvoke_model(prompt)
+            record_llm_usage(state, "reasoning", prompt, response)
+    except LLMUnavailableError:
+        return _apply_default(state)
+    return _apply_response(state, response)
+
+
+def _build_prompt(state: AgentState) -> Optional[str]:
     user_query = state.get("user_query", "").strip()
     if not user_query:
         state["analysis_type"] = DEFAULT_ANALYSIS_TYPE
         state["analysis_plan"] = "User query missing; defaulting to product trends."
-        return state
+        return None
+
+    if _classify_locally(state, user_query):
+        return None
+    return REASONING_PROMPT + f"\n\nUser query: \"{user_query}\""
+
+
+def _classify_locally(state: AgentState, user_query: str) -> bool:
+    # Obvious questions are decided without an LLM round-trip
+    classifier = get_intent_classifier()
+    if classifier is None:
+        return False
+
+    decision = classifier.classify(user_query)
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    metrics["intent_path"] = decision["method"]
+    metrics["intent_confidence"] = decision["confidence"]
+    state["metrics"] = metrics
+    if decision["analysis_type"] is None:
+        return False
+
+    evidence = f" (matched: {', '.join(decision['evidence'])})" if decision["evidence"] else ""
+    state["analysis_type"] = decision["analysis_type"]
+    state["analysis_plan"] = (
+        f"Classified locally by {decision['method']} as {decision['analysis_type'].replace('_', ' ')}"
+        f" with confidence {decision['confidence']:.2f}{evidence}."
+    )
+    LOGGER.info("Intent classified locally", extra=dict(decision))
+    return True
+
+
+def _invoke_model(prompt: str) -> Any:
+    messages = [HumanMessage(content=prompt)]
+    try:
+        return with_response_cache(get_chat_model(temperature=0.0), "reasoning").invoke(messages)
+    except GoogleAPIError as exc:  # pragma: no cover - external dependency
+        LOGGER.warning("Primary LLM provider failed", exc_info=exc)
+        try:
+            return with_response_cache(
+                get_chat_model(temperature=0.0, provider=LLMProvider.OPENAI), "reasoning"
+            ).invoke(messages)
+        except Exception as openai_error:  # pragma: no cover
+            if not isinstance(openai_error, ValueError):
+                LOGGER.warning("Fallback LLM provider failed", exc_info=openai_error)
+            raise LLMUnavailableError(str(openai_error)) from openai_error
 
-    prompt = REASONING_PROMPT + f"\n\nUser query: \"{user_query}\""
 
+async def _ainvoke_model(prompt: str) -> Any:
+    messages = [HumanMessage(content=prompt)]
     try:
-        chat_model = get_chat_model(temperature=0.0)
-        response = chat_model.invoke([HumanMessage(content=prompt)])
+        return await with_response_cache(get_chat_model(temperature=0.0), "reasoning").ainvoke(messages)
     except GoogleAPIError as exc:  # pragma: no cover - external dependency
         LOGGER.warning("Primary LLM provider failed", exc_info=exc)
         try:
-            chat_model = get_chat_model(temperature=0.0, provider=LLMProvider.OPENAI)
-            response = chat_model.invoke([HumanMessage(content=prompt)])
-        except ValueError:
-            state["analysis_type"] = DEFAULT_ANALYSIS_TYPE.value
-            state["analysis_plan"] = (
-                "LLM unavailable; defaulting to product trends analysis."
-            )
-            return state
+            return await with_response_cache(
+                get_chat_model(temperature=0.0, provider=LLMProvider.OPENAI), "reasoning"
+            ).ainvoke(messages)
         except Exception as openai_error:  # pragma: no cover
-            LOGGER.warning("Fallback LLM provider failed", exc_info=openai_error)
-            state["analysis_type"] = DEFAULT_ANALYSIS_TYPE.value
-            state["analysis_plan"] = (
-                "LLM unavailable; defaulting to product trends analysis."
-            )
-            return state
+            if not isinstance(openai_error, ValueError):
+                LOGGER.warning("Fallback LLM provider failed", exc_info=openai_error)
+            raise LLMUnavailableError(str(openai_error)) from openai_error
+
 
+def _apply_default(state: AgentState) -> AgentState:
+    state["analysis_type"] = DEFAULT_ANALYSIS_TYPE.value
+    state["analysis_plan"] = (
+        "LLM unavailable; defaulting to product trends analysis."
+    )
+    return state
+
+
+def _apply_response(state: AgentState, response: Any) -> AgentState:
     parsed = _parse_response(response.content if hasattr(response, "content") else str(response))
     raw_type = str(parsed.get("analysis_type", DEFAULT_ANALYSIS_TYPE.value)).strip().lower()
 
@@ -92,7 +171,6 @@ def reasoning_node(state: AgentState) -> AgentState:
 
     state["analysis_type"] = analysis_type.value
     state["analysis_plan"] = str(parsed.get("reasoning", "")) or "No reasoning provided."
+    record_llm_cache_hit(state, response)
 
     return state
-
-
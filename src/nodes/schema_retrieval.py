@@ -1,97 +1,110 @@
-"""Schema retrieval node: fetch database metadata from INFORMATION_SCHEMA."""
+"""Schema retrieval nodes: pick the tables a question needs and fetch their metadata."""
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, List, Optional, Tuple
 
-from ..models.state import AgentState
+from ..config import get_settings
+from ..constants import DEFAULT_DATASET_ID
+from ..models.state import AgentState, SchemaPrefetch
 from ..models.sql_generation_types import SchemaInfo, TableSchema
 from ..services.bigquery_runner import BigQueryRunner
+from ..services.schema_cache import get_schema_cache
+from ..services.table_index import TableIndex, get_table_index_store
 
 LOGGER = logging.getLogger(__name__)
 
 
+# Tables used when no table index is available (metadata never fetched) or nothing matches
+FALLBACK_TABLES: List[str] = ["orders", "order_items", "users", "products"]
+
+
+def schema_prefetch_node(state: AgentState) -> AgentState:
+    """
+    Fetch schemas for the tables the question needs while reasoning classifies it.
+
+    Output state fields:
+        - schema_prefetch: SchemaPrefetch with tables, fetch time and cache hit
+
+    Tables are chosen with the table index from the question alone; a stale or
+    missing index is first rebuilt from one metadata query over the whole
+    dataset, which also fills the schema cache. Runs in the same superstep as
+    reasoning, so it returns only its own key (two parallel writes to one state
+    key are rejected by LangGraph).
+    """
+
+    start_time = time.perf_counter()
+    try:
+        store = get_table_index_store()
+        refreshed = store.is_stale()
+        index = store.ensure_fresh(_fetch_all_tables)
+        tables, retrieved_at, cache_hit = _load_tables(_select_tables(index, state.get("user_query", ""), None))
+        cache_hit = cache_hit and not refreshed
+    except Exception as exc:  # pragma: no cover
+        LOGGER.warning("Schema prefetch failed", extra={"error": str(exc)})
+        tables, retrieved_at, cache_hit = {}, time.time(), False
+
+    prefetch: SchemaPrefetch = {
+        "tables": tables,
+        "retrieved_at": retrieved_at,
+        "cache_hit": cache_hit,
+        "time_ms": int((time.perf_counter() - start_time) * 1000),
+    }
+    return {"schema_prefetch": prefetch}
+
+
 def schema_retrieval_node(state: AgentState) -> AgentState:
     """
     Retrieve schema information from BigQuery INFORMATION_SCHEMA.
 
     Input state fields:
-        - analysis_type: Classification of user intent (used for filtering)
-        - user_query: Original user query (for logging)
+        - user_query / analysis_type: Used to select tables from the table index
+        - schema_prefetch: Schemas fetched in parallel with reasoning (optional)
 
     Output state fields:
         - schema_info: SchemaInfo dict with tables and columns
         - available_tables: List of table names
         - metrics["schema_retrieval_time_ms"]: Time taken
+        - metrics["schema_cache_hit"]: True when no metadata call was needed
+
+    In the graph this is the join after the prefetch: it selects tables again
+    with the analysis type known, keeping only the minimal set. Tables the
+    prefetch could not provide are served from the schema cache while fresh,
+    and missing or expired tables are fetched together with a single
+    INFORMATION_SCHEMA query.
 
     Errors are logged but don't halt execution (fallback to empty schema).
     """
 
     analysis_type = state.get("analysis_type", "product_trends")
-    user_query = state.get("user_query", "").strip()
+    relevant_tables = _select_tables(get_table_index_store().index, state.get("user_query", ""), analysis_type)
+    prefetch = state.get("schema_prefetch") or {}
+    prefetched = prefetch.get("tables", {})
 
     start_time = time.perf_counter()
-
-    # Define which tables are relevant per analysis type
-    # (These map to columns in thelook_ecommerce dataset)
-    RELEVANT_TABLES = {
-        "product_trends": ["orders", "order_items", "products"],
-        "customer_segmentation": ["users", "orders", "order_items"],
-        "geo_analysis": ["users", "orders", "order_items"],
-    }
-
-    relevant_tables = RELEVANT_TABLES.get(analysis_type, ["orders", "users", "order_items"])
+    cache_hit = False
+    fetch_ms = int(prefetch.get("time_ms", 0))
 
     try:
-        runner = BigQueryRunner()
-        client = runner.client
+        tables = {name: prefetched[name] for name in relevant_tables if name in prefetched}
+        retrieved_times = [prefetch["retrieved_at"]] if tables else []
+        cache_hit = bool(prefetch.get("cache_hit")) if tables else True
+
+        missing_tables = [name for name in relevant_tables if name not in tables]
+        if missing_tables:
+            fetched_tables, retrieved_at, fetched_from_cache = _load_tables(missing_tables)
+            cache_hit = cache_hit and fetched_from_cache
+            tables.update(fetched_tables)
+            retrieved_times.append(retrieved_at)
 
         schema_info: SchemaInfo = {
-            "tables": {},
-            "retrieved_at": time.time(),
+            "tables": {name: tables[name] for name in relevant_tables if name in tables},
+            # The oldest table snapshot bounds how fresh the combined schema is
+            "retrieved_at": min(retrieved_times) if retrieved_times else time.time(),
         }
-
-        # Query INFORMATION_SCHEMA for each relevant table
-        for table_name in relevant_tables:
-            try:
-                # Get table metadata
-                table = client.get_table(
-                    f"bigquery-public-data.thelook_ecommerce.{table_name}"
-                )
-
-                # Build columns dict
-                columns: Dict[str, str] = {}
-                for field in table.schema:
-                    columns[field.name] = str(field.field_type)
-
-                # Create TableSchema
-                table_schema: TableSchema = {
-                    "name": table_name,
-                    "columns": columns,
-                    "row_count": table.num_rows,
-                    "description": table.description or f"Table: {table_name}",
-                }
-
-                schema_info["tables"][table_name] = table_schema
-
-                LOGGER.info(
-                    "Schema retrieved for table",
-                    extra={
-                        "table": table_name,
-                        "columns": len(columns),
-                        "row_count": table.num_rows,
-                    },
-                )
-
-            except Exception as table_error:  # pragma: no cover
-                LOGGER.warning(
-                    "Failed to retrieve schema for table",
-                    extra={"table": table_name, "error": str(table_error)},
-                )
-                continue
-
         state["schema_info"] = schema_info
         state["available_tables"] = list(schema_info["tables"].keys())
 
@@ -104,10 +117,11 @@ def schema_retrieval_node(state: AgentState) -> AgentState:
         state["schema_info"] = {"tables": {}, "retrieved_at": time.time()}
         state["available_tables"] = []
 
-    # Track metric
-    latency_ms = int((time.perf_counter() - start_time) * 1000)
+    # Track metric (prefetch time counts even though it overlapped with reasoning)
+    latency_ms = fetch_ms + int((time.perf_counter() - start_time) * 1000)
     metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
     metrics["schema_retrieval_time_ms"] = latency_ms
+    metrics["schema_cache_hit"] = cache_hit
     state["metrics"] = metrics
 
     LOGGER.info(
@@ -115,8 +129,94 @@ def schema_retrieval_node(state: AgentState) -> AgentState:
         extra={
             "tables": len(state.get("available_tables", [])),
             "latency_ms": latency_ms,
+            "cache_hit": cache_hit,
+            "prefetched": bool(prefetched),
         },
     )
 
     return state
 
+
+def _select_tables(index: Optional[TableIndex], user_query: str, analysis_type: Optional[str]) -> List[str]:
+    if index is not None:
+        selected = index.select_tables(user_query, analysis_type, get_settings().table_index_max_tables)
+        if selected:
+            return selected
+    return FALLBACK_TABLES
+
+
+def _fetch_all_tables() -> Dict[str, TableSchema]:
+    # The index needs every table's metadata; the same round-trip warms the schema cache
+    tables = BigQueryRunner(dataset_id=DEFAULT_DATASET_ID).get_tables_schema()
+    cache = get_schema_cache()
+    retrieved_at = time.time()
+    for table_name, table_schema in tables.items():
+        cache.put(DEFAULT_DATASET_ID, table_name, table_schema, retrieved_at=retrieved_at)
+    return tables
+
+
+def _fetch_last_modified(table_names: List[str]) -> Dict[str, float]:
+    return BigQueryRunner(dataset_id=DEFAULT_DATASET_ID).get_tables_last_modified(table_names)
+
+
+def _load_tables(table_names: List[str]) -> Tuple[Dict[str, TableSchema], float, bool]:
+    """Cache-first schema lookup; returns tables, oldest retrieval time and cache hit."""
+
+    cache = get_schema_cache()
+    dataset_id = DEFAULT_DATASET_ID
+    tables: Dict[str, TableSchema] = {}
+    retrieved_times: List[float] = []
+    missing_tables: List[str] = []
+
+    cached_tables = {table_name: cache.get(dataset_id, table_name) for table_name in table_names}
+    # Drop cached schemas of tables changed since; the cache rate-limits the lookup
+    modified = cache.last_modified_times(
+        dataset_id,
+        [table_name for table_name, cached in cached_tables.items() if cached is not None],
+        _fetch_last_modified,
+    )
+
+    for table_name in table_names:
+        cached = cached_tables[table_name]
+        if cached is not None and table_name in modified:
+            cached = cache.get(dataset_id, table_name, last_modified=modified[table_name])
+        if cached is None:
+            missing_tables.append(table_name)
+            continue
+        table_schema, retrieved_at = cached
+        tables[table_name] = table_schema
+        retrieved_times.append(retrieved_at)
+
+    if missing_tables:
+        # One bulk metadata round-trip for every table the cache could not serve
+        runner = BigQueryRunner(dataset_id=dataset_id)
+        fetched_tables = runner.get_tables_schema(missing_tables)
+        retrieved_at = time.time()
+
+        for table_name, table_schema in fetched_tables.items():
+            cache.put(dataset_id, table_name, table_schema, retrieved_at=retrieved_at)
+            tables[table_name] = table_schema
+            retrieved_times.append(retrieved_at)
+
+            LOGGER.info(
+                "Schema retrieved for table",
+                extra={
+                    "table": table_name,
+                    "columns": len(table_schema.get("columns", {})),
+                    "row_count": table_schema.get("row_count"),
+                },
+            )
+
+    return tables, min(retrieved_times) if retrieved_times else time.time(), not missing_tables
+
+
+async def schema_retrieval_node_async(state: AgentState) -> AgentState:
+    """Async ``schema_retrieval_node``; the metadata query runs in a worker thread."""
+
+    return await asyncio.to_thread(schema_retrieval_node, state)
+
+
+async def schema_prefetch_node_async(state: AgentState) -> AgentState:
+    """Async ``schema_prefetch_node``; the metadata query runs in a worker thread."""
+
+    return await asyncio.to_thread(schema_prefetch_node, state)
@@ -6,7 +6,7 @@ import json
 import logging
 import re
 import time
-from typing import Any, Dict
+from typing import Any, Optional
 
 from langchain_core.messages import HumanMessage
 
@@ -14,42 +14,26 @@ from ..constants import (
     CHART_TYPE_BY_ANALYSIS,
     DEFAULT_ANALYSIS_TYPE,
     LLMProvider,
+    SQL_GENERATION_MODEL,
+    SQL_MEMO_EXAMPLE_SIMILARITY,
+    SQL_MEMO_MAX_EXAMPLES,
     AnalysisType,
 )
+from ..metrics import record_attempt_timing
 from ..models.state import AgentState
 from ..models.sql_generation_types import SQLGenerationStep
+from ..services.llm_cache import record_llm_cache_hit, with_response_cache
 from ..services.llm_client import get_chat_model
+from ..services.llm_usage import llm_span, record_llm_usage
+from ..services.schema_context import build_schema_context
+from ..services.sql_memo import get_sql_memo
+from ..services.sql_normalizer import fingerprint_sql
 from ..config import get_settings
 from .prompts import SQL_GENERATION_PROMPT, SQL_GENERATION_RETRY_PROMPT
 
 LOGGER = logging.getLogger(__name__)
 
 
-def _schema_to_context(schema_info: Dict[str, Any]) -> str:
-    """
-    Convert schema_info dict to readable text format for LLM prompt.
-
-    Example output:
-    ## orders
-    - order_id: INT64
-    - user_id: INT64
-    - created_at: TIMESTAMP
-    ...
-    """
-
-    if not schema_info or "tables" not in schema_info:
-        return "(No schema available)"
-
-    lines = []
-    for table_name, table_info in schema_info.get("tables", {}).items():
-        lines.append(f"## {table_name}")
-        for col_name, col_type in table_info.get("columns", {}).items():
-            lines.append(f"- {col_name}: {col_type}")
-        lines.append("")
-
-    return "\n".join(lines)
-
-
 def _extract_sql_from_response(response_text: str) -> str:
     """Extract SQL from code block or use entire response."""
 
@@ -69,31 +53,45 @@ def _extract_sql_from_response(response_text: str) -> str:
     return response_text.strip()
 
 
+def _last_fingerprint(state: AgentState) -> str:
+    history = state.get("sql_generation_history", [])
+    if history:
+        return history[-1].get("fingerprint") or fingerprint_sql(history[-1].get("sql", ""))
+    return fingerprint_sql(state.get("sql_query", ""))
+
+
 def _get_sql_generation_model():
     """
     Get chat model for SQL generation.
     Uses gemini-1.5-pro for better SQL generation quality.
     Falls back to default model if gemini-1.5-pro is not available.
+    The instance is shared through the chat model cache.
     """
     settings = get_settings()
-    
+
     # Try to use gemini-1.5-pro for SQL generation
-    try:
-        from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore import
-        
-        if settings.google_api_key:
-            return ChatGoogleGenerativeAI(
-                model="gemini-1.5-pro",
-                google_api_key=settings.google_api_key,
+    if settings.google_api_key and settings.default_llm_provider != LLMProvider.FAKE:
+        try:
+            return get_chat_model(
                 temperature=0.0,
+                provider=LLMProvider.GOOGLE,
+                model_name=SQL_GENERATION_MODEL,
             )
-    except Exception as e:
-        LOGGER.debug("Failed to create gemini-1.5-pro model, falling back to default", extra={"error": str(e)})
-    
+        except Exception as e:
+            LOGGER.debug("Failed to create gemini-1.5-pro model, falling back to default", extra={"error": str(e)})
+
     # Fallback to default model
     return get_chat_model(temperature=0.0)
 
 
+def _model_for_attempt(state: AgentState):
+    # Retries must reach the model: a cached answer would repeat the failed SQL
+    chat_model = _get_sql_generation_model()
+    if state.get("sql_generation_attempt", 1) > 1:
+        return chat_model
+    return with_response_cache(chat_model, "sql_generation")
+
+
 def sql_generation_node(state: AgentState) -> AgentState:
     """
     Generate SQL query using LLM with schema context.
@@ -113,108 +111,197 @@ def sql_generation_node(state: AgentState) -> AgentState:
     On error, logs warning but doesn't crash (may use fallback template later).
     """
 
-    user_query = state.get("user_query", "").strip()
-    analysis_type = state.get("analysis_type", DEFAULT_ANALYSIS_TYPE.value)
-    schema_info = state.get("schema_info", {})
-    attempt_number = state.get("sql_generation_attempt", 1)
-    last_error = state.get("last_execution_error")
+    start_time = time.perf_counter()
+    prompt = _build_prompt(state)
+    if prompt is None:
+        return state
+
+    try:
+        chat_model = _model_for_attempt(state)
+        with llm_span("sql_generation"):
+            response = chat_model.invoke([HumanMessage(content=prompt)])
+            record_llm_usage(state, "sql_generation", prompt, response)
+        _apply_response(state, response, start_time)
+    except Exception as exc:  # pragma: no cover
+        _record_failure(state, exc)
+
+    return state
+
+
+async def sql_generation_node_async(state: AgentState) -> AgentState:
+    """Async ``sql_generation_node`` using ``ainvoke``."""
 
     start_time = time.perf_counter()
+    prompt = _build_prompt(state)
+    if prompt is None:
+        return state
+
+    try:
+        chat_model = _model_for_attempt(state)
+        with llm_span("sql_generation"):
+            response = await chat_model.ainvoke([HumanMessage(content=prompt)])
+            record_llm_usage(state, "sql_generation", prompt, response)
+        _apply_response(state, response, start_time)
+    except Exception as exc:  # pragma: no cover
+        _record_failure(state, exc)
+
+    return state
 
+
+def _build_prompt(state: AgentState) -> Optional[str]:
+    user_query = state.get("user_query", "").strip()
     if not user_query:
         LOGGER.warning("No user query provided to SQL generation node")
         state["sql_query"] = ""
-        return state
-
-    try:
-        # Format schema for prompt
-        schema_context = _schema_to_context(schema_info)
-
-        # Choose prompt template based on attempt
-        if attempt_number == 1:
-            # First attempt: standard prompt
-            prompt_template = SQL_GENERATION_PROMPT
-            prompt = prompt_template.format(
-                schema_context=schema_context,
-                user_query=user_query,
-            )
-        else:
-            # Retry attempt: include error context
-            failed_sql = state.get("sql_query", "")
-            prompt_template = SQL_GENERATION_RETRY_PROMPT
-            prompt = prompt_template.format(
-                schema_context=schema_context,
-                attempt_number=attempt_number,
-                failed_sql=failed_sql,
-                error_message=last_error or "Unknown error",
-            )
+        return None
 
-        # Call LLM
-        chat_model = _get_sql_generation_model()
-        response = chat_model.invoke([HumanMessage(content=prompt)])
-        response_text = response.content if hasattr(response, "content") else str(response)
+    schema_context = _schema_context(state, user_query)
+    attempt_number = state.get("sql_generation_attempt", 1)
 
-        # Extract SQL from response
-        generated_sql = _extract_sql_from_response(response_text)
+    # Choose prompt template based on attempt
+    if attempt_number == 1:
+        # First attempt: standard prompt, plus SQL that answered similar questions
+        return SQL_GENERATION_PROMPT.format(
+            schema_context=schema_context,
+            memo_examples=_memo_examples(state, user_query),
+            user_query=user_query,
+        )
 
-        if not generated_sql:
-            LOGGER.warning("No SQL extracted from LLM response")
-            state["sql_query"] = ""
-            return state
+    # Retry attempt: include error context
+    return SQL_GENERATION_RETRY_PROMPT.format(
+        schema_context=schema_context,
+        attempt_number=attempt_number,
+        failed_sql=state.get("sql_query", ""),
+        error_message=state.get("last_execution_error") or "Unknown error",
+    )
+
+
+def _schema_context(state: AgentState, user_query: str) -> str:
+    # Prompt size stays flat as tables are added: only the most relevant columns fit the budget
+    context = build_schema_context(
+        state.get("schema_info"),
+        user_query,
+        state.get("analysis_type"),
+        get_settings().schema_context_token_budget,
+    )
+    saved = context["full_tokens"] - context["tokens"]
+    metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    metrics["schema_context_tokens"] = context["tokens"]
+    metrics["schema_context_tokens_saved"] = saved
+    state["metrics"] = metrics
+    LOGGER.info(
+        "Schema context built",
+        extra={
+            "tokens": context["tokens"],
+            "tokens_saved": saved,
+            "columns": context["columns"],
+            "omitted_columns": context["omitted_columns"],
+        },
+    )
+    return context["text"]
+
+
+def _memo_examples(state: AgentState, user_query: str) -> str:
+    memo = get_sql_memo()
+    if memo is None:
+        return ""
+
+    matches = [
+        match
+        for match in memo.search(user_query, state.get("analysis_type"), limit=SQL_MEMO_MAX_EXAMPLES)
+        if match["similarity"] >= SQL_MEMO_EXAMPLE_SIMILARITY
+    ]
+    metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    metrics["sql_memo_examples"] = len(matches)
+    state["metrics"] = metrics
+
+    blocks = [
+        f"\nExample {index} (previously answered successfully):\n"
+        f"User Query: \"{match['entry']['question']}\"\n"
+        f"Generated SQL:\n```sql\n{match['entry']['sql']}\n```\n"
+        for index, match in enumerate(matches, start=3)
+    ]
+    return "".join(blocks)
+
+
+def _apply_response(state: AgentState, response: Any, start_time: float) -> None:
+    analysis_type = state.get("analysis_type", DEFAULT_ANALYSIS_TYPE.value)
+    attempt_number = state.get("sql_generation_attempt", 1)
+    last_error = state.get("last_execution_error")
+    response_text = response.content if hasattr(response, "content") else str(response)
+    # Kept even when no SQL is extracted: the failure evicts the useless answer
+    state["llm_cache_key"] = (getattr(response, "response_metadata", None) or {}).get("llm_cache_key")
 
-        # Validate SQL is not empty
-        if len(generated_sql.strip()) < 10:
-            LOGGER.warning("Generated SQL too short", extra={"length": len(generated_sql)})
-            state["sql_query"] = ""
-            return state
+    # Extract SQL from response
+    generated_sql = _extract_sql_from_response(response_text)
 
-        state["sql_query"] = generated_sql
+    if not generated_sql:
+        LOGGER.warning("No SQL extracted from LLM response")
+        state["sql_query"] = ""
+        return
 
-        # Set chart_type based on analysis_type (for visualization node)
-        try:
-            analysis_type_enum = AnalysisType(analysis_type)
-            chart_type = CHART_TYPE_BY_ANALYSIS.get(analysis_type_enum)
-            if chart_type:
-                state["chart_type"] = chart_type.value
-        except (ValueError, KeyError):
-            # Fallback to default if analysis_type is not recognized
-            LOGGER.debug("Could not determine chart_type from analysis_type", extra={"analysis_type": analysis_type})
-
-        # Track generation attempt
-        latency_ms = int((time.perf_counter() - start_time) * 1000)
-        generation_step: SQLGenerationStep = {
-            "attempt_number": attempt_number,
-            "sql": generated_sql,
-            "reasoning": f"Attempt {attempt_number}: {last_error or 'First attempt'}",
-            "timestamp": time.time(),
-            "duration_ms": latency_ms,
-            "model": "gemini-1.5-pro",
-        }
-
-        history = list(state.get("sql_generation_history", []))
-        history.append(generation_step)
-        state["sql_generation_history"] = history
-
-        # Track metrics
-        metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
-        metrics["sql_generation_time_ms"] = latency_ms
-        state["metrics"] = metrics
-
-        LOGGER.info(
-            "SQL generated",
-            extra={
-                "attempt": attempt_number,
-                "sql_length": len(generated_sql),
-                "latency_ms": latency_ms,
-            },
-        )
+    # Validate SQL is not empty
+    if len(generated_sql.strip()) < 10:
+        LOGGER.warning("Generated SQL too short", extra={"length": len(generated_sql)})
+        state["sql_query"] = ""
+        return
 
-    except Exception as exc:  # pragma: no cover
+    fingerprint = fingerprint_sql(generated_sql)
+    if attempt_number > 1 and fingerprint == _last_fingerprint(state):
         LOGGER.warning(
-            "SQL generation failed",
-            extra={"error": str(exc), "attempt": attempt_number},
+            "Retry produced the same SQL as the failed attempt",
+            extra={"attempt": attempt_number, "fingerprint": fingerprint},
         )
-        state["sql_query"] = ""
 
-    return state
+    state["sql_query"] = generated_sql
+    state["sql_source"] = "llm"
 
+    # Set chart_type based on analysis_type (for visualization node)
+    try:
+        analysis_type_enum = AnalysisType(analysis_type)
+        chart_type = CHART_TYPE_BY_ANALYSIS.get(analysis_type_enum)
+        if chart_type:
+            state["chart_type"] = chart_type.value
+    except (ValueError, KeyError):
+        # Fallback to default if analysis_type is not recognized
+        LOGGER.debug("Could not determine chart_type from analysis_type", extra={"analysis_type": analysis_type})
+
+    # Track generation attempt
+    latency_ms = int((time.perf_counter() - start_time) * 1000)
+    generation_step: SQLGenerationStep = {
+        "attempt_number": attempt_number,
+        "sql": generated_sql,
+        "reasoning": f"Attempt {attempt_number}: {last_error or 'First attempt'}",
+        "timestamp": time.time(),
+        "duration_ms": latency_ms,
+        "model": SQL_GENERATION_MODEL,
+        "fingerprint": fingerprint,
+    }
+
+    history = list(state.get("sql_generation_history", []))
+    history.append(generation_step)
+    state["sql_generation_history"] = history
+
+    # Track metrics
+    metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    metrics["sql_generation_time_ms"] = latency_ms
+    state["metrics"] = metrics
+    record_attempt_timing(state, "generation", latency_ms)
+    record_llm_cache_hit(state, response)
+
+    LOGGER.info(
+        "SQL generated",
+        extra={
+            "attempt": attempt_number,
+            "sql_length": len(generated_sql),
+            "latency_ms": latency_ms,
+        },
+    )
+
+
+def _record_failure(state: AgentState, exc: Exception) -> None:
+    LOGGER.warning(
+        "SQL generation failed",
+        extra={"error": str(exc), "attempt": state.get("sql_generation_attempt", 1)},
+    )
+    state["sql_query"] = ""
@@ -1,18 +1,20 @@
-"""Visualization node: convert tabular results into Plotly JSON."""
+"""Visualization node: convert tabular results into Plotly JSON and queue the PNG export."""
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import os
-import time
-from pathlib import Path
 from typing import Sequence
 
 import pandas as pd
 import plotly.express as px
 
-from ..constants import ChartType
+from ..config import get_settings
+from ..constants import CHART_IMAGE_HEIGHT, CHART_IMAGE_WIDTH, ChartImageMode, ChartType
+from ..models.columnar import ColumnarData
 from ..models.state import AgentState
+from ..services.chart_downsampling import downsample_for_chart
+from ..services.chart_renderer import chart_file_path, get_chart_renderer
 
 
 LOGGER = logging.getLogger(__name__)
@@ -31,7 +33,7 @@ def visualization_node(state: AgentState) -> AgentState:
         state["chart_json"] = None
         return state
 
-    data_frame = pd.DataFrame(data)
+    data_frame = ColumnarData.coerce(data).to_frame()
     columns = list(data_frame.columns)
     if not columns:
         state["chart_json"] = None
@@ -44,28 +46,36 @@ def visualization_node(state: AgentState) -> AgentState:
         LOGGER.warning("Unsupported chart type; defaulting to bar", extra={"raw_chart_type": raw_chart_type})
         chart_type = ChartType.BAR
 
+    max_points = get_settings().chart_max_points
+    plot_frame, downsampled = downsample_for_chart(chart_type, data_frame, columns, max_points)
+    state["chart_downsampled"] = downsampled
+    state["chart_source_rows"] = len(data_frame)
+    if downsampled:
+        LOGGER.info(
+            "Downsampled chart data",
+            extra={"source_rows": len(data_frame), "plotted_rows": len(plot_frame), "chart_type": chart_type.value},
+        )
+
     try:
-        figure = _create_figure(chart_type, data_frame, columns, state)
-        figure.update_layout(height=600, width=1100)
+        figure = _create_figure(chart_type, plot_frame, columns, state)
+        figure.update_layout(height=CHART_IMAGE_HEIGHT, width=CHART_IMAGE_WIDTH)
         state["chart_json"] = figure.to_json()
-
-        try:
-            output_dir = _resolve_output_dir()
-            output_dir.mkdir(parents=True, exist_ok=True)
-            file_name = f"{state.get('analysis_type', 'chart')}_{int(time.time())}.png"
-            file_path = output_dir / file_name
-            figure.write_image(str(file_path))
-            state["chart_image_path"] = str(file_path)
-        except Exception as artwork_error:  # pragma: no cover - filesystem/driver issues
-            LOGGER.warning("Failed to write chart image", exc_info=artwork_error)
     except Exception as exc:  # pragma: no cover - plotting libs
         LOGGER.exception("Visualization failed")
         state["chart_json"] = None
         state["error_message"] = f"Visualization error: {exc}"
+        return state
 
+    _export_image(state, state["chart_json"])
     return state
 
 
+async def visualization_node_async(state: AgentState) -> AgentState:
+    """Async ``visualization_node``; plotting runs in a worker thread."""
+
+    return await asyncio.to_thread(visualization_node, state)
+
+
 def _create_figure(chart_type: ChartType, df: pd.DataFrame, columns: Sequence[str], state: AgentState):
     if chart_type == ChartType.LINE:
         x_col = columns[0]
@@ -81,10 +91,19 @@ def _create_figure(chart_type: ChartType, df: pd.DataFrame, columns: Sequence[st
     return px.bar(df, x=columns[0], y=y_col)
 
 
-def _resolve_output_dir() -> Path:
-    env_path = os.getenv("PLOT_OUTPUT_DIR")
-    if env_path:
-        return Path(env_path)
-    return Path.cwd() / "data-plotly"
-
+def _export_image(state: AgentState, chart_json: str) -> None:
+    # PNG export goes to the warm renderer; only SYNC mode waits for it here
+    mode = get_settings().chart_image_mode
+    if mode == ChartImageMode.ON_DEMAND:
+        return
 
+    file_path = chart_file_path(state)
+    renderer = get_chart_renderer()
+    try:
+        if mode == ChartImageMode.SYNC:
+            state["chart_image_path"] = renderer.render(chart_json, file_path)
+        else:
+            renderer.submit(chart_json, file_path)
+            state["chart_image_pending"] = str(file_path)
+    except Exception as artwork_error:  # pragma: no cover - filesystem/driver issues
+        LOGGER.warning("Failed to write chart image", exc_info=artwork_error)
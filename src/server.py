@@ -0,0 +1,362 @@
+"""HTTP serving mode: one compiled graph behind a bounded worker pool.
+
+Run with ``python -m src.server``. Endpoints:
+
+- ``POST /v1/analyze`` – ``{"question": "..."}``, returns the final state as JSON
+- ``POST /v1/analyze/stream`` – same input, streams NDJSON progress per node
+- ``GET /v1/stats`` – queue depth, counters and BigQuery client pool usage
+- ``GET /healthz`` – liveness probe
+
+Requests beyond ``SERVER_WORKERS`` running plus ``SERVER_MAX_QUEUE`` waiting
+are rejected with 503 so the gateway can retry elsewhere.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Optional, TypedDict
+
+from .config import get_settings
+from .constants import SERVER_RESULT_ROWS, ChartImageMode
+from .graph import compile_agent
+from .models.columnar import ColumnarData
+from .models.state import AgentState
+from .services.bigquery_pool import get_client_pool, shutdown_client_pool
+from .services.chart_renderer import get_chart_renderer, shutdown_chart_renderer
+from .services.llm_client import get_chat_model
+from .services.sql_templates import routing_stats
+from .services.table_index import get_table_index_store
+from .services.tracing import trace_request
+
+
+LOGGER = logging.getLogger(__name__)
+
+# State keys returned to clients (bulky internals such as schema_info are omitted)
+OUTPUT_FIELDS = (
+    "user_query",
+    "analysis_type",
+    "analysis_plan",
+    "sql_query",
+    "sql_template",
+    "sql_source",
+    "chart_type",
+    "chart_image_path",
+    "chart_image_pending",
+    "chart_downsampled",
+    "insights",
+    "validation_passed",
+    "error_message",
+    "preflight",
+    "metrics",
+)
+PROGRESS_FIELDS = ("analysis_type", "sql_query", "preflight", "validation_passed", "error_message")
+
+_STREAM_END = object()
+
+
+class ServerBusyError(RuntimeError):
+    """Raised when the worker pool and its queue are full."""
+
+
+class ServiceStats(TypedDict):
+    """Snapshot of request handling counters."""
+
+    workers: int
+    max_queue: int
+    in_flight: int
+    queued: int
+    completed: int
+    failed: int
+    rejected: int
+
+
+class AgentService:
+    """Run agent requests on a fixed worker pool with admission control.
+
+    The graph is compiled once and shared; BigQuery and LLM clients are shared
+    through their process-wide pools.
+    """
+
+    def __init__(self, agent: Any = None, workers: int = 0, max_queue: int = -1) -> None:
+        settings = get_settings()
+        self._agent = agent if agent is not None else compile_agent()
+        self._workers = workers or settings.server_workers
+        self._max_queue = max_queue if max_queue >= 0 else settings.server_max_queue
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="agent-worker")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def run(self, question: str) -> AgentState:
+        """Answer ``question`` on the worker pool and wait for the final state."""
+
+        self._admit()
+        return self._executor.submit(self._tracked, self._invoke, question).result()
+
+    def stream(self, question: str) -> Iterator[Dict[str, Any]]:
+        """Yield one progress event per completed node, then the final result."""
+
+        self._admit()
+        events: "queue.Queue[Any]" = queue.Queue()
+        self._executor.submit(self._tracked, self._stream_into, question, events)
+        while True:
+            event = events.get()
+            if event is _STREAM_END:
+                return
+            yield event
+
+    def stats(self) -> ServiceStats:
+        with self._lock:
+            return {
+                "workers": self._workers,
+                "max_queue": self._max_queue,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self._workers),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._in_flight >= self._workers + self._max_queue:
+                self._rejected += 1
+                raise ServerBusyError("All workers are busy and the request queue is full")
+            self._in_flight += 1
+
+    def _tracked(self, func: Any, *args: Any) -> Any:
+        succeeded = False
+        try:
+            result = func(*args)
+            succeeded = True
+            return result
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if succeeded:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+    def _invoke(self, question: str) -> AgentState:
+        with trace_request(question):
+            return self._agent.invoke(_initial_state(question))
+
+    def _stream_into(self, question: str, events: "queue.Queue[Any]") -> None:
+        final_state: AgentState = _initial_state(question)
+        try:
+            with trace_request(question):
+                step_start = time.perf_counter()
+                for update in self._agent.stream(final_state, stream_mode="updates"):
+                    elapsed_ms = int((time.perf_counter() - step_start) * 1000)
+                    for node, node_state in update.items():
+                        node_state = node_state or {}
+                        events.put(
+                            {
+                                "event": "node",
+                                "node": node,
+                                "elapsed_ms": elapsed_ms,
+                                "output": {key: node_state[key] for key in PROGRESS_FIELDS if key in node_state},
+                            }
+                        )
+                        if node_state:
+                            final_state = node_state
+                    step_start = time.perf_counter()
+            events.put({"event": "result", "state": serialize_state(final_state)})
+        except Exception as exc:
+            LOGGER.exception("Streaming request failed")
+            events.put({"event": "error", "error": str(exc)})
+            raise
+        finally:
+            events.put(_STREAM_END)
+
+
+def serialize_state(state: AgentState, max_rows: int = SERVER_RESULT_ROWS) -> Dict[str, Any]:
+    """JSON-ready view of the agent outputs, with at most ``max_rows`` result rows."""
+
+    payload: Dict[str, Any] = {key: state.get(key) for key in OUTPUT_FIELDS if key in state}
+
+    chart_json = state.get("chart_json")
+    payload["chart"] = json.loads(chart_json) if chart_json else None
+
+    results = state.get("bq_results")
+    if results:
+        data = ColumnarData.coerce(results.get("data"))
+        payload["results"] = {
+            "columns": data.columns,
+            "row_count": len(data),
+            "rows": data[:max_rows],
+            "truncated": len(data) > max_rows,
+            # Rows from a TABLESAMPLE run cover only this share of the data
+            "sample_percent": state.get("preflight", {}).get("sample_percent"),
+        }
+    return payload
+
+
+def _initial_state(question: str) -> AgentState:
+    return {
+        "user_query": question,
+        "metrics": {},
+        "validation_passed": False,
+    }
+
+
+class AgentRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the ``AgentService`` attached to the server."""
+
+    protocol_version = "HTTP/1.1"
+    server: "AgentHTTPServer"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path == "/healthz":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/v1/stats":
+            stats = dict(self.server.service.stats())
+            stats["bigquery_clients"] = get_client_pool().stats()
+            stats["chart_renderer"] = get_chart_renderer().stats()
+            stats["sql_templates"] = routing_stats()
+            self._send_json(HTTPStatus.OK, stats)
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        if self.path not in {"/v1/analyze", "/v1/analyze/stream"}:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+
+        question = self._read_question()
+        if question is None:
+            return
+
+        try:
+            if self.path == "/v1/analyze":
+                state = self.server.service.run(question)
+                self._send_json(HTTPStatus.OK, serialize_state(state))
+            else:
+                self._send_stream(self.server.service.stream(question))
+        except ServerBusyError as busy:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(busy)}, {"Retry-After": "1"})
+        except Exception as exc:  # pragma: no cover - surfaced to the client
+            LOGGER.exception("Request failed")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        LOGGER.debug("HTTP %s", format % args)
+
+    def _read_question(self) -> Optional[str]:
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            question = str(body.get("question") or body.get("user_query") or "").strip()
+        except (ValueError, AttributeError):
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Body must be a JSON object"})
+            return None
+        if not question:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Missing 'question'"})
+            return None
+        return question
+
+    def _send_json(self, status: HTTPStatus, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, events: Iterator[Dict[str, Any]]) -> None:
+        # Pull the first event before committing to 200 so a busy pool still gets a 503
+        first = next(events, None)
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in ([first] if first is not None else []):
+            self._write_chunk(event)
+        for event in events:
+            self._write_chunk(event)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, event: Dict[str, Any]) -> None:
+        line = (json.dumps(event, default=str) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+        self.wfile.flush()
+
+
+class AgentHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server that owns an ``AgentService``."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: AgentService) -> None:
+        super().__init__(address, AgentRequestHandler)
+        self.service = service
+
+
+def create_server(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    service: Optional[AgentService] = None,
+) -> AgentHTTPServer:
+    """Build (but do not start) the HTTP server; ``port=0`` picks a free port."""
+
+    settings = get_settings()
+    return AgentHTTPServer(
+        (host or settings.server_host, settings.server_port if port is None else port),
+        service or AgentService(),
+    )
+
+
+def warm_shared_clients() -> None:
+    """Create the pooled BigQuery client, chat model, table index and chart renderer before the first request."""
+
+    settings = get_settings()
+    try:
+        get_client_pool().acquire(settings.google_project_id, settings.bigquery_location)
+    except Exception as exc:  # pragma: no cover - credentials/environment
+        LOGGER.warning("Could not pre-create BigQuery client", extra={"error": str(exc)})
+    try:
+        get_chat_model(temperature=0.0)
+    except Exception as exc:  # pragma: no cover - credentials/environment
+        LOGGER.warning("Could not pre-create chat model", extra={"error": str(exc)})
+    # Reads the persisted table index; a stale one is rebuilt by the first request's prefetch
+    get_table_index_store()
+    if settings.chart_image_mode != ChartImageMode.ON_DEMAND:
+        get_chart_renderer().start()
+
+
+def serve() -> None:
+    """Run the HTTP server until interrupted."""
+
+    logging.basicConfig(level=logging.INFO)
+    warm_shared_clients()
+    server = create_server()
+    host, port = server.server_address[:2]
+    LOGGER.info("Serving agent on http://%s:%s", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+        shutdown_chart_renderer()
+        shutdown_client_pool()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,233 @@
+"""Run many questions through the compiled graph with bounded concurrency."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import logging
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, TypedDict
+
+from ..models.state import AgentState
+from .tracing import Span, trace_request
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BatchQuestion(TypedDict):
+    """One input question; ``id`` is the resume key."""
+
+    id: str
+    question: str
+
+
+class NodeLatency(TypedDict):
+    """Aggregate wall time of one graph node across a batch."""
+
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class BatchSummary(TypedDict):
+    """Outcome counters for a batch run."""
+
+    completed: int
+    """Questions that produced validated results"""
+    failed: int
+    """Questions that ended with an error or failed validation"""
+    skipped: int
+    template_hit_rate: float
+    """Share of answered questions whose SQL came from a template"""
+    elapsed_sec: float
+    node_latency: Dict[str, NodeLatency]
+
+
+def load_questions(path: Path) -> List[BatchQuestion]:
+    """Read questions from JSONL or CSV (``id`` and ``question``/``query`` fields).
+
+    Rows without an ``id`` are keyed by their 1-based position, which stays
+    stable across resumed runs as long as the input file is unchanged.
+    """
+
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as handle:
+            rows: List[Dict[str, Any]] = list(csv.DictReader(handle))
+    else:
+        with path.open(encoding="utf-8") as handle:
+            rows = [json.loads(line) for line in handle if line.strip()]
+
+    questions: List[BatchQuestion] = []
+    for index, row in enumerate(rows, start=1):
+        text = str(row.get("question") or row.get("query") or "").strip()
+        if not text:
+            LOGGER.warning("Skipping batch row without a question", extra={"row": index})
+            continue
+        questions.append({"id": str(row.get("id") or index), "question": text})
+    return questions
+
+
+def completed_ids(output_path: Path) -> Set[str]:
+    """Ids already answered in ``output_path``.
+
+    Rows that raised (``status == "error"``) are retried on the next run, and a
+    torn last line from a crash is ignored.
+    """
+
+    if not output_path.exists():
+        return set()
+
+    done: Set[str] = set()
+    with output_path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+                if record.get("status") != "error":
+                    done.add(str(record["id"]))
+            except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                continue
+    return done
+
+
+async def run_batch(
+    agent: Any,
+    questions: Iterable[BatchQuestion],
+    output_path: Path,
+    concurrency: int,
+    resume: bool = True,
+) -> BatchSummary:
+    """Answer ``questions`` with ``agent`` and append one JSON line per result.
+
+    ``agent`` is a compiled graph (preferably the async one); ``concurrency``
+    workers each stream one question at a time, and every result is flushed
+    as soon as it completes so an interrupted run can resume from the file.
+    """
+
+    start_time = time.perf_counter()
+    done = completed_ids(output_path) if resume else set()
+    pending: asyncio.Queue[BatchQuestion] = asyncio.Queue()
+    skipped = 0
+    for item in questions:
+        if item["id"] in done:
+            skipped += 1
+        else:
+            pending.put_nowait(item)
+
+    node_timings: Dict[str, List[float]] = defaultdict(list)
+    counters = {"completed": 0, "failed": 0, "template_hits": 0}
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with output_path.open("a" if resume else "w", encoding="utf-8") as handle:
+        if resume and _ends_mid_line(output_path):
+            # Terminate a line torn by a crash so the next record starts cleanly
+            handle.write("\n")
+
+        async def worker() -> None:
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                record = await _answer(agent, item, node_timings)
+                counters["completed" if record["status"] == "ok" else "failed"] += 1
+                counters["template_hits"] += bool(record["metrics"].get("sql_template_hit"))
+                # Single event loop thread: whole lines are written without interleaving
+                handle.write(json.dumps(record, default=str) + "\n")
+                handle.flush()
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+    processed = counters["completed"] + counters["failed"]
+    return {
+        "completed": counters["completed"],
+        "failed": counters["failed"],
+        "skipped": skipped,
+        "template_hit_rate": round(counters["template_hits"] / processed, 3) if processed else 0.0,
+        "elapsed_sec": round(time.perf_counter() - start_time, 3),
+        "node_latency": summarize_latencies(node_timings),
+    }
+
+
+def summarize_latencies(node_timings: Dict[str, List[float]]) -> Dict[str, NodeLatency]:
+    """Count, mean, median, p95 and max per node, in milliseconds."""
+
+    summary: Dict[str, NodeLatency] = {}
+    for node, timings in node_timings.items():
+        ordered = sorted(timings)
+        summary[node] = {
+            "count": len(ordered),
+            "mean_ms": round(statistics.fmean(ordered), 1),
+            "p50_ms": round(statistics.median(ordered), 1),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 1),
+            "max_ms": round(ordered[-1], 1),
+        }
+    return summary
+
+
+def _ends_mid_line(path: Path) -> bool:
+    with path.open("rb") as handle:
+        if handle.seek(0, 2) == 0:
+            return False
+        handle.seek(-1, 2)
+        return handle.read(1) != b"\n"
+
+
+async def _answer(agent: Any, item: BatchQuestion, node_timings: Dict[str, List[float]]) -> Dict[str, Any]:
+    initial_state: AgentState = {
+        "user_query": item["question"],
+        "metrics": {},
+        "validation_passed": False,
+    }
+    final_state: AgentState = initial_state
+    request_span: Optional[Span] = None
+    error: Optional[str] = None
+    status = "error"
+
+    try:
+        with trace_request(item["question"]) as request_span:
+            request_span.set_attributes(**{"agent.batch_id": item["id"]})
+            async for update in agent.astream(initial_state, stream_mode="updates"):
+                for node_state in update.values():
+                    if node_state:
+                        final_state = node_state
+        status = "ok" if final_state.get("validation_passed") else "failed"
+        error = None if status == "ok" else final_state.get("error_message")
+    except Exception as exc:
+        LOGGER.exception("Batch question failed", extra={"id": item["id"]})
+        error = f"{type(exc).__name__}: {exc}"
+
+    node_ms = _node_durations(request_span.spans if request_span is not None else [])
+    for node, durations in node_ms.items():
+        node_timings[node].extend(durations)
+
+    return {
+        "id": item["id"],
+        "question": item["question"],
+        "status": status,
+        "analysis_type": final_state.get("analysis_type"),
+        "sql": final_state.get("sql_query"),
+        "insights": final_state.get("insights"),
+        # Background exports finish after the record is written; the path is final either way
+        "chart_image_path": final_state.get("chart_image_path") or final_state.get("chart_image_pending"),
+        "metrics": final_state.get("metrics", {}),
+        "node_ms": {node: round(sum(durations), 1) for node, durations in node_ms.items()},
+        "error": error,
+    }
+
+
+def _node_durations(spans: List[Span]) -> Dict[str, List[float]]:
+    # Node spans time each node on its own, so parallel branches do not absorb each other's time
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for span in sorted(spans, key=lambda span: span.start_ns):
+        node = span.attributes.get("agent.node")
+        wall_ms = span.attributes.get("agent.node.wall_ms")
+        if node is not None and wall_ms is not None:
+            durations[node].append(wall_ms)
+    return durations
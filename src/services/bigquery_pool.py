@@ -0,0 +1,158 @@
+"""Process-wide registry of reusable BigQuery clients."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, TypedDict
+
+from google.cloud import bigquery
+from requests.adapters import HTTPAdapter
+
+from ..config import get_settings
+from ..constants import BigQueryBackend
+
+
+LOGGER = logging.getLogger(__name__)
+
+PoolKey = Tuple[Optional[str], Optional[str]]
+ClientFactory = Callable[[Optional[str], Optional[str]], bigquery.Client]
+ReadClientFactory = Callable[[bigquery.Client], Any]
+
+
+class ClientPoolStats(TypedDict):
+    """Snapshot of pool usage for monitoring."""
+
+    live_clients: int
+    created: int
+    reuse_count: int
+
+
+def _default_client_factory(project: Optional[str], location: Optional[str]) -> bigquery.Client:
+    if get_settings().bigquery_backend == BigQueryBackend.FAKE:
+        from .fake_bigquery import FakeBigQueryClient
+
+        return FakeBigQueryClient()
+    return bigquery.Client(project=project, location=location)
+
+
+def _default_read_client_factory(client: bigquery.Client) -> Any:
+    try:
+        from google.cloud import bigquery_storage  # type: ignore import
+    except ImportError:
+        LOGGER.debug("google-cloud-bigquery-storage not installed; using REST pages")
+        return None
+    return bigquery_storage.BigQueryReadClient(credentials=getattr(client, "_credentials", None))
+
+
+class BigQueryClientPool:
+    """Share one ``bigquery.Client`` per ``(project, location)`` across threads.
+
+    Reusing a client keeps its credentials, authorized HTTP session and open
+    keep-alive connections, so callers skip auth and TLS setup per request.
+    The BigQuery Storage read client (a gRPC channel) used for Arrow
+    downloads is likewise created once per pooled client.
+    """
+
+    def __init__(
+        self,
+        client_factory: Optional[ClientFactory] = None,
+        http_pool_size: int = 0,
+        read_client_factory: Optional[ReadClientFactory] = None,
+    ) -> None:
+        self._client_factory = client_factory or _default_client_factory
+        self._read_client_factory = read_client_factory or _default_read_client_factory
+        self._http_pool_size = http_pool_size
+        self._clients: Dict[PoolKey, bigquery.Client] = {}
+        # id(client) -> (client, read client); holding the client keeps its id from being reused
+        self._read_clients: Dict[int, Tuple[bigquery.Client, Any]] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reuse_count = 0
+
+    def acquire(self, project: Optional[str] = None, location: Optional[str] = None) -> bigquery.Client:
+        """Return the shared client for ``(project, location)``, creating it once."""
+
+        key = (project, location)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._reuse_count += 1
+                return client
+
+            client = self._client_factory(project, location)
+            self._configure_http(client)
+            self._clients[key] = client
+            self._created += 1
+
+        LOGGER.info("Created pooled BigQuery client", extra={"project": project, "location": location})
+        return client
+
+    def acquire_read_client(self, client: bigquery.Client) -> Any:
+        """Return the Storage read client paired with ``client`` (``None`` when unavailable), creating it once."""
+
+        with self._lock:
+            entry = self._read_clients.get(id(client))
+            if entry is None:
+                entry = (client, self._read_client_factory(client))
+                self._read_clients[id(client)] = entry
+        return entry[1]
+
+    def stats(self) -> ClientPoolStats:
+        """Return live client count and reuse counters."""
+
+        with self._lock:
+            return {
+                "live_clients": len(self._clients),
+                "created": self._created,
+                "reuse_count": self._reuse_count,
+            }
+
+    def shutdown(self) -> None:
+        """Close every pooled client and release its HTTP connections and gRPC channels."""
+
+        with self._lock:
+            clients = list(self._clients.values())
+            read_clients = [read_client for _, read_client in self._read_clients.values() if read_client is not None]
+            self._clients.clear()
+            self._read_clients.clear()
+
+        for read_client in read_clients:
+            try:
+                read_client.transport.close()
+            except Exception as exc:  # pragma: no cover - best-effort cleanup
+                LOGGER.debug("Failed to close BigQuery Storage client", extra={"error": str(exc)})
+
+        for client in clients:
+            try:
+                client.close()
+            except Exception as exc:  # pragma: no cover - best-effort cleanup
+                LOGGER.debug("Failed to close BigQuery client", extra={"error": str(exc)})
+
+    def _configure_http(self, client: bigquery.Client) -> None:
+        # Size the keep-alive pool for concurrent callers sharing one client
+        if self._http_pool_size <= 0:
+            return
+        try:
+            adapter = HTTPAdapter(pool_connections=self._http_pool_size, pool_maxsize=self._http_pool_size)
+            client._http.mount("https://", adapter)
+        except Exception as exc:  # pragma: no cover - depends on client internals
+            LOGGER.debug("Could not resize BigQuery HTTP pool", extra={"error": str(exc)})
+
+
+@lru_cache(maxsize=1)
+def get_client_pool() -> BigQueryClientPool:
+    """Return the process-wide client pool, closed automatically at exit."""
+
+    pool = BigQueryClientPool(http_pool_size=get_settings().bigquery_http_pool_size)
+    atexit.register(pool.shutdown)
+    return pool
+
+
+def shutdown_client_pool() -> None:
+    """Explicit shutdown hook for servers and long-running workers."""
+
+    if get_client_pool.cache_info().currsize:
+        get_client_pool().shutdown()
@@ -2,17 +2,64 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, TypedDict
 
 import pandas as pd
+import pyarrow as pa
 from google.cloud import bigquery
 
 from ..config import get_settings
+from ..constants import (
+    BIGQUERY_POLL_INITIAL_SEC,
+    BIGQUERY_POLL_MAX_SEC,
+    DEFAULT_DATASET_ID,
+    MAX_SCHEMA_FETCH_WORKERS,
+)
+from ..models.sql_generation_types import TableSchema
+from .bigquery_pool import get_client_pool
+from .tracing import SPAN_KIND_CLIENT, Span, start_span
 
 
 LOGGER = logging.getLogger(__name__)
 
+# One round-trip for columns, row counts, modification times and descriptions
+BULK_SCHEMA_QUERY = """
+    SELECT
+        c.table_name,
+        c.column_name,
+        c.data_type,
+        t.row_count,
+        t.last_modified_time,
+        o.option_value AS description
+    FROM `{dataset_id}.INFORMATION_SCHEMA.COLUMNS` AS c
+    LEFT JOIN `{dataset_id}.__TABLES__` AS t
+        ON t.table_id = c.table_name
+    LEFT JOIN `{dataset_id}.INFORMATION_SCHEMA.TABLE_OPTIONS` AS o
+        ON o.table_name = c.table_name AND o.option_name = 'description'
+    WHERE @all_tables OR c.table_name IN UNNEST(@table_names)
+    ORDER BY c.table_name, c.ordinal_position
+""".strip()
+
+# Modification times only; __TABLES__ is a metadata read, no table data is scanned
+TABLES_MODIFIED_QUERY = """
+    SELECT table_id, last_modified_time
+    FROM `{dataset_id}.__TABLES__`
+    WHERE table_id IN UNNEST(@table_names)
+""".strip()
+
+
+class FetchStats(TypedDict):
+    """Timing of a paged result download."""
+
+    pages: int
+    rows: int
+    page_ms: List[int]
+    truncated: bool
+
 
 class BigQueryRunner:
     """A lean BigQuery client for executing SQL queries."""
@@ -20,15 +67,18 @@ class BigQueryRunner:
     def __init__(
         self,
         project_id: Optional[str] = None,
-        dataset_id: str = "bigquery-public-data.thelook_ecommerce",
+        dataset_id: str = DEFAULT_DATASET_ID,
         client: Optional[bigquery.Client] = None,
     ) -> None:
         settings = get_settings()
         resolved_project = project_id or settings.google_project_id
-        self.client = client or bigquery.Client(project=resolved_project)
-        self.dataset_id = dataset_id
         self._maximum_bytes_billed = settings.bigquery_maximum_bytes_billed
         self._location = settings.bigquery_location
+        self._max_rows = settings.bigquery_max_rows
+        self._page_size = settings.bigquery_page_size
+        self._use_storage_api = settings.bigquery_use_storage_api
+        self.client = client or get_client_pool().acquire(resolved_project, self._location)
+        self.dataset_id = dataset_id
         LOGGER.debug(
             "Initialized BigQueryRunner", extra={"project": resolved_project, "dataset": dataset_id}
         )
@@ -40,20 +90,162 @@ class BigQueryRunner:
     ) -> pd.DataFrame:
         """Execute SQL query and return a DataFrame."""
 
+        with _bigquery_span("query") as span:
+            query_job = self._submit(sql_query, maximum_bytes_billed)
+            result_df = query_job.result().to_dataframe(create_bqstorage_client=False)
+            span.set_attributes(**{"bigquery.rows": len(result_df)})
+        LOGGER.info("Query completed", extra={"rows": len(result_df), "columns": list(result_df.columns)})
+        return result_df
+
+    def iter_query_pages(
+        self,
+        sql_query: str,
+        maximum_bytes_billed: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """Run SQL and stream the result as Arrow record batches, one per page.
+
+        Batches come from the BigQuery Storage Read API when it is enabled and
+        installed, otherwise from paged REST responses.
+        """
+
+        query_job = self._submit(sql_query, maximum_bytes_billed)
+        yield from self._iter_job_pages(query_job, page_size)
+
+    def execute_query_arrow(
+        self,
+        sql_query: str,
+        maximum_bytes_billed: Optional[int] = None,
+        max_rows: Optional[int] = None,
+    ) -> Tuple[pa.Table, FetchStats]:
+        """Execute SQL and collect up to ``max_rows`` rows into an Arrow table."""
+
+        with _bigquery_span("query") as span:
+            query_job = self._submit(sql_query, maximum_bytes_billed)
+            table, stats = self._collect_arrow(query_job, max_rows)
+            _set_fetch_attributes(span, stats)
+        return table, stats
+
+    async def execute_query_async(
+        self,
+        sql_query: str,
+        maximum_bytes_billed: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Async ``execute_query``: the event loop is free while the job runs."""
+
+        with _bigquery_span("query") as span:
+            query_job = await self._submit_and_wait(sql_query, maximum_bytes_billed)
+            result_df = await asyncio.to_thread(
+                lambda: query_job.result().to_dataframe(create_bqstorage_client=False)
+            )
+            span.set_attributes(**{"bigquery.rows": len(result_df)})
+        LOGGER.info("Query completed", extra={"rows": len(result_df), "columns": list(result_df.columns)})
+        return result_df
+
+    async def execute_query_arrow_async(
+        self,
+        sql_query: str,
+        maximum_bytes_billed: Optional[int] = None,
+        max_rows: Optional[int] = None,
+    ) -> Tuple[pa.Table, FetchStats]:
+        """Async ``execute_query_arrow``; pages are downloaded off the event loop."""
+
+        with _bigquery_span("query") as span:
+            query_job = await self._submit_and_wait(sql_query, maximum_bytes_billed)
+            table, stats = await asyncio.to_thread(self._collect_arrow, query_job, max_rows)
+            _set_fetch_attributes(span, stats)
+        return table, stats
+
+    async def dry_run_async(self, sql_query: str) -> int:
+        """Async ``dry_run`` (a single short API call, run in a worker thread)."""
+
+        return await asyncio.to_thread(self.dry_run, sql_query)
+
+    async def _submit_and_wait(self, sql_query: str, maximum_bytes_billed: Optional[int]) -> bigquery.QueryJob:
+        query_job = await asyncio.to_thread(self._submit, sql_query, maximum_bytes_billed)
+        # Poll with backoff instead of parking a thread in ``result()`` for the whole job
+        delay = BIGQUERY_POLL_INITIAL_SEC
+        while not await asyncio.to_thread(query_job.done):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BIGQUERY_POLL_MAX_SEC)
+        return query_job
+
+    def _iter_job_pages(
+        self,
+        query_job: bigquery.QueryJob,
+        page_size: Optional[int] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        row_iterator = query_job.result(page_size=page_size or self._page_size)
+        yield from row_iterator.to_arrow_iterable(bqstorage_client=self._bqstorage_client())
+
+    def _collect_arrow(
+        self,
+        query_job: bigquery.QueryJob,
+        max_rows: Optional[int],
+    ) -> Tuple[pa.Table, FetchStats]:
+        row_limit = max_rows if max_rows is not None else self._max_rows
+        batches: List[pa.RecordBatch] = []
+        stats: FetchStats = {"pages": 0, "rows": 0, "page_ms": [], "truncated": False}
+        schema: Optional[pa.Schema] = None
+
+        pages = self._iter_job_pages(query_job)
+        page_start = time.perf_counter()
+        for batch in pages:
+            stats["page_ms"].append(int((time.perf_counter() - page_start) * 1000))
+            stats["pages"] += 1
+            schema = batch.schema
+            if row_limit and stats["rows"] + batch.num_rows > row_limit:
+                batch = batch.slice(0, row_limit - stats["rows"])
+                stats["truncated"] = True
+            batches.append(batch)
+            stats["rows"] += batch.num_rows
+            if stats["truncated"]:
+                pages.close()
+                break
+            page_start = time.perf_counter()
+
+        table = pa.Table.from_batches(batches, schema=schema) if batches else pa.table({})
+        LOGGER.info(
+            "Query completed",
+            extra={"rows": stats["rows"], "pages": stats["pages"], "truncated": stats["truncated"]},
+        )
+        return table, stats
+
+    def _submit(self, sql_query: str, maximum_bytes_billed: Optional[int]) -> bigquery.QueryJob:
         job_config = bigquery.QueryJobConfig(
             maximum_bytes_billed=maximum_bytes_billed or self._maximum_bytes_billed
         )
-
         LOGGER.info("Executing BigQuery query", extra={"maximum_bytes_billed": job_config.maximum_bytes_billed})
-        query_job = self.client.query(
+        return self.client.query(
             sql_query,
             job_config=job_config,
             location=self._location,
         )
 
-        result_df = query_job.result().to_dataframe(create_bqstorage_client=False)
-        LOGGER.info("Query completed", extra={"rows": len(result_df), "columns": list(result_df.columns)})
-        return result_df
+    def _bqstorage_client(self):
+        # Shared per pooled client; the pool closes it on shutdown
+        if not self._use_storage_api:
+            return None
+        return get_client_pool().acquire_read_client(self.client)
+
+    def dry_run(self, sql_query: str) -> int:
+        """Validate SQL without running it and return the estimated bytes processed.
+
+        Syntax and semantic errors (unknown tables/columns) are raised as the
+        client's exceptions, exactly as a real execution would raise them.
+        """
+
+        job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+        with _bigquery_span("dry_run") as span:
+            query_job = self.client.query(
+                sql_query,
+                job_config=job_config,
+                location=self._location,
+            )
+            estimated_bytes = int(query_job.total_bytes_processed or 0)
+            span.set_attributes(**{"bigquery.estimated_bytes": estimated_bytes})
+        LOGGER.info("Dry run completed", extra={"estimated_bytes": estimated_bytes})
+        return estimated_bytes
 
     def get_table_schema(self, table_name: str) -> List[Dict[str, Any]]:
         """Return schema metadata for a table."""
@@ -71,3 +263,112 @@ class BigQueryRunner:
         ]
 
 
+
+    def get_tables_schema(self, table_names: Optional[Sequence[str]] = None) -> Dict[str, TableSchema]:
+        """Return schemas for many tables at once (all dataset tables when ``None``).
+
+        Uses a single INFORMATION_SCHEMA query and falls back to concurrent
+        ``get_table`` calls when the metadata views are not accessible.
+        """
+
+        with _bigquery_span("schema") as span:
+            try:
+                tables = self._query_tables_schema(table_names)
+            except Exception as exc:  # pragma: no cover - network/external dependency
+                if table_names is None:
+                    raise
+                LOGGER.warning("Bulk schema query failed; fetching tables concurrently", extra={"error": str(exc)})
+                tables = self._fetch_tables_schema_concurrently(table_names)
+            span.set_attributes(**{"bigquery.tables": len(tables)})
+        return tables
+
+    def get_tables_last_modified(self, table_names: Sequence[str]) -> Dict[str, float]:
+        """Return the last modification time (epoch seconds) of each existing table."""
+
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ArrayQueryParameter("table_names", "STRING", list(table_names))],
+        )
+        with _bigquery_span("last_modified") as span:
+            rows = self.client.query(
+                TABLES_MODIFIED_QUERY.format(dataset_id=self.dataset_id),
+                job_config=job_config,
+                location=self._location,
+            ).result()
+            modified = {row["table_id"]: row["last_modified_time"] / 1000.0 for row in rows}
+            span.set_attributes(**{"bigquery.tables": len(modified)})
+        return modified
+
+    def _query_tables_schema(self, table_names: Optional[Sequence[str]]) -> Dict[str, TableSchema]:
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("all_tables", "BOOL", table_names is None),
+                bigquery.ArrayQueryParameter("table_names", "STRING", list(table_names or [])),
+            ],
+        )
+        rows = self.client.query(
+            BULK_SCHEMA_QUERY.format(dataset_id=self.dataset_id),
+            job_config=job_config,
+            location=self._location,
+        ).result()
+
+        tables: Dict[str, TableSchema] = {}
+        for row in rows:
+            table_name = row["table_name"]
+            table_schema = tables.get(table_name)
+            if table_schema is None:
+                last_modified = row["last_modified_time"]
+                table_schema = {
+                    "name": table_name,
+                    "columns": {},
+                    "row_count": row["row_count"],
+                    "description": _unquote_option(row["description"]) or f"Table: {table_name}",
+                    "last_modified": last_modified / 1000.0 if last_modified is not None else None,
+                }
+                tables[table_name] = table_schema
+            table_schema["columns"][row["column_name"]] = str(row["data_type"])
+
+        LOGGER.info("Bulk schema query completed", extra={"tables": len(tables)})
+        return tables
+
+    def _fetch_tables_schema_concurrently(self, table_names: Sequence[str]) -> Dict[str, TableSchema]:
+        def fetch(table_name: str) -> Optional[TableSchema]:
+            try:
+                return _table_to_schema(table_name, self.client.get_table(f"{self.dataset_id}.{table_name}"))
+            except Exception as table_error:  # pragma: no cover - network/external dependency
+                LOGGER.warning(
+                    "Failed to retrieve schema for table",
+                    extra={"table": table_name, "error": str(table_error)},
+                )
+                return None
+
+        workers = max(1, min(MAX_SCHEMA_FETCH_WORKERS, len(table_names)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch, table_names))
+        return {table_name: schema for table_name, schema in zip(table_names, results) if schema is not None}
+
+
+def _bigquery_span(operation: str) -> Any:
+    return start_span(f"bigquery.{operation}", SPAN_KIND_CLIENT, **{"db.system": "bigquery", "db.operation.name": operation})
+
+
+def _set_fetch_attributes(span: Span, stats: FetchStats) -> None:
+    span.set_attributes(
+        **{"bigquery.rows": stats["rows"], "bigquery.pages": stats["pages"], "bigquery.truncated": stats["truncated"]}
+    )
+
+
+def _table_to_schema(table_name: str, table: bigquery.Table) -> TableSchema:
+    return {
+        "name": table_name,
+        "columns": {field.name: str(field.field_type) for field in table.schema},
+        "row_count": table.num_rows,
+        "description": table.description or f"Table: {table_name}",
+        "last_modified": table.modified.timestamp() if table.modified else None,
+    }
+
+
+def _unquote_option(value: Optional[str]) -> Optional[str]:
+    # TABLE_OPTIONS values are SQL literals, e.g. '"Orders placed by users"'
+    if value and len(value) >= 2 and value[0] == value[-1] and value[0] in {'"', "'"}:
+        return value[1:-1]
+    return value
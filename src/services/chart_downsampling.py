@@ -0,0 +1,161 @@
+"""Shape-preserving point reduction for large chart series."""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..constants import ChartType
+from .result_profiler import is_additive_column
+
+OTHER_BUCKET_LABEL = "Other"
+
+
+def downsample_for_chart(
+    chart_type: ChartType,
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    max_points: int,
+) -> Tuple[pd.DataFrame, bool]:
+    """Reduce ``df`` to roughly ``max_points`` rows for the given chart type.
+
+    Returns the (possibly unchanged) frame and whether it was downsampled.
+    Line charts use LTTB, bar charts keep the top categories plus an "Other"
+    bucket and scatter plots are binned on a regular grid.
+    """
+
+    if max_points <= 0 or len(df) <= max_points or not columns:
+        return df, False
+
+    if chart_type == ChartType.LINE:
+        return downsample_line(df, columns[0], columns[1:] or columns[:1], max_points), True
+    if chart_type == ChartType.SCATTER and len(columns) >= 2:
+        color_col = columns[2] if len(columns) > 2 else None
+        return grid_bin(df, columns[0], columns[1], max_points, color_col=color_col), True
+
+    y_col = columns[1] if len(columns) > 1 else columns[0]
+    return top_n_with_other(df, columns[0], y_col, max_points), True
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` visually key points."""
+
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n) if threshold >= n else np.array([0, n - 1][:max(threshold, 0)])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    # Interior points are split into equal buckets between the fixed end points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = edges[bucket + 1], edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean() if next_end > next_start else x[-1]
+        avg_y = y[next_start:next_end].mean() if next_end > next_start else y[-1]
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        areas = np.abs(
+            (x[previous] - avg_x) * (bucket_y - y[previous]) - (x[previous] - bucket_x) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas)) if len(areas) else start
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def downsample_line(df: pd.DataFrame, x_col: str, y_cols: Sequence[str], max_points: int) -> pd.DataFrame:
+    """Keep the LTTB-selected rows of each numeric series (union across series)."""
+
+    frame = df.sort_values(x_col, kind="stable").reset_index(drop=True)
+    x = _as_numeric_axis(frame[x_col])
+    numeric_cols = [col for col in y_cols if pd.api.types.is_numeric_dtype(frame[col])]
+    if not numeric_cols:
+        return frame.iloc[np.linspace(0, len(frame) - 1, max_points).astype(np.int64)]
+
+    per_series = max(3, max_points // len(numeric_cols))
+    keep: List[np.ndarray] = []
+    for col in numeric_cols:
+        y = frame[col].to_numpy(dtype=float, na_value=np.nan)
+        y = np.where(np.isnan(y), 0.0, y)
+        keep.append(lttb_indices(x, y, per_series))
+    return frame.iloc[np.unique(np.concatenate(keep))]
+
+
+def top_n_with_other(df: pd.DataFrame, x_col: str, y_col: str, max_bars: int) -> pd.DataFrame:
+    """Aggregate by category and fold everything past the top ``max_bars - 1`` into "Other".
+
+    Only additive measures (counts, totals, revenue) are summed; averages,
+    prices and rates are averaged per category and the tail is dropped,
+    since a summed "Other" bar would be meaningless for them.
+    """
+
+    if not pd.api.types.is_numeric_dtype(df[y_col]) or x_col == y_col:
+        return df.head(max_bars)
+
+    grouped = df.groupby(x_col, sort=False, dropna=False)[y_col]
+    if not is_additive_column(y_col):
+        return grouped.mean().sort_values(ascending=False).iloc[:max_bars].reset_index()
+
+    totals = grouped.sum().sort_values(ascending=False)
+    keep = max(1, max_bars - 1)
+    head = totals.iloc[:keep].reset_index()
+    if len(totals) <= keep:
+        return head
+
+    other = pd.DataFrame({x_col: [OTHER_BUCKET_LABEL], y_col: [totals.iloc[keep:].sum()]})
+    return pd.concat([head.astype({x_col: object}), other], ignore_index=True)
+
+
+def grid_bin(
+    df: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    max_points: int,
+    color_col: Optional[str] = None,
+) -> pd.DataFrame:
+    """Collapse points into a regular grid, one mean point per cell (and colour).
+
+    Rows missing x or y cannot be placed and are dropped. With ``color_col``
+    the budget is shared by the colours, so the grid gets coarser as their
+    number grows; each colour keeps at least one point.
+    """
+
+    if not (pd.api.types.is_numeric_dtype(df[x_col]) and pd.api.types.is_numeric_dtype(df[y_col])):
+        return df.iloc[np.linspace(0, len(df) - 1, max_points).astype(np.int64)]
+
+    df = df.dropna(subset=[x_col, y_col])
+    if df.empty:
+        return df
+
+    colors = df[color_col].nunique(dropna=False) if color_col is not None else 1
+    bins = max(1, int(np.sqrt(max_points // max(1, colors))))
+    keys = [_bin_codes(df[x_col], bins).rename("_x_bin"), _bin_codes(df[y_col], bins).rename("_y_bin")]
+    aggregations = {x_col: (x_col, "mean"), y_col: (y_col, "mean"), "points": (x_col, "size")}
+    if color_col is not None:
+        # Keep one point per cell and colour so legends stay intact
+        keys.append(df[color_col])
+    binned = df.groupby(keys, sort=False, dropna=False).agg(**aggregations).reset_index()
+    return binned.drop(columns=["_x_bin", "_y_bin"])
+
+
+def _as_numeric_axis(series: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype("int64").to_numpy(dtype=float)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+    # Categorical/string x axes are treated as evenly spaced
+    return np.arange(len(series), dtype=float)
+
+
+def _bin_codes(series: pd.Series, bins: int) -> pd.Series:
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    low, high = np.nanmin(values), np.nanmax(values)
+    span = high - low or 1.0
+    codes = np.minimum(((values - low) / span * bins).astype(np.int64, copy=False), bins - 1)
+    return pd.Series(codes, index=series.index)
@@ -0,0 +1,248 @@
+"""Warm Kaleido renderer that exports chart PNGs off the request path."""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, TypedDict
+
+from ..config import get_settings
+from ..constants import CHART_IMAGE_HEIGHT, CHART_IMAGE_WIDTH, ChartImageMode
+from ..models.state import AgentState
+
+try:
+    import kaleido
+except ImportError:  # pragma: no cover - optional dependency
+    kaleido = None
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RendererStats(TypedDict):
+    """Snapshot of render activity for monitoring."""
+
+    workers: int
+    started: bool
+    pending: int
+    rendered: int
+    failed: int
+
+
+class ChartRenderer:
+    """Render Plotly JSON to PNG on a long-lived Kaleido browser.
+
+    Chrome is started once with ``workers`` tabs on a private event loop
+    thread, so each render only pays for layout and rasterisation. Jobs are
+    accepted from any thread and return ``concurrent.futures.Future`` objects;
+    files are written to a temporary name and renamed, so a path that exists
+    is always a complete PNG.
+    """
+
+    def __init__(self, workers: int = 1) -> None:
+        self._workers = max(1, workers)
+        self._lock = threading.Lock()
+        # Serializes browser startup so no job is submitted before the browser is open
+        self._start_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._browser: Any = None
+        self._pending: Dict[str, Future] = {}
+        self._rendered = 0
+        self._failed = 0
+
+    def start(self) -> bool:
+        """Launch the event loop thread and the browser (idempotent); returns whether it is running.
+
+        A failed start is torn down completely, so the next call tries again.
+        """
+
+        if self._loop is not None:
+            return True
+        with self._start_lock:
+            if self._loop is not None:
+                return True
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="chart-renderer", daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._open_browser(), loop).result()
+            except Exception as exc:  # Chrome missing or failed to start
+                LOGGER.warning("Could not start chart renderer; PNG export will fail", extra={"error": str(exc)})
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                return False
+            with self._lock:
+                self._loop, self._thread = loop, thread
+        return True
+
+    def submit(self, chart_json: str, file_path: Path) -> Future:
+        """Queue a PNG export of ``chart_json``; the future resolves to the written path."""
+
+        if not self.start():
+            raise RuntimeError("Chart renderer is not running")
+        loop = self._loop
+        assert loop is not None
+        key = str(file_path)
+        future = asyncio.run_coroutine_threadsafe(self._render(chart_json, file_path), loop)
+        with self._lock:
+            self._pending[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+
+    def render(self, chart_json: str, file_path: Path, timeout: Optional[float] = None) -> str:
+        """Export ``chart_json`` and block until the PNG is on disk."""
+
+        return self.submit(chart_json, file_path).result(timeout)
+
+    def wait(self, file_path: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Wait for a queued export; returns the path, or ``None`` if it failed or timed out."""
+
+        with self._lock:
+            future = self._pending.get(file_path)
+        if future is None:
+            return file_path if Path(file_path).exists() else None
+        try:
+            return future.result(timeout)
+        except Exception as exc:
+            LOGGER.warning("Chart image not available", extra={"path": file_path, "error": str(exc)})
+            return None
+
+    def stats(self) -> RendererStats:
+        with self._lock:
+            return {
+                "workers": self._workers,
+                "started": self._loop is not None,
+                "pending": len(self._pending),
+                "rendered": self._rendered,
+                "failed": self._failed,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Optionally drain queued exports, then close the browser and stop the loop."""
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            pending = list(self._pending.values())
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        if wait:
+            for future in pending:
+                try:
+                    future.result()
+                except Exception:  # already logged by _finish
+                    pass
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_browser(), loop).result()
+        except Exception as exc:  # pragma: no cover - best-effort cleanup
+            LOGGER.debug("Failed to close chart renderer", extra={"error": str(exc)})
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
+
+    async def _open_browser(self) -> None:
+        if kaleido is None or not hasattr(kaleido, "Kaleido"):
+            raise RuntimeError("kaleido>=1.0 is not installed")
+        browser = kaleido.Kaleido(n=self._workers)
+        await browser.open()
+        self._browser = browser
+
+    async def _close_browser(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+
+    async def _render_png(self, figure: Dict[str, Any]) -> bytes:
+        if self._browser is None:
+            raise RuntimeError("Chart renderer is not running")
+        opts = {"format": "png", "width": CHART_IMAGE_WIDTH, "height": CHART_IMAGE_HEIGHT}
+        return await self._browser.calc_fig(figure, opts=opts)
+
+    async def _render(self, chart_json: str, file_path: Path) -> str:
+        image = await self._render_png(json.loads(chart_json))
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = file_path.with_name(f".{file_path.name}.tmp")
+        temp_path.write_bytes(image)
+        os.replace(temp_path, file_path)
+        return str(file_path)
+
+    def _finish(self, key: str, future: Future) -> None:
+        error = future.exception()
+        with self._lock:
+            self._pending.pop(key, None)
+            if error is None:
+                self._rendered += 1
+            else:
+                self._failed += 1
+        if error is not None:
+            LOGGER.warning("Failed to write chart image", extra={"path": key, "error": str(error)})
+
+
+@lru_cache(maxsize=1)
+def get_chart_renderer() -> ChartRenderer:
+    """Return the process-wide renderer, drained and closed automatically at exit."""
+
+    renderer = ChartRenderer(workers=get_settings().chart_render_workers)
+    atexit.register(renderer.shutdown)
+    return renderer
+
+
+def shutdown_chart_renderer(wait: bool = True) -> None:
+    """Explicit shutdown hook for servers and batch runs."""
+
+    if get_chart_renderer.cache_info().currsize:
+        get_chart_renderer().shutdown(wait=wait)
+
+
+def resolve_output_dir() -> Path:
+    env_path = os.getenv("PLOT_OUTPUT_DIR")
+    if env_path:
+        return Path(env_path)
+    return Path.cwd() / "data-plotly"
+
+
+def chart_file_path(state: AgentState) -> Path:
+    """Unique PNG path for the chart of ``state`` (concurrent runs must not collide)."""
+
+    file_name = f"{state.get('analysis_type', 'chart')}_{int(time.time())}_{uuid.uuid4().hex[:8]}.png"
+    return resolve_output_dir() / file_name
+
+
+def ensure_chart_image(state: AgentState, timeout: Optional[float] = None) -> Optional[str]:
+    """Fill ``chart_image_path`` for a finished run and return it.
+
+    Waits for a background export queued by the visualization node, or renders
+    the PNG now when the run used ``ChartImageMode.ON_DEMAND``.
+    """
+
+    if state.get("chart_image_path"):
+        return state["chart_image_path"]
+
+    pending = state.get("chart_image_pending")
+    if pending:
+        path = get_chart_renderer().wait(pending, timeout)
+    elif state.get("chart_json") and get_settings().chart_image_mode == ChartImageMode.ON_DEMAND:
+        try:
+            path = get_chart_renderer().render(state["chart_json"], chart_file_path(state), timeout)
+        except Exception as exc:
+            LOGGER.warning("Failed to write chart image", extra={"error": str(exc)})
+            path = None
+    else:
+        return None
+
+    if path:
+        state["chart_image_path"] = path
+        state.pop("chart_image_pending", None)
+    return path
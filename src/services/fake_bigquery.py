@@ -0,0 +1,285 @@
+"""Offline stand-in for ``bigquery.Client`` used for local runs and tests."""
+
+from __future__ import annotations
+
+import random
+import re
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+from google.api_core.exceptions import BadRequest, NotFound
+
+from ..constants import DEFAULT_DATASET_ID
+from .sql_normalizer import IDENT, KEYWORD, OP, QUOTED_IDENT, SQLToken, find_table_references, tokenize_sql
+
+
+# Rough logical sizes of the thelook_ecommerce tables, used for byte estimates
+FAKE_TABLE_BYTES: Mapping[str, int] = {
+    "orders": 12_000_000,
+    "order_items": 25_000_000,
+    "products": 4_000_000,
+    "users": 18_000_000,
+    "events": 400_000_000,
+    "inventory_items": 60_000_000,
+    "distribution_centers": 2_000,
+}
+
+# Column types of the thelook_ecommerce tables, served to schema queries
+FAKE_TABLE_COLUMNS: Mapping[str, Mapping[str, str]] = {
+    "orders": {
+        "order_id": "INT64", "user_id": "INT64", "status": "STRING", "gender": "STRING",
+        "created_at": "TIMESTAMP", "shipped_at": "TIMESTAMP", "delivered_at": "TIMESTAMP",
+        "returned_at": "TIMESTAMP", "num_of_item": "INT64",
+    },
+    "order_items": {
+        "id": "INT64", "order_id": "INT64", "user_id": "INT64", "product_id": "INT64",
+        "inventory_item_id": "INT64", "status": "STRING", "created_at": "TIMESTAMP",
+        "shipped_at": "TIMESTAMP", "delivered_at": "TIMESTAMP", "returned_at": "TIMESTAMP",
+        "sale_price": "FLOAT64",
+    },
+    "products": {
+        "id": "INT64", "cost": "FLOAT64", "category": "STRING", "name": "STRING", "brand": "STRING",
+        "retail_price": "FLOAT64", "department": "STRING", "sku": "STRING", "distribution_center_id": "INT64",
+    },
+    "users": {
+        "id": "INT64", "first_name": "STRING", "last_name": "STRING", "email": "STRING", "age": "INT64",
+        "gender": "STRING", "state": "STRING", "city": "STRING", "country": "STRING",
+        "latitude": "FLOAT64", "longitude": "FLOAT64", "traffic_source": "STRING", "created_at": "TIMESTAMP",
+    },
+    "events": {
+        "id": "INT64", "user_id": "INT64", "session_id": "STRING", "created_at": "TIMESTAMP",
+        "city": "STRING", "state": "STRING", "browser": "STRING", "traffic_source": "STRING",
+        "uri": "STRING", "event_type": "STRING",
+    },
+    "inventory_items": {
+        "id": "INT64", "product_id": "INT64", "created_at": "TIMESTAMP", "sold_at": "TIMESTAMP",
+        "cost": "FLOAT64", "product_category": "STRING", "product_name": "STRING",
+        "product_brand": "STRING", "product_retail_price": "FLOAT64",
+    },
+    "distribution_centers": {"id": "INT64", "name": "STRING", "latitude": "FLOAT64", "longitude": "FLOAT64"},
+}
+
+# Sample values for categorical result columns, keyed by column name
+_FAKE_CATEGORIES: Mapping[str, Sequence[str]] = {
+    "country": ["United States", "China", "Brasil", "South Korea", "France", "United Kingdom", "Germany", "Spain"],
+    "state": ["California", "Texas", "New York", "Florida", "Guangdong", "Shanghai", "São Paulo", "England"],
+    "city": ["Los Angeles", "New York", "Shanghai", "Seoul", "Paris", "London", "Berlin", "Madrid"],
+    "category": ["Jeans", "Tops & Tees", "Outerwear & Coats", "Sweaters", "Dresses", "Accessories", "Swim"],
+    "department": ["Men", "Women"],
+    "gender": ["M", "F"],
+    "status": ["Complete", "Shipped", "Processing", "Cancelled", "Returned"],
+    "traffic_source": ["Search", "Organic", "Facebook", "Email", "Display"],
+}
+# __TABLES__.last_modified_time reported for every table (2024-01-01, in ms)
+FAKE_LAST_MODIFIED_MS = 1_704_067_200_000
+_AGGREGATES = frozenset({"SUM", "COUNT", "AVG", "MIN", "MAX", "ROUND", "SAFE_DIVIDE", "APPROX_COUNT_DISTINCT"})
+_DATE_FUNCTIONS = frozenset({"DATE_TRUNC", "DATE", "TIMESTAMP_TRUNC", "FORMAT_DATE", "EXTRACT"})
+_DATE_NAME = re.compile(r"(date|day|week|month|quarter|year|period)", re.IGNORECASE)
+FAKE_RESULT_ROWS = 12
+
+
+class FakeRowIterator:
+    """Subset of ``RowIterator`` backed by an in-memory Arrow table."""
+
+    def __init__(self, table: pa.Table, page_size: Optional[int] = None) -> None:
+        self._table = table
+        self._page_size = page_size
+        self.total_rows = table.num_rows
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._table.to_pylist())
+
+    def to_dataframe(self, create_bqstorage_client: bool = False) -> pd.DataFrame:
+        return self._table.to_pandas()
+
+    def to_arrow_iterable(self, bqstorage_client=None) -> Iterator[pa.RecordBatch]:
+        yield from self._table.to_batches(max_chunksize=self._page_size or None)
+
+
+class FakeQueryJob:
+    """Minimal ``QueryJob`` look-alike; dry-run jobs carry only the byte estimate."""
+
+    def __init__(self, total_bytes_processed: int, table: Optional[pa.Table] = None) -> None:
+        self.total_bytes_processed = total_bytes_processed
+        self.total_bytes_billed = 0 if table is None else total_bytes_processed
+        self.dry_run = table is None
+        self._table = table
+
+    def done(self) -> bool:
+        return True
+
+    def result(self, page_size: Optional[int] = None) -> Any:
+        if self._table is None:
+            return []
+        return FakeRowIterator(self._table, page_size)
+
+
+class FakeBigQueryClient:
+    """Validate, estimate and answer queries locally, mimicking BigQuery.
+
+    Statements must start with SELECT/WITH, have balanced parentheses and only
+    reference known tables; the estimate is the sum of referenced table sizes.
+    Executed queries return deterministic synthetic rows shaped after the
+    outer SELECT list, and schema queries return the thelook_ecommerce columns.
+    """
+
+    def __init__(
+        self,
+        table_bytes: Optional[Mapping[str, int]] = None,
+        dataset_id: str = DEFAULT_DATASET_ID,
+    ) -> None:
+        self._table_bytes: Dict[str, int] = dict(table_bytes or FAKE_TABLE_BYTES)
+        self._dataset_id = dataset_id
+        self.last_modified_ms = FAKE_LAST_MODIFIED_MS
+
+    def query(self, sql_query: str, job_config=None, location: Optional[str] = None) -> FakeQueryJob:
+        if "INFORMATION_SCHEMA.COLUMNS" in sql_query:
+            return FakeQueryJob(0, self._schema_rows(job_config))
+        if "__TABLES__" in sql_query:
+            return FakeQueryJob(0, self._modified_rows(job_config))
+
+        estimated_bytes = self.estimate_bytes(sql_query)
+        if getattr(job_config, "dry_run", False):
+            return FakeQueryJob(estimated_bytes)
+        return FakeQueryJob(estimated_bytes, synthesize_result(sql_query))
+
+    def get_table(self, table_ref: str) -> SimpleNamespace:
+        table_name = table_ref.rsplit(".", 1)[-1]
+        if table_name not in FAKE_TABLE_COLUMNS:
+            raise NotFound(f"Not found: Table {self._dataset_id}.{table_name}")
+        columns = FAKE_TABLE_COLUMNS[table_name]
+        return SimpleNamespace(
+            schema=[SimpleNamespace(name=name, field_type=kind) for name, kind in columns.items()],
+            num_rows=self._table_bytes.get(table_name, 0) // 100,
+            description=f"Table: {table_name}",
+            modified=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+
+    def estimate_bytes(self, sql_query: str) -> int:
+        tokens = tokenize_sql(sql_query)
+        _check_syntax(tokens)
+
+        total = 0
+        for table_path in find_table_references(tokens):
+            table_name = table_path.rsplit(".", 1)[-1]
+            if table_name not in self._table_bytes:
+                raise NotFound(f"Not found: Table {self._dataset_id}.{table_name}")
+            total += self._table_bytes[table_name]
+        return total
+
+    def close(self) -> None:
+        pass
+
+    def _schema_rows(self, job_config) -> pa.Table:
+        parameters = {param.name: param for param in getattr(job_config, "query_parameters", None) or []}
+        all_tables = getattr(parameters.get("all_tables"), "value", True)
+        wanted = set(getattr(parameters.get("table_names"), "values", None) or [])
+
+        rows: List[Dict[str, Any]] = []
+        for table_name, columns in FAKE_TABLE_COLUMNS.items():
+            if table_name not in self._table_bytes or not (all_tables or table_name in wanted):
+                continue
+            for column_name, data_type in columns.items():
+                rows.append(
+                    {
+                        "table_name": table_name,
+                        "column_name": column_name,
+                        "data_type": data_type,
+                        "row_count": self._table_bytes[table_name] // 100,
+                        "last_modified_time": self.last_modified_ms,
+                        "description": None,
+                    }
+                )
+        return pa.Table.from_pylist(rows)
+
+    def _modified_rows(self, job_config) -> pa.Table:
+        parameters = {param.name: param for param in getattr(job_config, "query_parameters", None) or []}
+        wanted = set(getattr(parameters.get("table_names"), "values", None) or [])
+        rows = [
+            {"table_id": table_name, "last_modified_time": self.last_modified_ms}
+            for table_name in FAKE_TABLE_COLUMNS
+            if table_name in self._table_bytes and table_name in wanted
+        ]
+        return pa.Table.from_pylist(rows)
+
+
+def synthesize_result(sql_query: str, row_count: int = FAKE_RESULT_ROWS) -> pa.Table:
+    """Build deterministic rows whose columns follow the outer SELECT list."""
+
+    rng = random.Random(sql_query)
+    columns: Dict[str, List[Any]] = {}
+    for name, kind in _select_columns(tokenize_sql(sql_query)):
+        if kind == "date":
+            values: List[Any] = [date(2024 + index // 12, index % 12 + 1, 1) for index in range(row_count)]
+        elif kind == "count":
+            values = [rng.randint(10, 5_000) for _ in range(row_count)]
+        elif kind == "number":
+            values = [round(rng.uniform(1_000, 50_000), 2) for _ in range(row_count)]
+        else:
+            pool = _FAKE_CATEGORIES.get(name.lower(), [f"{name}_{index}" for index in range(1, row_count + 1)])
+            values = [pool[index % len(pool)] for index in range(row_count)]
+        columns[name] = values
+    return pa.table(columns)
+
+
+def _select_columns(tokens: List[SQLToken]) -> List[tuple[str, str]]:
+    # The outer SELECT is the last one at depth 0 (after any WITH clauses)
+    depth, start = 0, None
+    for index, token in enumerate(tokens):
+        if token == SQLToken(OP, "("):
+            depth += 1
+        elif token == SQLToken(OP, ")"):
+            depth -= 1
+        elif depth == 0 and token == SQLToken(KEYWORD, "SELECT"):
+            start = index + 1
+    if start is None:
+        return []
+
+    items: List[List[SQLToken]] = [[]]
+    depth = 0
+    for token in tokens[start:]:
+        if depth == 0 and token.kind == KEYWORD and token.value == "FROM":
+            break
+        if token == SQLToken(OP, "("):
+            depth += 1
+        elif token == SQLToken(OP, ")"):
+            depth -= 1
+        if depth == 0 and token == SQLToken(OP, ","):
+            items.append([])
+        else:
+            items[-1].append(token)
+
+    columns: List[tuple[str, str]] = []
+    for position, item in enumerate(item for item in items if item):
+        names = [token.value.strip("`") for token in item if token.kind in {IDENT, QUOTED_IDENT}]
+        name = names[-1] if names else f"f{position}_"
+        words = {token.value.upper() for token in item}
+        if words & {"COUNT", "APPROX_COUNT_DISTINCT"}:
+            kind = "count"
+        elif words & _AGGREGATES:
+            kind = "number"
+        elif words & _DATE_FUNCTIONS or _DATE_NAME.search(name):
+            kind = "date"
+        else:
+            kind = "category"
+        columns.append((name, kind))
+    return columns
+
+
+def _check_syntax(tokens: list[SQLToken]) -> None:
+    if not tokens or tokens[0] not in {SQLToken(KEYWORD, "SELECT"), SQLToken(KEYWORD, "WITH"), SQLToken(OP, "(")}:
+        raise BadRequest("Syntax error: Expected SELECT or WITH at [1:1]")
+
+    depth = 0
+    for token in tokens:
+        if token == SQLToken(OP, "("):
+            depth += 1
+        elif token == SQLToken(OP, ")"):
+            depth -= 1
+            if depth < 0:
+                raise BadRequest("Syntax error: Unexpected \")\"")
+    if depth:
+        raise BadRequest("Syntax error: Unclosed parenthesis")
@@ -0,0 +1,93 @@
+"""Deterministic offline chat model for local serving and tests."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from ..constants import DEFAULT_DATASET_ID, SQL_TEMPLATES, AnalysisType
+from .sql_normalizer import find_table_references, tokenize_sql
+
+_USER_QUERY = re.compile(r'User [Qq]uery:\s*"(?P<query>.*?)"', re.DOTALL)
+_SCHEMA_TABLE = re.compile(r"^## (?P<table>\w+)\n(?P<columns>(?:- .*\n?)+)", re.MULTILINE)
+_SCHEMA_COLUMN = re.compile(r"^- (\w+): (\w+)", re.MULTILINE)
+_GEO_WORDS = ("region", "geograph", "country", "countries", "state", "city", "where")
+_CUSTOMER_WORDS = ("customer", "segment", "demograph", "cohort", "age", "gender", "user")
+
+
+class FakeChatModel(BaseChatModel):
+    """Answer the agent's reasoning, SQL and insights prompts without a provider.
+
+    The analysis type is picked from keywords in the user query, SQL comes from
+    ``SQL_TEMPLATES`` (or a one-table breakdown when the prompt's schema lacks
+    the template's tables) and insights are fixed sentences, so runs are
+    repeatable.
+    """
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        prompt = str(messages[-1].content) if messages else ""
+        message = AIMessage(content=respond(prompt))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def respond(prompt: str) -> str:
+    """Canned response for one of the agent prompts."""
+
+    matches = _USER_QUERY.findall(prompt)
+    user_query = matches[-1] if matches else prompt
+    analysis_type = classify(user_query)
+
+    if "```sql" in prompt:
+        return f"```sql\n{_sql_for(prompt, user_query, analysis_type)}\n```"
+    if '"analysis_type"' in prompt:
+        reasoning = f"Keyword match suggests {analysis_type.value.replace('_', ' ')} across regions and time."
+        return json.dumps({"analysis_type": analysis_type.value, "reasoning": reasoning})
+    return (
+        "Revenue is concentrated in the top segments shown in the chart.\n"
+        "The most recent period moved noticeably versus the prior one; check the deltas before planning.\n"
+        "Smaller segments together form a meaningful tail worth a targeted campaign."
+    )
+
+
+def _sql_for(prompt: str, user_query: str, analysis_type: AnalysisType) -> str:
+    # The analysis type's template when the prompt lists its tables, else a
+    # breakdown of the first listed table by the column the question names
+    template = SQL_TEMPLATES[analysis_type].strip()
+    tables = {match.group("table"): match.group("columns") for match in _SCHEMA_TABLE.finditer(prompt)}
+    needed = {path.rsplit(".", 1)[-1] for path in find_table_references(tokenize_sql(template))}
+    if not tables or needed <= set(tables):
+        return template
+
+    table, listing = next(iter(tables.items()))
+    columns = [column for column, kind in _SCHEMA_COLUMN.findall(listing) if kind == "STRING"] or ["1"]
+    lowered = user_query.lower()
+    dimension = next((column for column in columns if column.replace("_", " ") in lowered), columns[0])
+    return (
+        f"SELECT {dimension}, COUNT(*) AS row_count\n"
+        f"FROM `{DEFAULT_DATASET_ID}.{table}`\n"
+        f"GROUP BY {dimension}\nORDER BY row_count DESC\nLIMIT 20"
+    )
+
+
+def classify(text: str) -> AnalysisType:
+    lowered = text.lower()
+    if any(word in lowered for word in _GEO_WORDS):
+        return AnalysisType.GEO_ANALYSIS
+    if any(word in lowered for word in _CUSTOMER_WORDS):
+        return AnalysisType.CUSTOMER_SEGMENTATION
+    return AnalysisType.PRODUCT_TRENDS
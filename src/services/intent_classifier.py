@@ -0,0 +1,254 @@
+"""Local analysis-type classifier that lets obvious questions skip the LLM."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, TypedDict
+
+from ..config import get_settings
+from ..constants import INTENT_MODEL_SHARPNESS, SUPPORTED_ANALYSIS_TYPES, AnalysisType
+from .terms import words
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Word prefixes that signal one analysis type ("segment" also matches "segmentation")
+KEYWORD_RULES: Mapping[AnalysisType, Tuple[str, ...]] = {
+    AnalysisType.PRODUCT_TRENDS: (
+        "trend", "over time", "monthly", "weekly", "daily", "quarterly", "yearly", "seasonal",
+        "product", "categor", "brand", "sku", "bestsell", "best-sell",
+    ),
+    AnalysisType.CUSTOMER_SEGMENTATION: (
+        "customer", "segment", "demograph", "cohort", "age group", "gender", "buyer", "shopper",
+        "loyal", "retention", "churn", "lifetime value",
+    ),
+    AnalysisType.GEO_ANALYSIS: (
+        "region", "country", "countries", "geograph", "state", "city", "cities", "location",
+        "map", "where", "international",
+    ),
+}
+
+# Labelled questions the TF-IDF model starts from before any logs are added
+SEED_EXAMPLES: Sequence[Tuple[str, AnalysisType]] = (
+    ("Show product revenue trends for the last year", AnalysisType.PRODUCT_TRENDS),
+    ("How did monthly sales develop?", AnalysisType.PRODUCT_TRENDS),
+    ("Which categories are growing fastest over time", AnalysisType.PRODUCT_TRENDS),
+    ("Revenue by month for our top brands", AnalysisType.PRODUCT_TRENDS),
+    ("What are the best selling products this quarter", AnalysisType.PRODUCT_TRENDS),
+    ("Plot weekly order volume", AnalysisType.PRODUCT_TRENDS),
+    ("Segment customers by country for the past 12 months", AnalysisType.CUSTOMER_SEGMENTATION),
+    ("Who are our most valuable customers", AnalysisType.CUSTOMER_SEGMENTATION),
+    ("Break down buyers by age and gender", AnalysisType.CUSTOMER_SEGMENTATION),
+    ("How do new users differ from repeat shoppers", AnalysisType.CUSTOMER_SEGMENTATION),
+    ("Customer cohorts by traffic source", AnalysisType.CUSTOMER_SEGMENTATION),
+    ("Spending per user demographic group", AnalysisType.CUSTOMER_SEGMENTATION),
+    ("Where are we seeing the strongest regional sales growth?", AnalysisType.GEO_ANALYSIS),
+    ("Revenue by country and state", AnalysisType.GEO_ANALYSIS),
+    ("Which cities order the most", AnalysisType.GEO_ANALYSIS),
+    ("Compare sales across regions", AnalysisType.GEO_ANALYSIS),
+    ("Top markets by geography", AnalysisType.GEO_ANALYSIS),
+    ("Orders per location on a map", AnalysisType.GEO_ANALYSIS),
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class IntentDecision(TypedDict):
+    """Outcome of local classification; ``analysis_type`` is ``None`` when the LLM must decide."""
+
+    analysis_type: Optional[str]
+    best_guess: str
+    confidence: float
+    method: str
+    """``keywords``, ``model`` or ``llm``"""
+    evidence: List[str]
+
+
+def _features(text: str) -> Counter:
+    # Plural folding keeps "regions"/"region" on one feature
+    tokens = words(text)
+    return Counter(tokens + [f"{left} {right}" for left, right in zip(tokens, tokens[1:])])
+
+
+class IntentModel:
+    """TF-IDF nearest-centroid classifier (a linear model over sparse features).
+
+    Each analysis type is represented by the normalised mean TF-IDF vector of
+    its training questions; a softmax over cosine similarities turns the
+    scores into probabilities.
+    """
+
+    def __init__(self, idf: Dict[str, float], centroids: Dict[str, Dict[str, float]]) -> None:
+        self._idf = idf
+        self._centroids = centroids
+
+    @classmethod
+    def train(cls, examples: Iterable[Tuple[str, AnalysisType]]) -> "IntentModel":
+        documents = [(_features(text), AnalysisType(label).value) for text, label in examples]
+        if not documents:
+            raise ValueError("At least one labelled question is required")
+
+        document_frequency: Counter = Counter()
+        for features, _ in documents:
+            document_frequency.update(features.keys())
+        idf = {term: math.log((1 + len(documents)) / (1 + count)) + 1.0 for term, count in document_frequency.items()}
+
+        sums: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for features, label in documents:
+            for term, weight in _normalise(_weigh(features, idf)).items():
+                sums[label][term] += weight
+        centroids = {label: _normalise(dict(vector)) for label, vector in sums.items()}
+        return cls(idf, centroids)
+
+    def predict(self, text: str) -> Dict[str, float]:
+        """Probability per analysis type; empty when no known term appears in ``text``."""
+
+        vector = _normalise(_weigh(_features(text), self._idf))
+        if not vector:
+            return {}
+        scores = {
+            label: sum(weight * centroid.get(term, 0.0) for term, weight in vector.items())
+            for label, centroid in self._centroids.items()
+        }
+        top = max(scores.values())
+        exp_scores = {label: math.exp(INTENT_MODEL_SHARPNESS * (score - top)) for label, score in scores.items()}
+        total = sum(exp_scores.values())
+        return {label: value / total for label, value in exp_scores.items()}
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"idf": self._idf, "centroids": self._centroids}), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "IntentModel":
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return cls(payload["idf"], payload["centroids"])
+
+
+def _weigh(features: Counter, idf: Mapping[str, float]) -> Dict[str, float]:
+    return {term: count * idf[term] for term, count in features.items() if term in idf}
+
+
+def _normalise(vector: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+
+def keyword_scores(text: str) -> Dict[AnalysisType, List[str]]:
+    """Matched keyword prefixes per analysis type."""
+
+    lowered = " ".join(_WORD.findall(text.lower()))
+    question_words = lowered.split()
+    matches: Dict[AnalysisType, List[str]] = {}
+    for analysis_type, keywords in KEYWORD_RULES.items():
+        hits = [
+            keyword for keyword in keywords
+            if (keyword in lowered if " " in keyword else any(word.startswith(keyword) for word in question_words))
+        ]
+        if hits:
+            matches[analysis_type] = hits
+    return matches
+
+
+class IntentClassifier:
+    """Decide the analysis type locally when keyword rules or the model are confident."""
+
+    def __init__(self, model: IntentModel, threshold: float) -> None:
+        self._model = model
+        self._threshold = threshold
+
+    def classify(self, text: str) -> IntentDecision:
+        keyword_hits = keyword_scores(text)
+        rule_type, rule_confidence = _rule_vote(keyword_hits)
+        if rule_type is not None and rule_confidence >= self._threshold:
+            return _decision(rule_type, rule_confidence, "keywords", keyword_hits[rule_type])
+
+        probabilities = self._model.predict(text)
+        if probabilities:
+            model_label = max(probabilities, key=probabilities.__getitem__)
+            model_type = AnalysisType(model_label)
+            model_confidence = probabilities[model_label]
+            # Never overrule keywords that point elsewhere
+            agrees = rule_type is None or rule_type == model_type
+            if agrees and model_confidence >= self._threshold:
+                return _decision(model_type, model_confidence, "model", [])
+            if model_confidence > rule_confidence:
+                rule_type, rule_confidence = model_type, model_confidence
+
+        return {
+            "analysis_type": None,
+            "best_guess": (rule_type or SUPPORTED_ANALYSIS_TYPES[0]).value,
+            "confidence": round(rule_confidence, 3),
+            "method": "llm",
+            "evidence": [],
+        }
+
+
+def _rule_vote(keyword_hits: Mapping[AnalysisType, List[str]]) -> Tuple[Optional[AnalysisType], float]:
+    if not keyword_hits:
+        return None, 0.0
+    counts = {analysis_type: len(hits) for analysis_type, hits in keyword_hits.items()}
+    best = max(counts, key=counts.__getitem__)
+    share = counts[best] / sum(counts.values())
+    # One unambiguous keyword gives 0.75, two give ~0.94; conflicts scale down by their share
+    return best, share * (1.0 - 0.25 ** counts[best])
+
+
+def _decision(analysis_type: AnalysisType, confidence: float, method: str, evidence: List[str]) -> IntentDecision:
+    return {
+        "analysis_type": analysis_type.value,
+        "best_guess": analysis_type.value,
+        "confidence": round(confidence, 3),
+        "method": method,
+        "evidence": evidence,
+    }
+
+
+def load_labelled_queries(paths: Iterable[Path]) -> List[Tuple[str, AnalysisType]]:
+    """Read ``(question, analysis_type)`` pairs from batch or request logs (JSONL).
+
+    Only rows the LLM classified are used (``metrics.intent_path`` missing or
+    ``"llm"``), so the model does not learn from its own decisions.
+    """
+
+    examples: List[Tuple[str, AnalysisType]] = []
+    for path in paths:
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                    text = str(record.get("question") or record.get("user_query") or "").strip()
+                    label = AnalysisType(record.get("analysis_type"))
+                except (json.JSONDecodeError, ValueError, AttributeError):
+                    continue
+                path_taken = (record.get("metrics") or {}).get("intent_path", "llm")
+                if text and record.get("status") != "error" and path_taken == "llm":
+                    examples.append((text, label))
+    return examples
+
+
+@lru_cache(maxsize=1)
+def get_intent_classifier() -> Optional[IntentClassifier]:
+    """Return the shared classifier, or ``None`` when the fast path is disabled.
+
+    Uses the model trained by ``cli train-intents`` when ``INTENT_MODEL_PATH``
+    exists, otherwise a model trained on ``SEED_EXAMPLES``.
+    """
+
+    settings = get_settings()
+    if not settings.intent_classifier_enabled:
+        return None
+
+    model: Optional[IntentModel] = None
+    if settings.intent_model_path and Path(settings.intent_model_path).exists():
+        try:
+            model = IntentModel.load(Path(settings.intent_model_path))
+        except (OSError, ValueError, KeyError) as exc:
+            LOGGER.warning("Ignoring unreadable intent model", extra={"error": str(exc)})
+    return IntentClassifier(model or IntentModel.train(SEED_EXAMPLES), settings.intent_confidence_threshold)
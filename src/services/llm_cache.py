@@ -0,0 +1,219 @@
+"""SQLite-backed cache of LLM responses for deterministic prompts."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from ..config import get_settings
+from ..models.state import AgentState, Metrics
+
+
+LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    latency_ms INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    used_at REAL NOT NULL
+)
+"""
+
+
+class LLMResponseCache:
+    """Map prompt hashes to response text in a single SQLite file.
+
+    Entries expire ``ttl_sec`` after they were stored; beyond ``max_entries``
+    the least recently used rows are deleted. The original call latency is
+    stored with each response so hits can report the time they saved.
+    """
+
+    def __init__(self, *, path: Optional[Path], ttl_sec: float, max_entries: int) -> None:
+        self._ttl_sec = ttl_sec
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path) if path is not None else ":memory:", check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+
+    @staticmethod
+    def make_key(prompt: str, provider: str, model_name: str, temperature: float) -> str:
+        """Hash everything that can change the model's answer."""
+
+        payload = "\x1f".join((provider, model_name, repr(float(temperature)), prompt))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, int]]:
+        """Return ``(content, original_latency_ms)`` or ``None`` when missing/expired."""
+
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT content, latency_ms, stored_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[2] > self._ttl_sec:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE llm_responses SET used_at = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+
+    def put(self, key: str, content: str, latency_ms: int) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, content, latency_ms, stored_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, content, latency_ms, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedChatModel:
+    """Chat model wrapper that answers repeated prompts from ``LLMResponseCache``.
+
+    Cache hits return an ``AIMessage`` whose ``response_metadata`` carries
+    ``llm_cache_hit`` and the latency of the original call (``saved_ms``).
+    Every response also carries its ``llm_cache_key`` so callers can evict an
+    answer that turned out to be wrong (see ``evict_llm_response``).
+    """
+
+    def __init__(self, model: Any, cache: LLMResponseCache) -> None:
+        self._model = model
+        self._cache = cache
+
+    def invoke(self, messages: Sequence[BaseMessage]) -> Any:
+        key = self._key(messages)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return _cached_message(key, *cached)
+
+        start_time = time.perf_counter()
+        response = self._model.invoke(messages)
+        self._store(key, response, start_time)
+        return response
+
+    async def ainvoke(self, messages: Sequence[BaseMessage]) -> Any:
+        key = self._key(messages)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return _cached_message(key, *cached)
+
+        start_time = time.perf_counter()
+        response = await self._model.ainvoke(messages)
+        self._store(key, response, start_time)
+        return response
+
+    def _key(self, messages: Sequence[BaseMessage]) -> str:
+        prompt = "\n".join(f"{getattr(message, 'type', 'human')}: {message.content}" for message in messages)
+        model_name = getattr(self._model, "model_name", None) or getattr(self._model, "model", None) or ""
+        return LLMResponseCache.make_key(
+            prompt,
+            type(self._model).__name__,
+            str(model_name),
+            float(getattr(self._model, "temperature", None) or 0.0),
+        )
+
+    def _store(self, key: str, response: Any, start_time: float) -> None:
+        content = getattr(response, "content", None)
+        if not isinstance(content, str) or not content:
+            return
+        metadata = getattr(response, "response_metadata", None)
+        if isinstance(metadata, dict):
+            metadata["llm_cache_key"] = key
+        latency_ms = int((time.perf_counter() - start_time) * 1000)
+        try:
+            self._cache.put(key, content, latency_ms)
+        except sqlite3.Error as exc:  # pragma: no cover - disk full/locked file
+            LOGGER.warning("Failed to store LLM response", extra={"error": str(exc)})
+
+
+def _cached_message(key: str, content: str, latency_ms: int) -> AIMessage:
+    return AIMessage(
+        content=content,
+        response_metadata={"llm_cache_hit": True, "saved_ms": latency_ms, "llm_cache_key": key},
+    )
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide response cache, or ``None`` when disabled."""
+
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    path = Path(settings.llm_cache_path) if settings.llm_cache_path else Path.cwd() / ".cache" / "llm" / "responses.db"
+    return LLMResponseCache(path=path, ttl_sec=settings.llm_cache_ttl_sec, max_entries=settings.llm_cache_max_entries)
+
+
+def with_response_cache(model: Any, node: str) -> Any:
+    """Wrap ``model`` in the response cache when ``node`` is listed in ``LLM_CACHE_NODES``."""
+
+    cache = get_llm_cache()
+    opted_in = {name.strip() for name in get_settings().llm_cache_nodes.split(",")}
+    if cache is None or node not in opted_in:
+        return model
+    return CachedChatModel(model, cache)
+
+
+def record_llm_cache_hit(state: AgentState, response: Any) -> None:
+    """Count a cached response and the latency it saved in ``state["metrics"]``."""
+
+    metadata = getattr(response, "response_metadata", None) or {}
+    if not metadata.get("llm_cache_hit"):
+        return
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    metrics["llm_cache_hits"] = metrics.get("llm_cache_hits", 0) + 1
+    metrics["llm_cache_saved_ms"] = metrics.get("llm_cache_saved_ms", 0) + int(metadata.get("saved_ms", 0))
+    state["metrics"] = metrics
+
+
+def evict_llm_response(state: AgentState) -> None:
+    """Delete the cached LLM response that produced ``state["sql_query"]``.
+
+    Called when the SQL fails preflight or execution, so a repeat of the
+    question asks the model again instead of replaying the failing SQL.
+    """
+
+    key = state.get("llm_cache_key")
+    cache = get_llm_cache()
+    if key and cache is not None:
+        try:
+            cache.delete(key)
+        except sqlite3.Error as exc:  # pragma: no cover - disk full/locked file
+            LOGGER.warning("Failed to evict LLM response", extra={"error": str(exc)})
+    state["llm_cache_key"] = None
@@ -2,17 +2,61 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 
 from ..config import get_settings
-from ..constants import LLMProvider
+from ..constants import LLM_MODEL_CACHE_SIZE, LLMProvider
+
+
+LOGGER = logging.getLogger(__name__)
+
+ModelKey = Tuple[LLMProvider, str, float]
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when neither the primary nor the fallback provider can answer."""
+
+# Chat models own their HTTP clients; sharing instances keeps connections warm
+_MODEL_CACHE: "OrderedDict[ModelKey, BaseChatModel]" = OrderedDict()
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _get_or_create_model(key: ModelKey, builder: Callable[[], BaseChatModel]) -> BaseChatModel:
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is not None:
+            _MODEL_CACHE.move_to_end(key)
+            return model
+
+        model = builder()
+        _MODEL_CACHE[key] = model
+        while len(_MODEL_CACHE) > LLM_MODEL_CACHE_SIZE:
+            _MODEL_CACHE.popitem(last=False)
+
+    LOGGER.debug("Created chat model", extra={"provider": key[0].value, "model": key[1], "temperature": key[2]})
+    return model
+
+
+def evict_chat_models() -> None:
+    """Drop cached chat models and reload settings (call after config changes)."""
+
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+    get_settings.cache_clear()
 
 
 class LLMClientFactory:
-    """Factory for creating chat models with smart provider fallback."""
+    """Factory for creating chat models with smart provider fallback.
+
+    Instances are cached per ``(provider, model name, temperature)`` so repeated
+    calls across nodes and sessions reuse the same underlying HTTP clients.
+    """
 
     def __init__(self) -> None:
         self._settings = get_settings()
@@ -21,6 +65,8 @@ class LLMClientFactory:
         if explicit:
             return explicit
         preferred = self._settings.default_llm_provider
+        if preferred == LLMProvider.FAKE:
+            return preferred
 
         if preferred == LLMProvider.GOOGLE and self._settings.google_api_key:
             return LLMProvider.GOOGLE
@@ -39,8 +85,9 @@ class LLMClientFactory:
         *,
         temperature: float = 0.0,
         provider: Optional[LLMProvider] = None,
+        model_name: Optional[str] = None,
     ) -> BaseChatModel:
-        """Instantiate the configured chat model."""
+        """Return the configured chat model (``model_name`` overrides the resolved provider's default)."""
 
         resolved_provider = self._resolve_provider(provider)
 
@@ -49,38 +96,56 @@ class LLMClientFactory:
                 if self._settings.openai_api_key:
                     return self._create_openai_model(temperature)
                 raise ValueError("GOOGLE_API_KEY is required for the Google LLM provider")
-            return self._create_google_model(temperature)
+            return self._create_google_model(temperature, model_name)
 
         if resolved_provider == LLMProvider.OPENAI:
             if not self._settings.openai_api_key:
                 if self._settings.google_api_key:
                     return self._create_google_model(temperature)
                 raise ValueError("OPENAI_API_KEY is required for the OpenAI provider")
-            return self._create_openai_model(temperature)
+            return self._create_openai_model(temperature, model_name)
+
+        if resolved_provider == LLMProvider.FAKE:
+            from .fake_llm import FakeChatModel
+
+            return _get_or_create_model((LLMProvider.FAKE, "fake", temperature), FakeChatModel)
 
         raise ValueError(f"Unsupported LLM provider: {resolved_provider}")
 
-    def _create_google_model(self, temperature: float) -> BaseChatModel:
+    def _create_google_model(self, temperature: float, model_name: Optional[str] = None) -> BaseChatModel:
         from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore import
 
-        return ChatGoogleGenerativeAI(
-            model=self._settings.google_model_name,
-            google_api_key=self._settings.google_api_key,
-            temperature=temperature,
+        resolved_model = model_name or self._settings.google_model_name
+        return _get_or_create_model(
+            (LLMProvider.GOOGLE, resolved_model, temperature),
+            lambda: ChatGoogleGenerativeAI(
+                model=resolved_model,
+                google_api_key=self._settings.google_api_key,
+                temperature=temperature,
+            ),
         )
 
-    def _create_openai_model(self, temperature: float) -> BaseChatModel:
-        return ChatOpenAI(
-            model=self._settings.openai_model_name,
-            api_key=self._settings.openai_api_key,
-            temperature=temperature,
+    def _create_openai_model(self, temperature: float, model_name: Optional[str] = None) -> BaseChatModel:
+        resolved_model = model_name or self._settings.openai_model_name
+        return _get_or_create_model(
+            (LLMProvider.OPENAI, resolved_model, temperature),
+            lambda: ChatOpenAI(
+                model=resolved_model,
+                api_key=self._settings.openai_api_key,
+                temperature=temperature,
+            ),
         )
 
 
-def get_chat_model(*, temperature: float = 0.0, provider: Optional[LLMProvider] = None) -> BaseChatModel:
-    """Helper that fetches a chat model using the shared factory."""
+def get_chat_model(
+    *,
+    temperature: float = 0.0,
+    provider: Optional[LLMProvider] = None,
+    model_name: Optional[str] = None,
+) -> BaseChatModel:
+    """Helper that fetches a (cached) chat model using the shared factory."""
 
     factory = LLMClientFactory()
-    return factory.create_chat_model(temperature=temperature, provider=provider)
+    return factory.create_chat_model(temperature=temperature, provider=provider, model_name=model_name)
 
 
@@ -0,0 +1,103 @@
+"""Prompt/completion token accounting for the agent's LLM calls."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from ..constants import LLM_TOKEN_PRICES_USD
+from ..models.state import AgentState, LLMUsage, Metrics
+from .tokens import estimate_tokens
+from .tracing import SPAN_KIND_CLIENT, current_span, start_span
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def response_usage(response: Any) -> Optional[Tuple[int, int]]:
+    """``(prompt_tokens, completion_tokens)`` reported by the provider, if any."""
+
+    # LangChain's standard field, then the raw OpenAI and Gemini payloads
+    usage = getattr(response, "usage_metadata", None)
+    if usage and "input_tokens" in usage:
+        return int(usage["input_tokens"]), int(usage.get("output_tokens", 0))
+    metadata = getattr(response, "response_metadata", None) or {}
+    usage = metadata.get("token_usage")
+    if usage and "prompt_tokens" in usage:
+        return int(usage["prompt_tokens"]), int(usage.get("completion_tokens", 0))
+    usage = metadata.get("usage_metadata")
+    if usage and "prompt_token_count" in usage:
+        return int(usage["prompt_token_count"]), int(usage.get("candidates_token_count", 0))
+    return None
+
+
+def token_cost_usd(model_name: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Price of a call from ``LLM_TOKEN_PRICES_USD``; ``None`` for unlisted models."""
+
+    # Longest prefix wins: "gpt-4o-mini-2024-07-18" is priced as gpt-4o-mini, not gpt-4o
+    matches = [prefix for prefix in LLM_TOKEN_PRICES_USD if model_name.startswith(prefix)]
+    if not matches:
+        return None
+    prompt_price, completion_price = LLM_TOKEN_PRICES_USD[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def llm_span(node: str) -> Any:
+    """Trace span around one LLM call made by ``node``."""
+
+    return start_span(f"llm.{node}", SPAN_KIND_CLIENT, **{"gen_ai.operation.name": "chat", "agent.node": node})
+
+
+def record_llm_usage(state: AgentState, node: str, prompt: str, response: Any) -> None:
+    """Add one call's tokens to ``metrics["llm_usage"][node]`` and the run totals.
+
+    Provider usage metadata is used when the response carries it; otherwise
+    both sides are estimated with the local tokenizer. Responses served from
+    the LLM response cache cost nothing and are not counted. The counts are
+    also set on the current trace span.
+    """
+
+    metadata = getattr(response, "response_metadata", None) or {}
+    span = current_span()
+    if metadata.get("llm_cache_hit"):
+        if span is not None:
+            span.set_attributes(**{"llm.cache_hit": True})
+        return
+
+    reported = response_usage(response)
+    estimated = reported is None
+    if reported is None:
+        content = getattr(response, "content", response)
+        reported = estimate_tokens(prompt), estimate_tokens(content if isinstance(content, str) else str(content))
+    prompt_tokens, completion_tokens = reported
+    model_name = str(metadata.get("model_name") or metadata.get("model") or "")
+    cost = token_cost_usd(model_name, prompt_tokens, completion_tokens) if model_name else None
+
+    metrics: Metrics = dict(state.get("metrics", {}))  # type: ignore[assignment]
+    usage_by_node: Dict[str, LLMUsage] = {name: dict(usage) for name, usage in metrics.get("llm_usage", {}).items()}  # type: ignore[misc]
+    usage = usage_by_node.setdefault(node, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "estimated_calls": 0})
+    usage["calls"] += 1
+    usage["prompt_tokens"] += prompt_tokens
+    usage["completion_tokens"] += completion_tokens
+    usage["estimated_calls"] += int(estimated)
+    if cost is not None:
+        usage["cost_usd"] = round(usage.get("cost_usd", 0.0) + cost, 6)
+        metrics["llm_cost_usd"] = round(metrics.get("llm_cost_usd", 0.0) + cost, 6)
+    metrics["llm_usage"] = usage_by_node
+    metrics["llm_prompt_tokens"] = metrics.get("llm_prompt_tokens", 0) + prompt_tokens
+    metrics["llm_completion_tokens"] = metrics.get("llm_completion_tokens", 0) + completion_tokens
+    state["metrics"] = metrics
+    if span is not None:
+        span.set_attributes(
+            **{
+                "gen_ai.request.model": model_name or None,
+                "gen_ai.usage.input_tokens": prompt_tokens,
+                "gen_ai.usage.output_tokens": completion_tokens,
+                "llm.usage_estimated": estimated,
+            }
+        )
+
+    LOGGER.debug(
+        "LLM usage recorded",
+        extra={"node": node, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+    )
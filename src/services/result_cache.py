@@ -0,0 +1,149 @@
+"""Content-addressed cache for BigQuery query results."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from ..config import get_settings
+
+try:
+    import pyarrow  # noqa: F401 - required by DataFrame.to_parquet
+except ImportError:  # pragma: no cover - optional dependency guard
+    pyarrow = None
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class QueryResultCache:
+    """Keep recent query results in memory, optionally spilling to Parquet files.
+
+    The memory tier is an LRU bounded by the total in-memory size of cached
+    frames; both tiers expire entries ``ttl_sec`` after they were stored.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_sec: float,
+        max_bytes: int,
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        self._ttl_sec = ttl_sec
+        self._max_bytes = max_bytes
+        self._cache_dir = cache_dir if pyarrow is not None else None
+        self._entries: "OrderedDict[str, Tuple[pd.DataFrame, int, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(sql_query: str, dataset_id: str, maximum_bytes_billed: int) -> str:
+        """Hash everything that can change the result (or whether it may run)."""
+
+        payload = "\x1f".join((dataset_id, str(maximum_bytes_billed), sql_query))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached frame for ``key`` or ``None`` when missing/expired."""
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[2] <= self._ttl_sec:
+                    self._entries.move_to_end(key)
+                    return entry[0]
+                self._drop(key)
+
+        loaded = self._load_from_disk(key, now)
+        if loaded is None:
+            return None
+        # Keep the original store time so promotion does not extend the TTL
+        df, stored_at = loaded
+        self._remember(key, df, stored_at)
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Store a result in memory and, when configured, on disk."""
+
+        stored_at = time.time()
+        self._remember(key, df, stored_at)
+        self._write_to_disk(key, df)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _remember(self, key: str, df: pd.DataFrame, stored_at: float) -> None:
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > self._max_bytes:
+            LOGGER.debug("Result too large for memory cache", extra={"bytes": nbytes})
+            return
+
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (df, nbytes, stored_at)
+            self._total_bytes += nbytes
+            while self._total_bytes > self._max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._drop(oldest_key)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def _path_for(self, key: str) -> Optional[Path]:
+        if self._cache_dir is None:
+            return None
+        return self._cache_dir / f"{key}.parquet"
+
+    def _load_from_disk(self, key: str, now: float) -> Optional[Tuple[pd.DataFrame, float]]:
+        path = self._path_for(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            stored_at = path.stat().st_mtime
+            if now - stored_at > self._ttl_sec:
+                path.unlink(missing_ok=True)
+                return None
+            return pd.read_parquet(path), stored_at
+        except Exception as exc:  # pragma: no cover - filesystem/parquet issues
+            LOGGER.warning("Ignoring unreadable result cache file", extra={"path": str(path), "error": str(exc)})
+            return None
+
+    def _write_to_disk(self, key: str, df: pd.DataFrame) -> None:
+        path = self._path_for(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            df.to_parquet(tmp_path, index=False)
+            tmp_path.replace(path)
+        except Exception as exc:  # pragma: no cover - filesystem/parquet issues
+            LOGGER.warning("Failed to persist query result", extra={"path": str(path), "error": str(exc)})
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> Optional[QueryResultCache]:
+    """Return the process-wide result cache, or ``None`` when disabled."""
+
+    settings = get_settings()
+    if not settings.query_cache_enabled:
+        return None
+    return QueryResultCache(
+        ttl_sec=settings.query_cache_ttl_sec,
+        max_bytes=settings.query_cache_max_bytes,
+        cache_dir=Path(settings.query_cache_dir) if settings.query_cache_dir else None,
+    )
@@ -0,0 +1,232 @@
+"""Vectorized profiling of query results for validation and LLM prompts."""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..constants import DEFAULT_PROFILE_TOP_K
+from ..models.state import ColumnProfile, PeriodDelta, ResultProfile
+from .tokens import estimate_tokens
+
+# Column names treated as time axes when their values parse as dates
+_PERIOD_NAME_HINTS = ("date", "day", "week", "month", "quarter", "year", "period", "time")
+# Name words of columns whose values add up across rows of one period; a
+# non-additive word (avg_revenue, sale_price) wins, unknown columns are averaged
+_ADDITIVE_NAME_WORDS = frozenset(
+    "count cnt total sum revenue sales amount spend items orders quantity qty num volume".split()
+)
+_NON_ADDITIVE_NAME_WORDS = frozenset(
+    "avg average mean median min max rate ratio pct percent percentage share price margin per distinct unique".split()
+)
+_NAME_WORD = re.compile(r"[a-z0-9]+")
+# Period-over-period deltas kept per numeric column
+_MAX_DELTAS = 3
+
+
+def profile_result(df: pd.DataFrame, top_k: int = DEFAULT_PROFILE_TOP_K) -> ResultProfile:
+    """Profile every column of ``df`` in one vectorized pass.
+
+    Null counts and numeric aggregates are computed column-wise over the whole
+    frame at once; top-k values are only counted for non-numeric columns.
+    """
+
+    row_count, column_count = df.shape
+    null_counts = df.isna().sum()
+    total_cells = row_count * column_count
+    completeness = 1.0 - float(null_counts.sum()) / total_cells if total_cells else 0.0
+
+    numeric = df.select_dtypes(include="number", exclude="bool")
+    numeric_stats = numeric.agg(["min", "max", "mean"]) if not numeric.empty and row_count else None
+    period_column = _find_period_column(df)
+    period_totals = _period_totals(df, period_column, list(numeric.columns)) if period_column else None
+
+    columns: List[ColumnProfile] = []
+    for name in df.columns:
+        series = df[name]
+        column: ColumnProfile = {
+            "name": str(name),
+            "dtype": _kind(series),
+            "null_rate": round(float(null_counts[name]) / row_count, 4) if row_count else 0.0,
+        }
+        if numeric_stats is not None and name in numeric_stats.columns:
+            stats = numeric_stats[name]
+            column["min"] = _scalar(stats["min"])
+            column["max"] = _scalar(stats["max"])
+            column["mean"] = _scalar(stats["mean"])
+            if period_totals is not None and name in period_totals.columns:
+                column["deltas"] = _deltas(period_totals[name])
+        else:
+            counts = series.value_counts(dropna=True)
+            column["distinct"] = int(len(counts))
+            if column["dtype"] == "datetime" and len(counts):
+                column["min"] = _scalar(series.min())
+                column["max"] = _scalar(series.max())
+            else:
+                column["top_values"] = [(_scalar(value), int(count)) for value, count in counts.head(top_k).items()]
+        columns.append(column)
+
+    return {
+        "row_count": int(row_count),
+        "column_count": int(column_count),
+        "completeness": round(completeness, 4),
+        "period_column": str(period_column) if period_column is not None else None,
+        "columns": columns,
+    }
+
+
+def render_profile(profile: ResultProfile, token_budget: int, sample_rows: Optional[pd.DataFrame] = None) -> str:
+    """Render ``profile`` as compact text that fits ``token_budget`` tokens.
+
+    Detail is shed in order (top values, then deltas, then whole columns) until
+    the summary fits; leftover budget is filled with sample rows.
+    """
+
+    header = (
+        f"rows={profile.get('row_count', 0)} columns={profile.get('column_count', 0)} "
+        f"completeness={profile.get('completeness', 0.0):.0%}"
+    )
+    if profile.get("period_column"):
+        header += f" period_column={profile['period_column']}"
+
+    columns = profile.get("columns", [])
+    for detail in (2, 1, 0):
+        lines = [header, *(_render_column(column, detail) for column in columns)]
+        text = "\n".join(lines)
+        if estimate_tokens(text) <= token_budget:
+            break
+    else:
+        # Even the terse form is too long: keep as many columns as fit
+        kept = [header]
+        for index, line in enumerate(lines[1:]):
+            note = f"... {len(columns) - index} more columns"
+            if estimate_tokens("\n".join([*kept, line, note])) > token_budget:
+                kept.append(note)
+                break
+            kept.append(line)
+        return "\n".join(kept)
+
+    if sample_rows is None or sample_rows.empty:
+        return text
+
+    used = estimate_tokens(text)
+    sample_lines = ["sample rows:", ",".join(map(str, sample_rows.columns))]
+    for row in sample_rows.itertuples(index=False):
+        line = ",".join(_format_value(value) for value in row)
+        if used + estimate_tokens("\n".join([*sample_lines, line])) > token_budget:
+            break
+        sample_lines.append(line)
+    if len(sample_lines) > 2:
+        text += "\n" + "\n".join(sample_lines)
+    return text
+
+
+def _render_column(column: ColumnProfile, detail: int) -> str:
+    parts = [f"- {column['name']} ({column['dtype']}"]
+    if column.get("null_rate"):
+        parts.append(f", {column['null_rate']:.0%} null")
+    parts.append(")")
+    if "mean" in column:
+        parts.append(
+            f": min={_format_value(column.get('min'))} max={_format_value(column.get('max'))} "
+            f"mean={_format_value(column.get('mean'))}"
+        )
+        if detail >= 1 and column.get("deltas"):
+            changes = ", ".join(
+                f"{delta['period']}: {_format_value(delta['value'])} ({_format_change(delta['change_pct'])})"
+                for delta in column["deltas"]
+            )
+            parts.append(f"; recent periods {changes}")
+    else:
+        parts.append(f": {column.get('distinct', 0)} distinct")
+        if "min" in column:
+            parts.append(f", {_format_value(column['min'])} to {_format_value(column['max'])}")
+        if detail >= 2 and column.get("top_values"):
+            top = ", ".join(f"{_format_value(value)} ({count})" for value, count in column["top_values"])
+            parts.append(f"; top {top}")
+    return "".join(parts)
+
+
+def _find_period_column(df: pd.DataFrame) -> Optional[Any]:
+    for name in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[name]):
+            return name
+    for name in df.columns:
+        series = df[name]
+        if not any(hint in str(name).lower() for hint in _PERIOD_NAME_HINTS):
+            continue
+        if pd.api.types.is_numeric_dtype(series) or series.empty:
+            continue
+        # Only the first values are probed so this stays cheap on large results
+        probe = pd.to_datetime(series.head(20).astype(str), errors="coerce")
+        if probe.notna().all():
+            return name
+    return None
+
+
+def _period_totals(df: pd.DataFrame, period_column: Any, numeric_columns: List[Any]) -> Optional[pd.DataFrame]:
+    value_columns = [column for column in numeric_columns if column != period_column]
+    if not value_columns:
+        return None
+    # Several rows per period (e.g. per category) become one value: totals add
+    # up, while averages, prices and rates are averaged instead of summed
+    aggregations = {column: "sum" if is_additive_column(column) else "mean" for column in value_columns}
+    totals = df.groupby(period_column, sort=True)[value_columns].agg(aggregations)
+    return totals if len(totals) >= 2 else None
+
+
+def is_additive_column(column: Any) -> bool:
+    """Whether values of ``column`` can be summed across rows (counts, totals, revenue)."""
+
+    words = set(_NAME_WORD.findall(str(column).lower()))
+    return bool(words & _ADDITIVE_NAME_WORDS) and not words & _NON_ADDITIVE_NAME_WORDS
+
+
+def _deltas(series: pd.Series) -> List[PeriodDelta]:
+    tail = series.iloc[-(_MAX_DELTAS + 1):]
+    previous_values = tail.shift(1)
+    deltas: List[PeriodDelta] = []
+    for period, value, previous in zip(tail.index[1:], tail.iloc[1:], previous_values.iloc[1:]):
+        change = (value - previous) / abs(previous) * 100 if previous else None
+        deltas.append(
+            {
+                "period": _format_value(period),
+                "value": float(value),
+                "change_pct": round(float(change), 2) if change is not None else None,
+            }
+        )
+    return deltas
+
+
+def _kind(series: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(series):
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(series):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "datetime"
+    return "string"
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, pd.Timestamp):
+        return value.date().isoformat() if value == value.normalize() else value.isoformat()
+    if isinstance(value, float):
+        return f"{value:,.2f}" if abs(value) < 1e6 else f"{value:,.0f}"
+    return str(value)
+
+
+def _format_change(change_pct: Optional[float]) -> str:
+    return "n/a" if change_pct is None else f"{change_pct:+.1f}%"
@@ -0,0 +1,212 @@
+"""Two-tier (in-process LRU + on-disk JSON) cache for BigQuery table schemas."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ..config import get_settings
+from ..constants import DEFAULT_SCHEMA_MODIFIED_CHECK_SEC
+from ..models.sql_generation_types import TableSchema
+
+
+LOGGER = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+
+class SchemaCache:
+    """Cache table schemas keyed by ``(dataset_id, table_name)``.
+
+    Entries expire ``ttl_sec`` after their ``retrieved_at`` timestamp and are
+    invalidated when the caller observes a different ``last_modified`` value
+    for the table than the one stored alongside the schema. Modification
+    times are looked up through ``last_modified_times``, which re-reads them
+    at most every ``modified_check_sec`` per table.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_sec: float,
+        max_entries: int,
+        cache_dir: Optional[Path] = None,
+        modified_check_sec: float = DEFAULT_SCHEMA_MODIFIED_CHECK_SEC,
+    ) -> None:
+        self._ttl_sec = ttl_sec
+        self._max_entries = max(1, max_entries)
+        self._cache_dir = cache_dir
+        self._modified_check_sec = modified_check_sec
+        self._entries: "OrderedDict[CacheKey, Tuple[TableSchema, float]]" = OrderedDict()
+        # (last_modified, checked_at) per table, from put() or the last lookup
+        self._modified: Dict[CacheKey, Tuple[Optional[float], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        dataset_id: str,
+        table_name: str,
+        *,
+        last_modified: Optional[float] = None,
+    ) -> Optional[Tuple[TableSchema, float]]:
+        """Return ``(schema, retrieved_at)`` or ``None`` when missing/stale."""
+
+        key = (dataset_id, table_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is None:
+            return None
+
+        table_schema, retrieved_at = entry
+        if time.time() - retrieved_at > self._ttl_sec:
+            LOGGER.debug("Schema cache entry expired", extra={"table": table_name})
+            self.invalidate(dataset_id, table_name)
+            return None
+
+        cached_modified = table_schema.get("last_modified")
+        if last_modified is not None and cached_modified is not None and cached_modified != last_modified:
+            LOGGER.info("Table modified since schema was cached", extra={"table": table_name})
+            self.invalidate(dataset_id, table_name)
+            return None
+
+        return table_schema, retrieved_at
+
+    def last_modified_times(
+        self,
+        dataset_id: str,
+        table_names: Sequence[str],
+        fetch: Callable[[List[str]], Mapping[str, float]],
+    ) -> Dict[str, float]:
+        """Return known modification times, calling ``fetch`` only for tables not checked recently.
+
+        Storing a schema counts as a check, so freshly fetched tables are not
+        looked up again right away. When ``fetch`` fails the times already
+        known are returned.
+        """
+
+        now = time.time()
+        with self._lock:
+            known = {name: self._modified.get((dataset_id, name)) for name in table_names}
+        due = [name for name, entry in known.items() if entry is None or now - entry[1] >= self._modified_check_sec]
+
+        if due:
+            try:
+                fetched = fetch(due)
+            except Exception as exc:  # pragma: no cover - network/external dependency
+                LOGGER.warning("Table modification lookup failed", extra={"error": str(exc)})
+            else:
+                with self._lock:
+                    for name in due:
+                        known[name] = self._modified[(dataset_id, name)] = (fetched.get(name), now)
+
+        return {name: entry[0] for name, entry in known.items() if entry is not None and entry[0] is not None}
+
+    def put(
+        self,
+        dataset_id: str,
+        table_name: str,
+        table_schema: TableSchema,
+        *,
+        retrieved_at: Optional[float] = None,
+    ) -> None:
+        """Store a table schema in memory and, when configured, on disk."""
+
+        key = (dataset_id, table_name)
+        entry = (table_schema, retrieved_at if retrieved_at is not None else time.time())
+        self._remember(key, entry)
+        with self._lock:
+            self._modified[key] = (table_schema.get("last_modified"), entry[1])
+        self._write_to_disk(key, entry)
+
+    def invalidate(self, dataset_id: str, table_name: str) -> None:
+        """Drop a single table from both cache tiers."""
+
+        key = (dataset_id, table_name)
+        with self._lock:
+            self._entries.pop(key, None)
+        path = self._path_for(key)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop every entry from both cache tiers."""
+
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._modified.clear()
+        for key in keys:
+            path = self._path_for(key)
+            if path is not None:
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: CacheKey, entry: Tuple[TableSchema, float]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _path_for(self, key: CacheKey) -> Optional[Path]:
+        if self._cache_dir is None:
+            return None
+        digest = hashlib.sha256("/".join(key).encode("utf-8")).hexdigest()[:32]
+        return self._cache_dir / f"{digest}.json"
+
+    def _load_from_disk(self, key: CacheKey) -> Optional[Tuple[TableSchema, float]]:
+        path = self._path_for(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            return payload["schema"], float(payload["retrieved_at"])
+        except (OSError, ValueError, KeyError) as exc:
+            LOGGER.warning("Ignoring unreadable schema cache file", extra={"path": str(path), "error": str(exc)})
+            return None
+
+    def _write_to_disk(self, key: CacheKey, entry: Tuple[TableSchema, float]) -> None:
+        path = self._path_for(key)
+        if path is None:
+            return
+        table_schema, retrieved_at = entry
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(
+                json.dumps({"dataset": key[0], "table": key[1], "schema": table_schema, "retrieved_at": retrieved_at}),
+                encoding="utf-8",
+            )
+            tmp_path.replace(path)
+        except OSError as exc:  # pragma: no cover - filesystem issues
+            LOGGER.warning("Failed to persist schema cache entry", extra={"path": str(path), "error": str(exc)})
+
+
+@lru_cache(maxsize=1)
+def get_schema_cache() -> SchemaCache:
+    """Return the process-wide schema cache configured from settings."""
+
+    settings = get_settings()
+    cache_dir: Optional[Path] = None
+    if settings.schema_cache_persist:
+        cache_dir = Path(settings.schema_cache_dir) if settings.schema_cache_dir else Path.cwd() / ".cache" / "schema"
+    return SchemaCache(
+        ttl_sec=settings.schema_cache_ttl_sec,
+        max_entries=settings.schema_cache_max_entries,
+        cache_dir=cache_dir,
+        modified_check_sec=settings.schema_modified_check_sec,
+    )
@@ -0,0 +1,139 @@
+"""Schema context for the SQL generation prompt, ranked and cut to a token budget."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from ..constants import ANALYSIS_SCHEMA_TERMS
+from ..models.sql_generation_types import SchemaInfo
+from .terms import words
+from .tokens import estimate_tokens
+
+
+class SchemaContext(TypedDict):
+    """Rendered schema context and what it cost."""
+
+    text: str
+    tokens: int
+    full_tokens: int
+    """Tokens the untrimmed schema would have used"""
+    columns: int
+    """Columns listed"""
+    omitted_columns: int
+
+
+_TIME_TYPES = frozenset({"TIMESTAMP", "DATE", "DATETIME"})
+
+
+def _is_required(column: str, column_type: str) -> bool:
+    # Join keys and time columns are needed by almost every query
+    name = column.lower()
+    return name == "id" or name.endswith("_id") or name.endswith("_at") or column_type.upper() in _TIME_TYPES
+
+
+def _relevance(name: str, terms: frozenset) -> float:
+    score = 0.0
+    for part in words(name):
+        if part in terms:
+            score += 1.0
+        elif len(part) >= 4 and any(len(term) >= 4 and (term.startswith(part) or part.startswith(term)) for term in terms):
+            # "categories" ~ "category", "geo" is too short to count
+            score += 0.5
+    return score
+
+
+def _render(tables: List[Tuple[str, List[Tuple[str, str]], int]]) -> str:
+    lines: List[str] = []
+    for table_name, columns, omitted in tables:
+        lines.append(f"## {table_name}")
+        lines.extend(f"- {column}: {column_type}" for column, column_type in columns)
+        if omitted:
+            lines.append(f"- (+{omitted} columns not shown)")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def build_schema_context(
+    schema_info: Optional[SchemaInfo],
+    user_query: str,
+    analysis_type: Optional[str],
+    token_budget: int,
+) -> SchemaContext:
+    """Render ``schema_info`` as ``## table`` / ``- column: TYPE`` lines within ``token_budget``.
+
+    When the full schema fits it is returned unchanged. Otherwise tables are
+    ranked by how well their names and columns match the question and the
+    analysis type. In rank order each table contributes its join keys,
+    timestamps and lexically relevant columns; the remaining columns only fill
+    budget left after that. Tables with nothing kept are dropped and every
+    trimmed table notes how many columns were left out.
+    """
+
+    tables = (schema_info or {}).get("tables") or {}
+    if not tables:
+        return {"text": "(No schema available)", "tokens": 0, "full_tokens": 0, "columns": 0, "omitted_columns": 0}
+
+    full = [(name, list(table.get("columns", {}).items()), 0) for name, table in tables.items()]
+    full_text = _render(full)
+    full_tokens = estimate_tokens(full_text)
+    total_columns = sum(len(columns) for _, columns, _ in full)
+    if full_tokens <= token_budget:
+        return {
+            "text": full_text,
+            "tokens": full_tokens,
+            "full_tokens": full_tokens,
+            "columns": total_columns,
+            "omitted_columns": 0,
+        }
+
+    terms = frozenset(words(user_query)) | ANALYSIS_SCHEMA_TERMS.get(analysis_type, frozenset())  # type: ignore[call-overload]
+    # Per table: (tier, -relevance, position, column), sorted best first
+    ranked: Dict[str, List[Tuple[int, float, int, str]]] = {}
+    table_scores: Dict[str, float] = {}
+    for name, columns, _ in full:
+        entries = []
+        for position, (column, column_type) in enumerate(columns):
+            relevance = _relevance(column, terms)
+            tier = 0 if _is_required(column, column_type) else 1 if relevance > 0 else 2
+            entries.append((tier, -relevance, position, column))
+        ranked[name] = sorted(entries)
+        table_scores[name] = 2 * _relevance(name, terms) - sum(entry[1] for entry in entries)
+    table_order = sorted(tables, key=lambda name: table_scores[name], reverse=True)
+
+    column_types = {name: dict(columns) for name, columns, _ in full}
+    kept: Dict[str, List[str]] = {name: [] for name in table_order}
+    used = 0
+    # Best table first: its keys, timestamps and matching columns, then the next
+    # table's; columns nothing asked for only fill what budget is left
+    for core in (True, False):
+        for name in table_order:
+            for column_tier, _, _, column in ranked[name]:
+                if (column_tier < 2) != core:
+                    continue
+                # Per-line cost; a table's first column also pays for its header and notes
+                cost = estimate_tokens(f"- {column}: {column_types[name][column]}\n")
+                if not kept[name]:
+                    cost += estimate_tokens(f"## {name}\n- (+{len(column_types[name])} columns not shown)\n\n")
+                if used + cost > token_budget:
+                    continue
+                kept[name].append(column)
+                used += cost
+
+    trimmed = [
+        (
+            name,
+            [(column, column_type) for column, column_type in column_types[name].items() if column in kept[name]],
+            len(column_types[name]) - len(kept[name]),
+        )
+        for name in table_order
+        if kept[name]
+    ]
+    text = _render(trimmed)
+    kept_columns = sum(len(columns) for columns in kept.values())
+    return {
+        "text": text,
+        "tokens": estimate_tokens(text),
+        "full_tokens": full_tokens,
+        "columns": kept_columns,
+        "omitted_columns": total_columns - kept_columns,
+    }
@@ -0,0 +1,205 @@
+"""Persistent question→SQL memo with BM25 lookup over past successful runs."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, TypedDict
+
+from ..config import get_settings
+from ..constants import SQL_MEMO_BM25_B, SQL_MEMO_BM25_K1
+from .sql_normalizer import fingerprint_sql
+from .terms import STOPWORDS, words
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class MemoEntry(TypedDict):
+    """One validated question and the SQL that answered it."""
+
+    question: str
+    sql: str
+    analysis_type: str
+    fingerprint: str
+    uses: int
+    last_used: float
+
+
+class MemoMatch(TypedDict):
+    """A memo entry ranked for a new question."""
+
+    entry: MemoEntry
+    score: float
+    """BM25 score used for ranking"""
+    similarity: float
+    """Jaccard overlap of question terms, 1.0 for the same wording"""
+
+
+class SQLMemo:
+    """Index of ``(question, sql, analysis_type)`` triples from successful runs.
+
+    Questions are ranked with BM25 over word unigrams and bigrams; the
+    returned similarity (term-set Jaccard) is what callers threshold on.
+    Beyond ``max_entries`` the least recently used entry is dropped, and
+    ``evict_sql`` removes every entry whose SQL has since failed. The index
+    is written to ``path`` as JSON after each change.
+    """
+
+    def __init__(self, *, path: Optional[Path], max_entries: int) -> None:
+        self._path = path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # One writer at a time; each write snapshots the entries under it, so
+        # a slower writer can never replace a newer file with an older state
+        self._save_lock = threading.Lock()
+        self._entries: Dict[int, MemoEntry] = {}
+        self._terms: Dict[int, Counter] = {}
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._total_length = 0
+        self._next_id = 0
+        self._load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def search(self, question: str, analysis_type: Optional[str] = None, limit: int = 3) -> List[MemoMatch]:
+        """Best entries for ``question``, optionally restricted to one analysis type."""
+
+        query_terms = _features(question)
+        query_set = set(query_terms)
+        with self._lock:
+            count = len(self._entries)
+            if not count or not query_terms:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[int, float] = defaultdict(float)
+            for term in query_set:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for entry_id, frequency in postings.items():
+                    length = sum(self._terms[entry_id].values())
+                    norm = SQL_MEMO_BM25_K1 * (1 - SQL_MEMO_BM25_B + SQL_MEMO_BM25_B * length / average_length)
+                    scores[entry_id] += idf * frequency * (SQL_MEMO_BM25_K1 + 1) / (frequency + norm)
+
+            matches: List[MemoMatch] = []
+            for entry_id, score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+                entry = self._entries[entry_id]
+                if analysis_type and entry["analysis_type"] != analysis_type:
+                    continue
+                entry_set = set(self._terms[entry_id])
+                similarity = len(query_set & entry_set) / len(query_set | entry_set)
+                matches.append({"entry": dict(entry), "score": round(score, 3), "similarity": round(similarity, 3)})  # type: ignore[typeddict-item]
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def record_success(self, question: str, sql: str, analysis_type: str) -> None:
+        """Remember (or refresh) a validated question→SQL pair."""
+
+        fingerprint = fingerprint_sql(sql)
+        now = time.time()
+        with self._lock:
+            for entry in self._entries.values():
+                if entry["question"] == question and entry["fingerprint"] == fingerprint:
+                    entry["uses"] += 1
+                    entry["last_used"] = now
+                    break
+            else:
+                self._add(
+                    {
+                        "question": question,
+                        "sql": sql,
+                        "analysis_type": analysis_type,
+                        "fingerprint": fingerprint,
+                        "uses": 1,
+                        "last_used": now,
+                    }
+                )
+                while len(self._entries) > self._max_entries:
+                    oldest = min(self._entries, key=lambda entry_id: self._entries[entry_id]["last_used"])
+                    self._remove(oldest)
+        self._save()
+
+    def evict_sql(self, sql: str) -> int:
+        """Drop every entry whose SQL matches ``sql`` (canonically); returns how many."""
+
+        fingerprint = fingerprint_sql(sql)
+        with self._lock:
+            stale = [entry_id for entry_id, entry in self._entries.items() if entry["fingerprint"] == fingerprint]
+            for entry_id in stale:
+                self._remove(entry_id)
+        if stale:
+            LOGGER.info("Evicted failing SQL from memo", extra={"fingerprint": fingerprint, "entries": len(stale)})
+            self._save()
+        return len(stale)
+
+    def _add(self, entry: MemoEntry) -> None:
+        entry_id = self._next_id
+        self._next_id += 1
+        terms = Counter(_features(entry["question"]))
+        self._entries[entry_id] = entry
+        self._terms[entry_id] = terms
+        self._total_length += sum(terms.values())
+        for term, frequency in terms.items():
+            self._postings[term][entry_id] = frequency
+
+    def _remove(self, entry_id: int) -> None:
+        self._entries.pop(entry_id)
+        terms = self._terms.pop(entry_id)
+        self._total_length -= sum(terms.values())
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(entry_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def _load(self) -> None:
+        if self._path is None or not self._path.exists():
+            return
+        try:
+            entries = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable SQL memo", extra={"path": str(self._path), "error": str(exc)})
+            return
+        for entry in sorted(entries, key=lambda item: item.get("last_used", 0.0))[-self._max_entries:]:
+            self._add(entry)
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                payload = json.dumps(list(self._entries.values()))
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self._path.with_suffix(".tmp")
+                tmp_path.write_text(payload, encoding="utf-8")
+                tmp_path.replace(self._path)
+            except OSError as exc:  # pragma: no cover - filesystem issues
+                LOGGER.warning("Failed to persist SQL memo", extra={"path": str(self._path), "error": str(exc)})
+
+
+def _features(text: str) -> List[str]:
+    terms = words(text, STOPWORDS)
+    return terms + [f"{left} {right}" for left, right in zip(terms, terms[1:])]
+
+
+@lru_cache(maxsize=1)
+def get_sql_memo() -> Optional[SQLMemo]:
+    """Return the process-wide memo, or ``None`` when disabled."""
+
+    settings = get_settings()
+    if not settings.sql_memo_enabled:
+        return None
+    path = Path(settings.sql_memo_path) if settings.sql_memo_path else Path.cwd() / ".cache" / "sql_memo.json"
+    return SQLMemo(path=path, max_entries=settings.sql_memo_max_entries)
@@ -0,0 +1,243 @@
+"""BigQuery SQL canonicalization and fingerprinting.
+
+Equivalent LLM outputs differ in whitespace, comments, keyword case, table
+alias names and identifier quoting. ``canonicalize_sql`` rewrites a query into
+a single stable text form so caches and dedup logic can key on it, and
+``fingerprint_sql`` hashes that form.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+
+class SQLToken(NamedTuple):
+    """A lexical token of a SQL statement."""
+
+    kind: str
+    value: str
+
+
+KEYWORD = "keyword"
+IDENT = "ident"
+QUOTED_IDENT = "quoted_ident"
+STRING = "string"
+NUMBER = "number"
+PARAM = "param"
+OP = "op"
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>\s+)
+    | (?P<comment>--[^\n]*|\#[^\n]*|/\*.*?\*/)
+    | (?P<string>[rRbB]{0,2}(?:'''.*?'''|\"\"\".*?\"\"\"|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"))
+    | (?P<quoted_ident>`[^`]*`)
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<param>@@?\w+|\?)
+    | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<op><>|!=|>=|<=|\|\||<<|>>|=>|.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Reserved words plus clause keywords that commonly appear in generated SQL.
+# Date parts (MONTH, YEAR, ...) stay identifiers since they double as column aliases.
+SQL_KEYWORDS = frozenset(
+    """
+    ALL AND ANY ARRAY AS ASC BETWEEN BY CASE CAST CROSS CURRENT DATE DATETIME
+    DESC DISTINCT ELSE END EXCEPT EXISTS EXTRACT FALSE FETCH FIRST FOLLOWING FOR
+    FROM FULL GROUP GROUPING HAVING IF IN INNER INTERSECT INTERVAL INTO IS JOIN
+    LAST LEFT LIKE LIMIT NOT NULL NULLS OFFSET ON OR ORDER OUTER OVER PARTITION
+    PRECEDING QUALIFY RANGE RECURSIVE RIGHT ROLLUP ROW ROWS SELECT SET STRUCT
+    TABLESAMPLE THEN TIME TIMESTAMP TO TRUE UNBOUNDED UNION UNNEST USING WHEN
+    WHERE WINDOW WITH
+    """.split()
+)
+
+# Keywords that behave like functions and are written without a space before "("
+_CALLABLE_KEYWORDS = frozenset(
+    {"ARRAY", "CAST", "DATE", "DATETIME", "EXTRACT", "IF", "STRUCT", "TIME", "TIMESTAMP", "UNNEST"}
+)
+
+# Keywords that terminate a table reference, so they can never be an implicit alias
+_TABLE_CLAUSE_KEYWORDS = frozenset({"FROM", "JOIN"})
+
+
+def tokenize_sql(sql: str) -> List[SQLToken]:
+    """Split SQL into tokens, dropping whitespace and comments."""
+
+    tokens: List[SQLToken] = []
+    for match in _TOKEN_PATTERN.finditer(sql):
+        group = match.lastgroup
+        value = match.group()
+        if group in {"ws", "comment"}:
+            continue
+        if group == "word":
+            upper = value.upper()
+            if upper in SQL_KEYWORDS:
+                tokens.append(SQLToken(KEYWORD, upper))
+            else:
+                tokens.append(SQLToken(IDENT, value))
+        elif group == "op":
+            tokens.append(SQLToken(OP, value))
+        else:
+            tokens.append(SQLToken(group, value))
+
+    while tokens and tokens[-1] == SQLToken(OP, ";"):
+        tokens.pop()
+    return tokens
+
+
+def parse_table_reference(tokens: List[SQLToken], start: int) -> Optional[tuple[str, int]]:
+    """Read a (possibly dotted/backticked) table path at ``start``.
+
+    Returns ``(path, next_index)`` or ``None`` when no table path starts there.
+    """
+
+    parts: List[str] = []
+    index = start
+    while index < len(tokens):
+        kind, value = tokens[index]
+        if kind == QUOTED_IDENT:
+            parts.extend(part for part in value.strip("`").split(".") if part)
+        elif kind == IDENT:
+            parts.append(value)
+            # Unquoted project ids may contain dashes, e.g. bigquery-public-data.samples
+            while (
+                index + 2 < len(tokens)
+                and tokens[index + 1] == SQLToken(OP, "-")
+                and tokens[index + 2].kind in {IDENT, NUMBER}
+            ):
+                parts[-1] += "-" + tokens[index + 2].value
+                index += 2
+        else:
+            break
+        index += 1
+        has_next_part = (
+            index + 1 < len(tokens)
+            and tokens[index] == SQLToken(OP, ".")
+            and tokens[index + 1].kind in {IDENT, QUOTED_IDENT}
+        )
+        if not has_next_part:
+            break
+        index += 1
+
+    if not parts:
+        return None
+    return ".".join(parts), index
+
+
+def find_table_references(tokens: List[SQLToken]) -> List[str]:
+    """Return table paths referenced after FROM/JOIN, in order of appearance."""
+
+    references: List[str] = []
+    for index, token in enumerate(tokens):
+        if token.kind == KEYWORD and token.value in _TABLE_CLAUSE_KEYWORDS:
+            reference = parse_table_reference(tokens, index + 1)
+            if reference is not None and reference[0] not in references:
+                references.append(reference[0])
+    return references
+
+
+def find_table_aliases(tokens: List[SQLToken]) -> Dict[str, tuple[str, int]]:
+    """Return ``{alias: (table_path, alias_token_index)}`` for FROM/JOIN items."""
+
+    aliases: Dict[str, tuple[str, int]] = {}
+    for index, token in enumerate(tokens):
+        if token.kind != KEYWORD or token.value not in _TABLE_CLAUSE_KEYWORDS:
+            continue
+        reference = parse_table_reference(tokens, index + 1)
+        if reference is None:
+            continue
+        table_path, next_index = reference
+        if next_index < len(tokens) and tokens[next_index] == SQLToken(KEYWORD, "AS"):
+            next_index += 1
+        if next_index < len(tokens) and tokens[next_index].kind == IDENT:
+            aliases[tokens[next_index].value.lower()] = (table_path, next_index)
+    return aliases
+
+
+def _rewrite(tokens: List[SQLToken], parameterize_literals: bool) -> List[SQLToken]:
+    aliases = find_table_aliases(tokens)
+    alias_names = {
+        alias: f"t{position}"
+        for position, (alias, _) in enumerate(sorted(aliases.items(), key=lambda item: item[1][1]), start=1)
+    }
+    alias_positions = {alias_index for _, alias_index in aliases.values()}
+
+    rewritten: List[SQLToken] = []
+    index = 0
+    while index < len(tokens):
+        kind, value = tokens[index]
+        previous = tokens[index - 1] if index else None
+
+        # Canonical table path: one backticked, dotted identifier
+        if previous is not None and previous.kind == KEYWORD and previous.value in _TABLE_CLAUSE_KEYWORDS:
+            reference = parse_table_reference(tokens, index)
+            if reference is not None:
+                table_path, next_index = reference
+                rewritten.append(SQLToken(QUOTED_IDENT, f"`{table_path}`"))
+                if next_index < len(tokens) and tokens[next_index].kind == IDENT and next_index in alias_positions:
+                    rewritten.append(SQLToken(KEYWORD, "AS"))
+                index = next_index
+                continue
+
+        if kind == IDENT:
+            lowered = value.lower()
+            is_qualifier = index + 1 < len(tokens) and tokens[index + 1] == SQLToken(OP, ".")
+            if lowered in alias_names and (is_qualifier or index in alias_positions):
+                rewritten.append(SQLToken(IDENT, alias_names[lowered]))
+            elif index + 1 < len(tokens) and tokens[index + 1] == SQLToken(OP, "("):
+                rewritten.append(SQLToken(IDENT, value.upper()))
+            else:
+                rewritten.append(SQLToken(IDENT, lowered))
+        elif parameterize_literals and kind in {STRING, NUMBER}:
+            rewritten.append(SQLToken(PARAM, "?"))
+        else:
+            rewritten.append(SQLToken(kind, value))
+        index += 1
+
+    return rewritten
+
+
+def _render(tokens: List[SQLToken]) -> str:
+    parts: List[str] = []
+    previous: Optional[SQLToken] = None
+    for token in tokens:
+        needs_space = previous is not None
+        if token.kind == OP and token.value in {",", ")", ".", "]"}:
+            needs_space = False
+        elif previous is not None and previous.kind == OP and previous.value in {"(", ".", "["}:
+            needs_space = False
+        elif token == SQLToken(OP, "(") and previous is not None:
+            is_call = previous.kind == IDENT or (previous.kind == KEYWORD and previous.value in _CALLABLE_KEYWORDS)
+            needs_space = not is_call
+        if needs_space:
+            parts.append(" ")
+        parts.append(token.value)
+        previous = token
+    return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def canonicalize_sql(sql: str, *, parameterize_literals: bool = False) -> str:
+    """Return a formatting-insensitive canonical form of ``sql``.
+
+    Comments and whitespace are dropped, keywords upper-cased, unquoted
+    identifiers lower-cased, table paths backticked, table aliases renamed to
+    ``t1, t2, ...`` in order of appearance and, optionally, string/number
+    literals replaced by ``?``. Column aliases are kept because they name the
+    result columns.
+    """
+
+    return _render(_rewrite(tokenize_sql(sql), parameterize_literals))
+
+
+def fingerprint_sql(sql: str, *, parameterize_literals: bool = False) -> str:
+    """Return a stable hex fingerprint of the canonical SQL."""
+
+    canonical = canonicalize_sql(sql, parameterize_literals=parameterize_literals)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
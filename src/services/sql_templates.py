@@ -0,0 +1,258 @@
+"""Parameterized SQL templates that answer canonical questions without the LLM."""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, TypedDict
+
+from ..constants import (
+    DEFAULT_DATASET_ID,
+    SQL_TEMPLATE_DEFAULT_LIMIT,
+    SQL_TEMPLATE_MAX_LIMIT,
+    AnalysisType,
+    ChartType,
+)
+from .terms import words as question_words
+
+
+class TemplateSlots(TypedDict):
+    """Values extracted from the question and substituted into a template."""
+
+    window: int
+    window_unit: str
+    """BigQuery date part: DAY, WEEK, MONTH, QUARTER or YEAR"""
+    limit: int
+    dimension: str
+
+
+class TemplateMatch(TypedDict):
+    """A template that fully covers the question, rendered to SQL."""
+
+    template: str
+    sql: str
+    chart_type: str
+    slots: TemplateSlots
+
+
+class TemplateRoutingStats(TypedDict):
+    """Process-wide template routing counters."""
+
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+_TABLE = f"`{DEFAULT_DATASET_ID}.{{}}`"
+
+_WINDOW = re.compile(
+    r"\b(?:in|over|for|during)?\s*(?:the\s+)?(?:last|past|previous|trailing)\s+(?:(?P<count>\d+)\s+)?"
+    r"(?P<unit>day|week|month|quarter|year)s?\b"
+)
+_TOP_N = re.compile(r"\b(?:top|first|best|largest|biggest)\s+(?P<limit>\d+)\b")
+
+_UNITS = {"day": "DAY", "week": "WEEK", "month": "MONTH", "quarter": "QUARTER", "year": "YEAR"}
+_GRAINS = {
+    "daily": "DAY", "day": "DAY", "weekly": "WEEK", "week": "WEEK", "monthly": "MONTH", "month": "MONTH",
+    "quarterly": "QUARTER", "quarter": "QUARTER", "yearly": "YEAR", "annual": "YEAR", "year": "YEAR",
+}
+
+# Dimension words per template, mapped to the GROUP BY column list
+_PRODUCT_DIMENSIONS = {
+    "category": "p.category", "categorie": "p.category", "brand": "p.brand", "department": "p.department",
+}
+_CUSTOMER_DIMENSIONS = {
+    "country": "u.country", "countrie": "u.country", "state": "u.state", "city": "u.city", "citie": "u.city",
+    "gender": "u.gender", "source": "u.traffic_source", "channel": "u.traffic_source",
+}
+_GEO_DIMENSIONS = {
+    "country": "u.country", "countrie": "u.country", "nation": "u.country",
+    "state": "u.country, u.state", "region": "u.country, u.state", "regional": "u.country, u.state",
+    "city": "u.country, u.city", "citie": "u.country, u.city",
+}
+
+# Words a template can absorb; anything else means the question asks for more
+# than the template expresses (filters, other metrics) and goes to the LLM.
+_COMMON_WORDS = frozenset(
+    """
+    a all an and any are across at based be breakdown break by can compare compared do does down
+    each for from get give group grouped have how i in is it its list me most my of on our over
+    per please report see seeing show split the their them there this to total us vs
+    we what where which who with you your
+    analysis analyze analyse distribution overview performance performing summary
+    revenue sale sell selling sold order item purchase spend spending money income amount volume number count
+    """.split()
+)
+# Ranking words: only templates with a LIMIT slot can answer "top"/"best" questions;
+# product_trend returns a period series, not a ranking
+_RANKING_WORDS = frozenset("top best highest largest biggest leading ranking rank strongest most".split())
+# Change-over-time words: only product_trend groups by period; a snapshot
+# template would answer "growth by region" with plain totals
+_TREND_WORDS = frozenset("growth growing grow trend trending change changing".split())
+_TEMPLATE_WORDS: Mapping[str, frozenset] = {
+    "product_trend": frozenset("product products time over history historical period timeline".split())
+    | set(_GRAINS)
+    | _TREND_WORDS,
+    "product_breakdown": frozenset("product products mix".split()) | set(_PRODUCT_DIMENSIONS) | _RANKING_WORDS,
+    "customer_segments": frozenset(
+        "customer user buyer shopper client segment segmentation segmented demographic base mix traffic".split()
+    ) | set(_CUSTOMER_DIMENSIONS) | _RANKING_WORDS,
+    "geo_sales": frozenset("geographic geography geo location market area map maps".split())
+    | set(_GEO_DIMENSIONS)
+    | _RANKING_WORDS,
+}
+
+
+def _product_trend(slots: TemplateSlots) -> str:
+    return f"""
+SELECT
+    DATE_TRUNC(DATE(o.created_at), {slots["dimension"]}) AS period,
+    COUNT(DISTINCT oi.product_id) AS unique_products,
+    COUNT(oi.id) AS total_items,
+    SUM(oi.sale_price) AS revenue
+FROM {_TABLE.format("order_items")} AS oi
+INNER JOIN {_TABLE.format("orders")} AS o
+    ON oi.order_id = o.order_id
+WHERE DATE(o.created_at) >= DATE_SUB(CURRENT_DATE(), INTERVAL {slots["window"]} {slots["window_unit"]})
+GROUP BY period
+ORDER BY period ASC
+""".strip()
+
+
+def _product_breakdown(slots: TemplateSlots) -> str:
+    return f"""
+SELECT
+    {slots["dimension"]},
+    COUNT(oi.id) AS total_items,
+    SUM(oi.sale_price) AS revenue
+FROM {_TABLE.format("order_items")} AS oi
+INNER JOIN {_TABLE.format("orders")} AS o
+    ON oi.order_id = o.order_id
+INNER JOIN {_TABLE.format("products")} AS p
+    ON oi.product_id = p.id
+WHERE DATE(o.created_at) >= DATE_SUB(CURRENT_DATE(), INTERVAL {slots["window"]} {slots["window_unit"]})
+GROUP BY {slots["dimension"]}
+ORDER BY revenue DESC
+LIMIT {slots["limit"]}
+""".strip()
+
+
+def _customer_segments(slots: TemplateSlots) -> str:
+    # The window filters orders in the join, so customers without orders in it still count
+    return f"""
+SELECT
+    {slots["dimension"]},
+    COUNT(DISTINCT u.id) AS customer_count,
+    SUM(oi.sale_price) AS total_revenue
+FROM {_TABLE.format("users")} AS u
+LEFT JOIN {_TABLE.format("orders")} AS o
+    ON u.id = o.user_id
+    AND DATE(o.created_at) >= DATE_SUB(CURRENT_DATE(), INTERVAL {slots["window"]} {slots["window_unit"]})
+LEFT JOIN {_TABLE.format("order_items")} AS oi
+    ON oi.order_id = o.order_id
+GROUP BY {slots["dimension"]}
+ORDER BY customer_count DESC
+LIMIT {slots["limit"]}
+""".strip()
+
+
+def _geo_sales(slots: TemplateSlots) -> str:
+    return f"""
+SELECT
+    {slots["dimension"]},
+    COUNT(o.order_id) AS order_count,
+    SUM(oi.sale_price) AS revenue
+FROM {_TABLE.format("orders")} AS o
+INNER JOIN {_TABLE.format("users")} AS u
+    ON o.user_id = u.id
+INNER JOIN {_TABLE.format("order_items")} AS oi
+    ON oi.order_id = o.order_id
+WHERE DATE(o.created_at) >= DATE_SUB(CURRENT_DATE(), INTERVAL {slots["window"]} {slots["window_unit"]})
+GROUP BY {slots["dimension"]}
+ORDER BY revenue DESC
+LIMIT {slots["limit"]}
+""".strip()
+
+
+# name -> (renderer, chart type, dimension words, default dimension, default limit);
+# a ``None`` limit means the SQL has no LIMIT slot, so "top N" questions are not covered
+_TEMPLATES: Mapping[str, Tuple[Callable[[TemplateSlots], str], ChartType, Mapping[str, str], str, Optional[int]]] = {
+    "product_trend": (_product_trend, ChartType.LINE, _GRAINS, "MONTH", None),
+    "product_breakdown": (_product_breakdown, ChartType.BAR, _PRODUCT_DIMENSIONS, "p.category", 20),
+    "customer_segments": (_customer_segments, ChartType.BAR, _CUSTOMER_DIMENSIONS, "u.country", 20),
+    "geo_sales": (_geo_sales, ChartType.BAR, _GEO_DIMENSIONS, "u.country, u.state", 50),
+}
+
+
+def _template_for(analysis_type: AnalysisType, words: List[str]) -> str:
+    if analysis_type == AnalysisType.GEO_ANALYSIS:
+        return "geo_sales"
+    if analysis_type == AnalysisType.CUSTOMER_SEGMENTATION:
+        return "customer_segments"
+    return "product_breakdown" if any(word in _PRODUCT_DIMENSIONS for word in words) else "product_trend"
+
+
+def match_template(user_query: str, analysis_type: AnalysisType) -> Optional[TemplateMatch]:
+    """Render the template covering ``user_query``, or ``None`` when the LLM is needed.
+
+    A template covers a question when every word is either a slot value
+    (time window, top-N limit, grouping dimension) or vocabulary the template
+    already expresses; one unknown word (a filter value, another metric) is
+    enough to fall back to LLM generation.
+    """
+
+    text = user_query.lower()
+    window, window_unit = 12, "MONTH"
+    window_match = _WINDOW.search(text)
+    if window_match:
+        window = int(window_match.group("count") or 1)
+        window_unit = _UNITS[window_match.group("unit")]
+        text = text[: window_match.start()] + " " + text[window_match.end():]
+
+    limit: Optional[int] = None
+    limit_match = _TOP_N.search(text)
+    if limit_match:
+        limit = min(int(limit_match.group("limit")), SQL_TEMPLATE_MAX_LIMIT)
+        text = text[: limit_match.start()] + " " + text[limit_match.end():]
+    if re.search(r"\d", text):
+        return None
+
+    words = question_words(text)
+    name = _template_for(analysis_type, words)
+    renderer, chart_type, dimensions, default_dimension, default_limit = _TEMPLATES[name]
+    if limit is not None and default_limit is None:
+        return None
+    allowed = _COMMON_WORDS | _TEMPLATE_WORDS[name]
+    if any(word not in allowed for word in words):
+        return None
+
+    chosen = [dimensions[word] for word in words if word in dimensions]
+    if len(set(chosen)) > 1:
+        # Two grouping dimensions ("by gender and country") need a custom query
+        return None
+
+    slots: TemplateSlots = {
+        "window": max(1, window),
+        "window_unit": window_unit,
+        "limit": limit or default_limit or SQL_TEMPLATE_DEFAULT_LIMIT,
+        "dimension": chosen[0] if chosen else default_dimension,
+    }
+    return {"template": name, "sql": renderer(slots), "chart_type": chart_type.value, "slots": slots}
+
+
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def record_routing(hit: bool) -> None:
+    with _STATS_LOCK:
+        _STATS["hits" if hit else "misses"] += 1
+
+
+def routing_stats() -> TemplateRoutingStats:
+    """Template hits and misses since process start."""
+
+    with _STATS_LOCK:
+        hits, misses = _STATS["hits"], _STATS["misses"]
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 3) if total else 0.0}
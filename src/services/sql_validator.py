@@ -0,0 +1,166 @@
+"""Local SQL checks against the retrieved schema, run before any BigQuery call.
+
+``validate_sql`` catches the mistakes LLM-generated SQL makes most often
+(unbalanced parentheses, hallucinated tables, misspelled or misplaced columns)
+in well under a millisecond, so they can be sent back for regeneration without
+paying for a dry run or a failed job. It is deliberately conservative: names
+it cannot resolve with certainty (CTE columns, struct fields, implicit
+aliases) are accepted and left to BigQuery.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Set
+
+from ..models.sql_generation_types import SchemaInfo
+from .sql_normalizer import (
+    IDENT,
+    KEYWORD,
+    NUMBER,
+    OP,
+    QUOTED_IDENT,
+    STRING,
+    SQLToken,
+    find_table_aliases,
+    parse_table_reference,
+    tokenize_sql,
+)
+
+
+# Identifiers BigQuery accepts without a table: date parts, cast types, pseudo-columns
+_NON_COLUMN_WORDS = frozenset(
+    """
+    microsecond millisecond second minute hour day dayofweek dayofyear week isoweek month quarter year isoyear
+    sunday monday tuesday wednesday thursday friday saturday
+    date datetime time timestamp int64 float64 numeric bignumeric bool string bytes json geography interval
+    current_date current_datetime current_time current_timestamp percent system nulls ignore respect
+    """.split()
+)
+
+_OPEN = SQLToken(OP, "(")
+_CLOSE = SQLToken(OP, ")")
+_DOT = SQLToken(OP, ".")
+_AS = SQLToken(KEYWORD, "AS")
+
+
+def validate_sql(sql: str, schema_info: Optional[SchemaInfo]) -> List[str]:
+    """Return problems found in ``sql``; an empty list means it looks runnable.
+
+    Without schema tables only the statement shape is checked.
+    """
+
+    tokens = tokenize_sql(sql)
+    if not tokens or tokens[0] not in {SQLToken(KEYWORD, "SELECT"), SQLToken(KEYWORD, "WITH"), _OPEN}:
+        return ["Statement must start with SELECT or WITH"]
+
+    errors = _check_parentheses(tokens)
+    tables = (schema_info or {}).get("tables") or {}
+    if errors or not tables:
+        return errors
+
+    columns_by_table = {
+        name.lower(): {column.lower() for column in schema.get("columns", {})} for name, schema in tables.items()
+    }
+    cte_names = _cte_names(tokens)
+    table_paths = _table_paths(tokens)
+
+    referenced: Set[str] = set()
+    for path in dict.fromkeys(table_paths.values()):
+        name = path.rsplit(".", 1)[-1].lower()
+        if "." not in path and name in cte_names:
+            continue
+        if name not in columns_by_table:
+            errors.append(f"Unknown table {path}; available tables: {', '.join(sorted(tables))}")
+        else:
+            referenced.add(name)
+    if errors:
+        return errors
+
+    # Qualifiers that resolve to a schema table: aliases and bare table names
+    qualifiers: Dict[str, str] = {name: name for name in referenced}
+    for alias, (path, _) in find_table_aliases(tokens).items():
+        name = path.rsplit(".", 1)[-1].lower()
+        if name in referenced:
+            qualifiers[alias] = name
+        else:
+            qualifiers.pop(alias, None)
+
+    defined = _defined_names(tokens) | set(qualifiers) | cte_names
+    known_columns = set().union(*(columns_by_table[name] for name in referenced)) if referenced else set()
+
+    for index, (kind, value) in enumerate(tokens):
+        if kind != IDENT or index in table_paths:
+            continue
+        name = value.lower()
+        previous = tokens[index - 1] if index else None
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+
+        if following == _OPEN or previous == _DOT:
+            continue
+        if following == _DOT:
+            column = tokens[index + 2] if index + 2 < len(tokens) else None
+            table = qualifiers.get(name)
+            if table and column is not None and column.kind == IDENT and column.value.lower() not in columns_by_table[table]:
+                errors.append(f"Unknown column {value}.{column.value}: table {table} has no column {column.value}")
+            continue
+        if name in defined or name in _NON_COLUMN_WORDS or name in known_columns or _is_implicit_alias(previous):
+            continue
+        errors.append(f"Unrecognized name: {value}")
+
+    return list(dict.fromkeys(errors))
+
+
+def _check_parentheses(tokens: List[SQLToken]) -> List[str]:
+    depth = 0
+    for token in tokens:
+        if token == _OPEN:
+            depth += 1
+        elif token == _CLOSE:
+            depth -= 1
+            if depth < 0:
+                return ['Unexpected ")"']
+    return ["Unclosed parenthesis"] if depth else []
+
+
+def _table_paths(tokens: List[SQLToken]) -> Dict[int, str]:
+    # Token index -> table path for every token of a FROM/JOIN table reference
+    positions: Dict[int, str] = {}
+    for index, token in enumerate(tokens):
+        if token.kind != KEYWORD or token.value not in {"FROM", "JOIN"}:
+            continue
+        reference = parse_table_reference(tokens, index + 1)
+        if reference is None:
+            continue
+        path, next_index = reference
+        if next_index < len(tokens) and tokens[next_index] == _CLOSE:
+            # EXTRACT(part FROM column), not a table
+            continue
+        positions.update(dict.fromkeys(range(index + 1, next_index), path))
+    return positions
+
+
+def _cte_names(tokens: List[SQLToken]) -> Set[str]:
+    # WITH name AS (...), name AS (...)
+    return {
+        tokens[index].value.lower()
+        for index in range(len(tokens) - 2)
+        if tokens[index].kind == IDENT and tokens[index + 1] == _AS and tokens[index + 2] == _OPEN
+    }
+
+
+def _defined_names(tokens: List[SQLToken]) -> Set[str]:
+    # Column, table and window aliases, with or without AS
+    names: Set[str] = set()
+    for index in range(1, len(tokens)):
+        kind, value = tokens[index]
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+        if kind not in {IDENT, QUOTED_IDENT} or following in {_OPEN, _DOT}:
+            continue
+        if tokens[index - 1] == _AS or _is_implicit_alias(tokens[index - 1]):
+            names.add(value.strip("`").lower())
+    return names
+
+
+def _is_implicit_alias(previous: Optional[SQLToken]) -> bool:
+    # "SUM(x) revenue" / "u.country country": an identifier right after a value names it
+    return previous is not None and (previous == _CLOSE or previous.kind in {IDENT, QUOTED_IDENT, NUMBER, STRING})
@@ -0,0 +1,283 @@
+"""Inverted index over dataset tables for choosing the tables a question needs."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Set
+
+from ..config import get_settings
+from ..constants import ANALYSIS_SCHEMA_TERMS, DEFAULT_DATASET_ID, TABLE_INDEX_MIN_GAIN
+from ..models.sql_generation_types import TableSchema
+from .terms import STOPWORDS, words
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Where a word is found in a table's metadata, and how strongly it indicates the table
+_NAME_WEIGHT = 3.0
+_COLUMN_WEIGHT = 1.0
+_DESCRIPTION_WEIGHT = 0.5
+
+# Question words that name no column but imply one (the word itself is dropped:
+# "last quarter" is about created_at, not last_name)
+_SYNONYMS: Mapping[str, tuple] = {
+    "revenue": ("sale", "price"), "sell": ("sale",), "sold": ("sale",), "spend": ("sale", "price"),
+    "spending": ("sale", "price"), "customer": ("user",), "buyer": ("user",), "shopper": ("user",),
+    "client": ("user",), "purchase": ("order",), "bought": ("order", "sale"), "female": ("gender",),
+    "male": ("gender",), "women": ("gender",), "men": ("gender",), "region": ("state",), "regional": ("state",),
+    "location": ("country", "state", "city"), "geographic": ("country", "state", "city"), "margin": ("cost",),
+    "profit": ("cost", "sale"), "daily": ("created",), "weekly": ("created",), "monthly": ("created",),
+    "quarterly": ("created",), "yearly": ("created",), "trend": ("created",), "last": ("created",),
+    "past": ("created",), "recent": ("created",), "since": ("created",),
+}
+
+
+def _words(text: str) -> List[str]:
+    return words(text, STOPWORDS)
+
+
+def _singular(name: str) -> str:
+    return name[:-1] if name.endswith("s") else name
+
+
+class TableIndex:
+    """Postings ``term -> {table: weight}`` built from table and column names and descriptions.
+
+    ``select_tables`` picks a small set of tables that covers a question: the
+    best-scoring table first, then only tables that add coverage for terms the
+    selection does not match yet, then any tables needed to join the selection
+    together (via shared ``*_id`` columns or ``<table>_id`` foreign keys). The
+    index is stored as JSON with its postings and join graph precomputed, so
+    loading it costs a file read.
+    """
+
+    def __init__(
+        self,
+        postings: Dict[str, Dict[str, float]],
+        joins: Dict[str, List[str]],
+        *,
+        dataset_id: str = DEFAULT_DATASET_ID,
+        built_at: float = 0.0,
+    ) -> None:
+        self.dataset_id = dataset_id
+        self.built_at = built_at
+        self._postings = postings
+        self._joins = joins
+        self._idf = {term: math.log(1 + len(joins) / len(tables)) for term, tables in postings.items()}
+
+    @classmethod
+    def build(cls, tables: Mapping[str, TableSchema], *, dataset_id: str = DEFAULT_DATASET_ID) -> "TableIndex":
+        """Index table schemas as returned by ``BigQueryRunner.get_tables_schema``."""
+
+        postings: Dict[str, Dict[str, float]] = {}
+
+        def add(term: str, table: str, weight: float) -> None:
+            table_weights = postings.setdefault(term, {})
+            table_weights[table] = max(weight, table_weights.get(table, 0.0))
+
+        for name, schema in tables.items():
+            for term in _words(name):
+                add(term, name, _NAME_WEIGHT)
+            for column in schema.get("columns", {}):
+                for term in _words(column):
+                    add(term, name, _COLUMN_WEIGHT)
+            description = schema.get("description") or ""
+            if description != f"Table: {name}":
+                for term in _words(description):
+                    add(term, name, _DESCRIPTION_WEIGHT)
+
+        joins: Dict[str, List[str]] = {name: [] for name in tables}
+        keys = {
+            name: {column for column in schema.get("columns", {}) if column.endswith("_id")}
+            for name, schema in tables.items()
+        }
+        for left in tables:
+            for right in tables:
+                if left >= right:
+                    continue
+                references = f"{_singular(right)}_id" in keys[left] or f"{_singular(left)}_id" in keys[right]
+                if references or keys[left] & keys[right]:
+                    joins[left].append(right)
+                    joins[right].append(left)
+
+        return cls(postings, joins, dataset_id=dataset_id, built_at=time.time())
+
+    @property
+    def tables(self) -> List[str]:
+        return list(self._joins)
+
+    def score(self, question: str, analysis_type: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Per query term, how well each table matches it (``idf * weight``)."""
+
+        # Words from the question count fully, the analysis type's usual columns half
+        hints = ANALYSIS_SCHEMA_TERMS.get(analysis_type, ())  # type: ignore[call-overload]
+        terms: Dict[str, float] = dict.fromkeys(hints, 0.5)
+        for word in _words(question):
+            for term in _SYNONYMS.get(word, (word,)):
+                terms[term] = 1.0
+        return {
+            term: {table: boost * self._idf[term] * weight for table, weight in self._postings[term].items()}
+            for term, boost in terms.items()
+            if term in self._postings
+        }
+
+    def select_tables(self, question: str, analysis_type: Optional[str] = None, max_tables: int = 4) -> List[str]:
+        """Smallest joinable set of tables covering the question's terms, best match first."""
+
+        term_scores = self.score(question, analysis_type)
+        if not term_scores:
+            return []
+
+        totals: Dict[str, float] = {}
+        for table_scores in term_scores.values():
+            for table, score in table_scores.items():
+                totals[table] = totals.get(table, 0.0) + score
+        ranked = sorted(totals, key=lambda table: (-totals[table], table))
+
+        selected = [ranked[0]]
+        covered = {term: scores.get(ranked[0], 0.0) for term, scores in term_scores.items()}
+        while len(selected) < max_tables:
+            # Coverage a table adds on top of what the selection already matches
+            gains = {
+                table: sum(max(0.0, scores.get(table, 0.0) - covered[term]) for term, scores in term_scores.items())
+                for table in ranked
+                if table not in selected
+            }
+            best = max(gains, key=lambda table: (gains[table], totals[table]), default=None)
+            if best is None or gains[best] < TABLE_INDEX_MIN_GAIN:
+                break
+            selected.append(best)
+            covered = {term: max(covered[term], scores.get(best, 0.0)) for term, scores in term_scores.items()}
+
+        return self._connect(selected, max_tables)
+
+    def _connect(self, selected: List[str], max_tables: int) -> List[str]:
+        # Add the fewest intermediate tables so every selected table can be joined
+        connected = [selected[0]]
+        for target in selected[1:]:
+            path = self._shortest_path(set(connected), target)
+            if path is None:
+                continue
+            extra = [table for table in path if table not in connected]
+            if len(connected) + len(extra) > max_tables:
+                continue
+            connected.extend(extra)
+        return connected
+
+    def _shortest_path(self, sources: Set[str], target: str) -> Optional[List[str]]:
+        if target in sources:
+            return [target]
+        previous: Dict[str, Optional[str]] = {source: None for source in sources}
+        queue = deque(sources)
+        while queue:
+            table = queue.popleft()
+            for neighbour in self._joins.get(table, []):
+                if neighbour in previous:
+                    continue
+                previous[neighbour] = table
+                if neighbour == target:
+                    path = [neighbour]
+                    while previous[path[-1]] is not None and previous[path[-1]] not in sources:
+                        path.append(previous[path[-1]])  # type: ignore[arg-type]
+                    return path[::-1]
+                queue.append(neighbour)
+        return None
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "dataset_id": self.dataset_id,
+                    "built_at": self.built_at,
+                    "postings": self._postings,
+                    "joins": self._joins,
+                }
+            ),
+            encoding="utf-8",
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TableIndex":
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return cls(
+            payload["postings"],
+            payload["joins"],
+            dataset_id=payload["dataset_id"],
+            built_at=float(payload["built_at"]),
+        )
+
+
+class TableIndexStore:
+    """The current ``TableIndex`` for a dataset, loaded from disk and rebuilt from metadata when stale."""
+
+    def __init__(self, *, path: Optional[Path], ttl_sec: float, dataset_id: str = DEFAULT_DATASET_ID) -> None:
+        self._path = path
+        self._ttl_sec = ttl_sec
+        self._dataset_id = dataset_id
+        self._lock = threading.Lock()
+        self._index: Optional[TableIndex] = None
+        if path is not None and path.exists():
+            try:
+                self._index = TableIndex.load(path)
+            except (OSError, ValueError, KeyError) as exc:
+                LOGGER.warning("Ignoring unreadable table index", extra={"path": str(path), "error": str(exc)})
+
+    @property
+    def index(self) -> Optional[TableIndex]:
+        return self._index
+
+    def is_stale(self) -> bool:
+        index = self._index
+        return index is None or index.dataset_id != self._dataset_id or time.time() - index.built_at > self._ttl_sec
+
+    def ensure_fresh(self, fetch_tables: Callable[[], Mapping[str, TableSchema]]) -> Optional[TableIndex]:
+        """Return the index, first rebuilding it from ``fetch_tables()`` when stale.
+
+        Concurrent callers wait for a single rebuild. When the metadata fetch
+        fails the previous index (if any) keeps being served.
+        """
+
+        if not self.is_stale():
+            return self._index
+        with self._lock:
+            if self.is_stale():
+                try:
+                    self.refresh(fetch_tables())
+                except Exception as exc:  # pragma: no cover - network/external dependency
+                    LOGGER.warning("Table index refresh failed", extra={"error": str(exc)})
+        return self._index
+
+    def refresh(self, tables: Mapping[str, TableSchema]) -> TableIndex:
+        """Rebuild the index from freshly fetched metadata for every dataset table."""
+
+        index = TableIndex.build(tables, dataset_id=self._dataset_id)
+        self._index = index
+        if self._path is not None:
+            try:
+                index.save(self._path)
+            except OSError as exc:  # pragma: no cover - filesystem issues
+                LOGGER.warning("Failed to persist table index", extra={"path": str(self._path), "error": str(exc)})
+        LOGGER.info("Table index rebuilt", extra={"tables": len(tables)})
+        return index
+
+
+@lru_cache(maxsize=1)
+def get_table_index_store() -> TableIndexStore:
+    """Return the process-wide table index store configured from settings."""
+
+    settings = get_settings()
+    path: Optional[Path] = None
+    if settings.schema_cache_persist:
+        default_path = Path.cwd() / ".cache" / "table_index.json"
+        path = Path(settings.table_index_path) if settings.table_index_path else default_path
+    return TableIndexStore(path=path, ttl_sec=settings.schema_cache_ttl_sec)
@@ -0,0 +1,28 @@
+"""Word splitting shared by the question matchers (intent, tables, schema context, templates, memo)."""
+
+from __future__ import annotations
+
+import re
+from typing import AbstractSet, List
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Question filler that says nothing about tables, intents or past questions
+STOPWORDS = frozenset("a an the of for to in on by me show what which is are our we and with how many much".split())
+
+
+def fold_plural(word: str) -> str:
+    """Strip a plural "s" ("orders" -> "order"); short words and "ss" endings are kept."""
+
+    return word[:-1] if len(word) > 4 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def words(text: str, stopwords: AbstractSet[str] = frozenset()) -> List[str]:
+    """Lower-cased alphanumeric words of ``text`` with plurals folded, minus ``stopwords``.
+
+    Underscores separate words, so column names split like prose
+    ("sale_price" -> ["sale", "price"]).
+    """
+
+    folded = [fold_plural(word) for word in _WORD.findall(text.lower())]
+    return [word for word in folded if word not in stopwords] if stopwords else folded
@@ -0,0 +1,40 @@
+"""Approximate token counting for prompt budgeting."""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency guard
+    tiktoken = None
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Average characters per token for English/SQL text when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> Optional[Any]:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:  # encoding files are downloaded on first use
+        LOGGER.debug("tiktoken encoding unavailable; using character heuristic", extra={"error": str(exc)})
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of ``text`` (exact with tiktoken, otherwise ~4 chars/token)."""
+
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
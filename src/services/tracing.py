@@ -0,0 +1,269 @@
+"""Nested spans for agent requests, exported as OpenTelemetry (OTLP/JSON) traces.
+
+``trace_request`` opens the root span of one agent run; the node wrapper
+applied by ``build_agent_graph`` and the LLM and BigQuery call sites open
+child spans with ``start_span``. The current span is kept in a context
+variable, which LangGraph copies into the threads and tasks that run nodes,
+so parallel branches nest under the same request. When a root span ends its
+whole trace is appended to ``TRACE_EXPORT_PATH`` as one OTLP ``resourceSpans``
+JSON line, the format read by the OpenTelemetry Collector's ``otlpjsonfile``
+receiver; the file is rotated to ``<path>.1`` once it reaches
+``TRACE_MAX_BYTES``.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ..config import get_settings
+from ..models.columnar import ColumnarData
+
+
+LOGGER = logging.getLogger(__name__)
+
+# OTLP SpanKind and StatusCode values
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+_SERVICE_NAME = "langgraph-data-analysis-agent"
+
+
+@dataclass
+class Span:
+    """One timed operation; ``spans`` is shared by every span of the trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    kind: int
+    spans: List["Span"]
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    error: Optional[BaseException] = None
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+_CURRENT_SPAN: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _CURRENT_SPAN.get()
+
+
+@contextmanager
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Span]:
+    """Time the enclosed block as a child of the current span (or as a new trace).
+
+    Exceptions are recorded on the span and re-raised.
+    """
+
+    parent = _CURRENT_SPAN.get()
+    span = Span(
+        name=name,
+        trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent is not None else None,
+        kind=kind,
+        spans=parent.spans if parent is not None else [],
+        attributes=attributes,
+    )
+    token = _CURRENT_SPAN.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.error = exc
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _CURRENT_SPAN.reset(token)
+        span.spans.append(span)
+        if parent is None:
+            _export(span.spans)
+
+
+def trace_request(question: str) -> Any:
+    """Root span for one agent run; its trace is exported when the block exits."""
+
+    return start_span("agent.request", SPAN_KIND_SERVER, **{"agent.question": question})
+
+
+def traced_node(name: str, node: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a graph node in a span with wall time, CPU time and output state size.
+
+    CPU time is the node thread's; for async nodes it also includes other
+    coroutines that ran on the event loop while the node was suspended.
+    """
+
+    def finish(span: Span, wall_start: float, cpu_start: float, result: Any) -> None:
+        span.set_attributes(
+            **{
+                "agent.node.wall_ms": round((time.perf_counter() - wall_start) * 1000, 3),
+                "agent.node.cpu_ms": round((time.thread_time() - cpu_start) * 1000, 3),
+                "agent.state.keys": len(result) if isinstance(result, dict) else 0,
+                "agent.state.bytes": approximate_size(result),
+            }
+        )
+
+    if inspect.iscoroutinefunction(node):
+
+        @functools.wraps(node)
+        async def async_wrapper(state: Any) -> Any:
+            with start_span(f"node.{name}", **{"agent.node": name}) as span:
+                wall_start, cpu_start = time.perf_counter(), time.thread_time()
+                result = await node(state)
+                finish(span, wall_start, cpu_start, result)
+                return result
+
+        return async_wrapper
+
+    @functools.wraps(node)
+    def wrapper(state: Any) -> Any:
+        with start_span(f"node.{name}", **{"agent.node": name}) as span:
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+            result = node(state)
+            finish(span, wall_start, cpu_start, result)
+            return result
+
+    return wrapper
+
+
+def approximate_size(value: Any, depth: int = 0) -> int:
+    """Rough in-memory size of agent state in bytes, without serializing it."""
+
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, ColumnarData):
+        return sum(int(getattr(array, "nbytes", 0)) for array in value.arrays.values())
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if depth >= 4:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sum(len(str(key)) + approximate_size(item, depth + 1) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(approximate_size(item, depth + 1) for item in value)
+    return sys.getsizeof(value)
+
+
+class OTLPJsonFileExporter:
+    """Append each finished trace to a file as one OTLP/JSON ``resourceSpans`` line.
+
+    A line that would grow the file past ``max_bytes`` first moves the file to
+    ``<path>.1`` (replacing the previous one), so at most two files are kept.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 0) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(_to_otlp(spans), default=str) + "\n"
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            if self._max_bytes > 0 and self._path.exists():
+                if self._path.stat().st_size + len(line.encode("utf-8")) > self._max_bytes:
+                    self._path.replace(self._path.with_name(self._path.name + ".1"))
+            with self._path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+
+
+@lru_cache(maxsize=1)
+def get_span_exporter() -> Optional[OTLPJsonFileExporter]:
+    """Return the process-wide trace exporter, or ``None`` when tracing is disabled."""
+
+    settings = get_settings()
+    if not settings.tracing_enabled:
+        return None
+    path = Path(settings.trace_export_path) if settings.trace_export_path else Path.cwd() / ".cache" / "traces.jsonl"
+    return OTLPJsonFileExporter(path, max_bytes=settings.trace_max_bytes)
+
+
+def _export(spans: List[Span]) -> None:
+    exporter = get_span_exporter()
+    if exporter is None:
+        return
+    try:
+        exporter.export(spans)
+    except OSError as exc:  # pragma: no cover - filesystem issues
+        LOGGER.warning("Failed to export trace", extra={"error": str(exc)})
+
+
+def _to_otlp(spans: List[Span]) -> Dict[str, Any]:
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _attributes({"service.name": _SERVICE_NAME})},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": [_span_to_otlp(span) for span in spans]}],
+            }
+        ]
+    }
+
+
+def _span_to_otlp(span: Span) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        # OTLP/JSON encodes 64-bit integers as strings
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _attributes(span.attributes),
+        "status": {"code": _STATUS_OK},
+    }
+    if span.parent_id is not None:
+        payload["parentSpanId"] = span.parent_id
+    if span.error is not None:
+        payload["status"] = {"code": _STATUS_ERROR, "message": str(span.error)}
+        payload["events"] = [
+            {
+                "name": "exception",
+                "timeUnixNano": str(span.end_ns),
+                "attributes": _attributes(
+                    {
+                        "exception.type": type(span.error).__name__,
+                        "exception.message": str(span.error),
+                        "exception.stacktrace": "".join(traceback.format_exception(span.error)),
+                    }
+                ),
+            }
+        ]
+    return payload
+
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _attribute_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
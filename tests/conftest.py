@@ -0,0 +1,25 @@
+import pytest
+
+from src.config import get_settings
+from src.services.llm_cache import get_llm_cache
+from src.services.schema_cache import get_schema_cache
+from src.services.sql_memo import get_sql_memo
+from src.services.table_index import get_table_index_store
+from src.services.tracing import get_span_exporter
+
+_FACTORIES = (get_settings, get_llm_cache, get_schema_cache, get_sql_memo, get_table_index_store, get_span_exporter)
+
+
+@pytest.fixture(autouse=True)
+def _no_shared_disk_state(monkeypatch, tmp_path):
+    """Keep tests from reading or writing the on-disk caches, SQL memo, table index and traces."""
+
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setenv("SQL_MEMO_ENABLED", "false")
+    monkeypatch.setenv("SCHEMA_CACHE_PERSIST", "false")
+    monkeypatch.setenv("TRACE_EXPORT_PATH", str(tmp_path / "traces.jsonl"))
+    for factory in _FACTORIES:
+        factory.cache_clear()
+    yield
+    for factory in _FACTORIES:
+        factory.cache_clear()
@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+from src.services.batch_runner import completed_ids, load_questions, run_batch
+from src.services.tracing import traced_node
+
+
+class FakeAgent:
+    def __init__(self) -> None:
+        self.questions = []
+
+    async def astream(self, state, stream_mode="updates"):
+        self.questions.append(state["user_query"])
+        if state["user_query"] == "boom":
+            raise RuntimeError("LLM timeout")
+        yield {"reasoning": traced_node("reasoning", lambda state: {**state, "analysis_type": "product_trends"})(state)}
+        execute = traced_node(
+            "execution",
+            lambda state: {**state, "sql_query": "SELECT 1", "validation_passed": True, "metrics": {"rows_returned": 1}},
+        )
+        yield {"execution": execute(state)}
+
+
+def test_load_questions_reads_csv_and_defaults_ids(tmp_path):
+    path = tmp_path / "questions.csv"
+    path.write_text("id,question\nq1,Revenue by month\n,Top countries\n", encoding="utf-8")
+
+    assert load_questions(path) == [
+        {"id": "q1", "question": "Revenue by month"},
+        {"id": "2", "question": "Top countries"},
+    ]
+
+
+def test_run_batch_streams_results_and_resumes(tmp_path):
+    output = tmp_path / "results.jsonl"
+    output.write_text('{"id": "a", "status": "ok"}\n{"id": "b", "sta', encoding="utf-8")
+    questions = [
+        {"id": "a", "question": "already done"},
+        {"id": "b", "question": "Revenue by month"},
+        {"id": "c", "question": "boom"},
+    ]
+    agent = FakeAgent()
+
+    summary = asyncio.run(run_batch(agent, questions, output, concurrency=2))
+
+    assert sorted(agent.questions) == ["Revenue by month", "boom"]
+    assert summary["completed"] == 1 and summary["failed"] == 1 and summary["skipped"] == 1
+    assert summary["node_latency"]["execution"]["count"] == 1
+    records = {record["id"]: record for record in map(json.loads, output.read_text().splitlines()[2:])}
+    assert records["b"]["sql"] == "SELECT 1"
+    assert set(records["b"]["node_ms"]) == {"reasoning", "execution"}
+    assert records["c"]["status"] == "error"
+    # Errored questions are retried on the next run
+    assert completed_ids(output) == {"a", "b"}
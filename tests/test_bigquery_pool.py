@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.services.bigquery_pool import BigQueryClientPool
+
+
+class DummyClient:
+    def __init__(self, project, location) -> None:
+        self.project = project
+        self.location = location
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_pool_reuses_clients_per_project_and_location():
+    pool = BigQueryClientPool(client_factory=DummyClient)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: pool.acquire("proj", "US"), range(20)))
+    other = pool.acquire("proj", "EU")
+
+    assert len({id(client) for client in clients}) == 1
+    assert other is not clients[0]
+    assert pool.stats() == {"live_clients": 2, "created": 2, "reuse_count": 19}
+
+
+def test_pool_shutdown_closes_clients():
+    pool = BigQueryClientPool(client_factory=DummyClient)
+    client = pool.acquire("proj", None)
+
+    pool.shutdown()
+
+    assert client.closed is True
+    assert pool.stats()["live_clients"] == 0
+
+
+class DummyReadClient:
+    def __init__(self, client) -> None:
+        self.client = client
+        self.transport = self
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_pool_shares_and_closes_read_clients():
+    pool = BigQueryClientPool(client_factory=DummyClient, read_client_factory=DummyReadClient)
+    client = pool.acquire("proj", None)
+
+    read_client = pool.acquire_read_client(client)
+    assert pool.acquire_read_client(client) is read_client
+    assert read_client.client is client
+
+    pool.shutdown()
+
+    assert read_client.closed is True
@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pyarrow as pa
+
+from src.services.bigquery_runner import BigQueryRunner
+
+
+class DummyField:
+    def __init__(self, name: str, field_type: str) -> None:
+        self.name = name
+        self.field_type = field_type
+
+
+class DummyTable:
+    schema = [DummyField("id", "INTEGER"), DummyField("country", "STRING")]
+    num_rows = 5
+    description = ""
+    modified = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class DummyJob:
+    def __init__(self, rows) -> None:
+        self._rows = rows
+
+    def result(self):
+        return self._rows
+
+
+class DummyClient:
+    def __init__(self, rows=None, fail_query: bool = False) -> None:
+        self._rows = rows or []
+        self._fail_query = fail_query
+        self.queries = 0
+        self.tables_fetched = []
+
+    def query(self, sql, job_config=None, location=None):
+        self.queries += 1
+        if self._fail_query:
+            raise RuntimeError("Access Denied: INFORMATION_SCHEMA")
+        return DummyJob(self._rows)
+
+    def get_table(self, table_ref):
+        self.tables_fetched.append(table_ref)
+        return DummyTable()
+
+
+def test_get_tables_schema_uses_single_query():
+    rows = [
+        {"table_name": "users", "column_name": "id", "data_type": "INT64", "row_count": 5,
+         "last_modified_time": 1_700_000_000_000, "description": '"Registered users"'},
+        {"table_name": "users", "column_name": "country", "data_type": "STRING", "row_count": 5,
+         "last_modified_time": 1_700_000_000_000, "description": '"Registered users"'},
+        {"table_name": "orders", "column_name": "order_id", "data_type": "INT64", "row_count": 9,
+         "last_modified_time": None, "description": None},
+    ]
+    client = DummyClient(rows)
+
+    tables = BigQueryRunner(client=client).get_tables_schema(["users", "orders"])
+
+    assert client.queries == 1
+    assert tables["users"]["columns"] == {"id": "INT64", "country": "STRING"}
+    assert tables["users"]["description"] == "Registered users"
+    assert tables["users"]["last_modified"] == 1_700_000_000.0
+    assert tables["orders"]["description"] == "Table: orders"
+
+
+def test_get_tables_schema_falls_back_to_concurrent_get_table():
+    client = DummyClient(fail_query=True)
+
+    tables = BigQueryRunner(client=client).get_tables_schema(["users", "orders"])
+
+    assert sorted(tables) == ["orders", "users"]
+    assert len(client.tables_fetched) == 2
+    assert tables["users"]["columns"]["country"] == "STRING"
+
+
+class PagedRowIterator:
+    def __init__(self, batches) -> None:
+        self._batches = batches
+
+    def to_arrow_iterable(self, bqstorage_client=None):
+        yield from self._batches
+
+
+class PagedJob:
+    def __init__(self, batches) -> None:
+        self._batches = batches
+
+    def result(self, page_size=None):
+        return PagedRowIterator(self._batches)
+
+
+class PagedClient(DummyClient):
+    def __init__(self, batches) -> None:
+        super().__init__()
+        self._batches = batches
+
+    def query(self, sql, job_config=None, location=None):
+        return PagedJob(self._batches)
+
+
+def test_execute_query_arrow_stops_at_max_rows():
+    batches = [pa.record_batch({"value": list(range(start, start + 3))}) for start in (0, 3, 6)]
+    runner = BigQueryRunner(client=PagedClient(batches))
+
+    table, stats = runner.execute_query_arrow("SELECT value FROM t", max_rows=5)
+
+    assert table.column("value").to_pylist() == [0, 1, 2, 3, 4]
+    assert stats["pages"] == 2
+    assert stats["truncated"] is True
+    assert len(stats["page_ms"]) == 2
+
+
+def test_execute_query_arrow_async_polls_until_done(monkeypatch):
+    class PollingJob(PagedJob):
+        polls = 0
+
+        def done(self):
+            PollingJob.polls += 1
+            return PollingJob.polls >= 3
+
+    class PollingClient(PagedClient):
+        def query(self, sql, job_config=None, location=None):
+            return PollingJob(self._batches)
+
+    monkeypatch.setattr("src.services.bigquery_runner.BIGQUERY_POLL_INITIAL_SEC", 0.001)
+    batches = [pa.record_batch({"value": [1, 2]})]
+    runner = BigQueryRunner(client=PollingClient(batches))
+
+    table, stats = asyncio.run(runner.execute_query_arrow_async("SELECT value FROM t"))
+
+    assert PollingJob.polls == 3
+    assert table.num_rows == 2
+    assert stats["truncated"] is False
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from src.constants import ChartType
+from src.services.chart_downsampling import OTHER_BUCKET_LABEL, downsample_for_chart, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_spike():
+    y = np.zeros(1000)
+    y[537] = 50.0
+    indices = lttb_indices(np.arange(1000, dtype=float), y, 20)
+
+    assert len(indices) == 20
+    assert indices[0] == 0 and indices[-1] == 999
+    assert 537 in indices
+
+
+def test_small_frames_are_untouched():
+    df = pd.DataFrame({"x": [1, 2], "y": [3, 4]})
+
+    result, downsampled = downsample_for_chart(ChartType.LINE, df, ["x", "y"], 100)
+
+    assert downsampled is False
+    assert result is df
+
+
+def test_bar_chart_folds_tail_into_other_bucket():
+    df = pd.DataFrame({"product": [f"p{i}" for i in range(50)], "revenue": np.arange(50, dtype=float)})
+
+    result, downsampled = downsample_for_chart(ChartType.BAR, df, ["product", "revenue"], 10)
+
+    assert downsampled is True
+    assert len(result) == 10
+    assert result["product"].iloc[0] == "p49"
+    assert result["product"].iloc[-1] == OTHER_BUCKET_LABEL
+    assert result["revenue"].sum() == df["revenue"].sum()
+
+
+def test_scatter_is_grid_binned_within_budget():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"price": rng.random(5000), "quantity": rng.random(5000)})
+
+    result, downsampled = downsample_for_chart(ChartType.SCATTER, df, ["price", "quantity"], 400)
+
+    assert downsampled is True
+    assert len(result) <= 400
+    assert result["points"].sum() == 5000
+
+
+def test_bar_chart_averages_non_additive_measures_without_other_bucket():
+    df = pd.DataFrame({"product": [f"p{i % 20}" for i in range(40)], "avg_price": np.arange(40, dtype=float)})
+
+    result, _ = downsample_for_chart(ChartType.BAR, df, ["product", "avg_price"], 5)
+
+    assert len(result) == 5
+    assert OTHER_BUCKET_LABEL not in result["product"].tolist()
+    assert result.iloc[0].tolist() == ["p19", 29.0]
+
+
+def test_scatter_drops_missing_points_and_budgets_colours():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "price": rng.random(5000),
+            "quantity": rng.random(5000),
+            "segment": rng.choice(list("abcd"), 5000),
+        }
+    )
+    df.loc[:99, "price"] = np.nan
+
+    result, _ = downsample_for_chart(ChartType.SCATTER, df, ["price", "quantity", "segment"], 400)
+
+    assert len(result) <= 400
+    assert result["points"].sum() == 4900
+    assert result["price"].notna().all()
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+from src.config import get_settings
+from src.services import chart_renderer
+from src.services.chart_renderer import ChartRenderer, ensure_chart_image
+
+
+class StubRenderer(ChartRenderer):
+    """Skips Chrome; renders block until ``release`` is set."""
+
+    def __init__(self):
+        super().__init__(workers=2)
+        self.release = threading.Event()
+        self.release.set()
+
+    async def _open_browser(self):
+        self._browser = object()
+
+    async def _close_browser(self):
+        self._browser = None
+
+    async def _render_png(self, figure):
+        while not self.release.is_set():
+            await asyncio.sleep(0.01)
+        return b"\x89PNG" + str(figure["data"]).encode()
+
+
+def test_background_render_writes_file_atomically(tmp_path):
+    renderer = StubRenderer()
+    renderer.release.clear()
+    target = tmp_path / "chart.png"
+
+    future = renderer.submit('{"data": [1, 2]}', target)
+    assert not target.exists()
+    assert renderer.stats()["pending"] == 1
+
+    renderer.release.set()
+    assert renderer.wait(str(target), timeout=5) == str(target)
+    assert future.result() == str(target)
+    assert target.read_bytes().startswith(b"\x89PNG")
+    assert renderer.stats()["rendered"] == 1
+    renderer.shutdown()
+
+
+def test_ensure_chart_image_renders_on_demand(monkeypatch, tmp_path):
+    monkeypatch.setenv("CHART_IMAGE_MODE", "on_demand")
+    monkeypatch.setenv("PLOT_OUTPUT_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    renderer = StubRenderer()
+    monkeypatch.setattr(chart_renderer, "get_chart_renderer", lambda: renderer)
+    state = {"analysis_type": "geo_analysis", "chart_json": '{"data": []}'}
+
+    try:
+        path = ensure_chart_image(state, timeout=5)
+    finally:
+        get_settings.cache_clear()
+        renderer.shutdown()
+
+    assert path is not None and path.startswith(str(tmp_path / "geo_analysis_"))
+    assert state["chart_image_path"] == path
+
+
+def test_ensure_chart_image_waits_for_pending_export(monkeypatch, tmp_path):
+    renderer = StubRenderer()
+    monkeypatch.setattr(chart_renderer, "get_chart_renderer", lambda: renderer)
+    target = tmp_path / "pending.png"
+    renderer.submit('{"data": []}', target)
+    state = {"chart_json": '{"data": []}', "chart_image_pending": str(target)}
+
+    assert ensure_chart_image(state, timeout=5) == str(target)
+    assert "chart_image_pending" not in state
+    renderer.shutdown()
+
+
+def test_failed_start_is_reset_and_retried(tmp_path):
+    class FlakyRenderer(StubRenderer):
+        attempts = 0
+
+        async def _open_browser(self):
+            FlakyRenderer.attempts += 1
+            if FlakyRenderer.attempts == 1:
+                raise RuntimeError("Chrome not found")
+            await super()._open_browser()
+
+    renderer = FlakyRenderer()
+
+    assert renderer.start() is False
+    assert renderer.stats()["started"] is False
+    assert renderer.render('{"data": [1]}', tmp_path / "chart.png", timeout=5) == str(tmp_path / "chart.png")
+    assert FlakyRenderer.attempts == 2
+    renderer.shutdown()
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from src.models.columnar import ColumnarData
+
+
+def test_columnar_data_shares_frame_buffers():
+    df = pd.DataFrame({"month": ["2024-01", "2024-02"], "revenue": [10.0, 12.5]})
+
+    data = ColumnarData.from_frame(df)
+
+    assert data.shape == (2, 2)
+    assert data.to_frame() is df
+    assert np.shares_memory(data.column("revenue"), df["revenue"].to_numpy())
+
+
+def test_columnar_data_exposes_lazy_records_view():
+    data = ColumnarData({"country": np.array(["DE", "US", "FR"]), "orders": np.array([3, 5, 1])})
+
+    assert len(data) == 3
+    assert data[:2] == [{"country": "DE", "orders": 3}, {"country": "US", "orders": 5}]
+    assert data[-1]["country"] == "FR"
+    assert [row["orders"] for row in data] == [3, 5, 1]
+    assert ColumnarData.coerce([{"a": 1}]).columns == ["a"]
@@ -1,6 +1,10 @@
 import pandas as pd
+import pyarrow as pa
 
+from src.config import get_settings
+from src.graph import _route_after_execution
 from src.nodes.execution import execution_node
+from src.services.result_cache import QueryResultCache
 
 
 class DummyRunner:
@@ -15,6 +19,10 @@ class DummyRunner:
             }
         )
 
+    def execute_query_arrow(self, sql_query: str, maximum_bytes_billed=None, max_rows=None):
+        table = pa.Table.from_pandas(self.execute_query(sql_query), preserve_index=False)
+        return table, {"pages": 1, "rows": table.num_rows, "page_ms": [3], "truncated": False}
+
 
 def test_execution_node_collects_metrics(monkeypatch):
     monkeypatch.setattr("src.nodes.execution.BigQueryRunner", DummyRunner)
@@ -26,4 +34,62 @@ def test_execution_node_collects_metrics(monkeypatch):
     assert result["metrics"]["rows_returned"] == 2
     assert result["metrics"]["data_completeness"] == 1.0
     assert result["bq_results"]["columns"] == ["month", "revenue"]
+    assert result["metrics"]["fetch_pages"] == 1
+    assert result["result_profile"]["row_count"] == 2
+
+
+
+def test_execution_node_serves_repeated_sql_from_cache(monkeypatch):
+    calls = []
+
+    class CountingRunner(DummyRunner):
+        def execute_query_arrow(self, sql_query: str, maximum_bytes_billed=None, max_rows=None):
+            calls.append(sql_query)
+            return super().execute_query_arrow(sql_query, maximum_bytes_billed, max_rows)
+
+    cache = QueryResultCache(ttl_sec=60, max_bytes=1_000_000)
+    monkeypatch.setattr("src.nodes.execution.BigQueryRunner", CountingRunner)
+    monkeypatch.setattr("src.nodes.execution.get_result_cache", lambda: cache)
+
+    first = execution_node({"sql_query": "SELECT month, revenue FROM t", "metrics": {}})
+    second = execution_node({"sql_query": "SELECT month, revenue FROM t", "metrics": {}})
+
+    assert len(calls) == 1
+    assert first["metrics"]["cache_hit"] is False
+    assert second["metrics"]["cache_hit"] is True
+    assert second["metrics"]["rows_returned"] == 2
+
+
+def test_failed_execution_retries_until_attempts_run_out(monkeypatch):
+    class FailingRunner(DummyRunner):
+        def execute_query_arrow(self, sql_query: str, maximum_bytes_billed=None, max_rows=None):
+            raise RuntimeError("Name region not found inside o")
+
+    monkeypatch.setattr("src.nodes.execution.BigQueryRunner", FailingRunner)
+    monkeypatch.setattr("src.nodes.execution.get_result_cache", lambda: None)
+
+    first = execution_node({"sql_query": "SELECT o.region FROM t AS o", "metrics": {}})
+    assert first["execution_retry"] is True
+    assert first["sql_generation_attempt"] == 2
+    assert first["metrics"]["attempt_timings"][0]["outcome"] == "execution_failed"
+    assert _route_after_execution(first) == "sql_generation"
+
+    last = execution_node({"sql_query": "SELECT o.region FROM t AS o", "sql_generation_attempt": 3, "metrics": {}})
+    assert last["execution_retry"] is False
+    assert _route_after_execution(last) == "error_end"
+
+
+def test_template_mode_does_not_retry_failed_execution(monkeypatch):
+    class FailingRunner(DummyRunner):
+        def execute_query_arrow(self, sql_query: str, maximum_bytes_billed=None, max_rows=None):
+            raise RuntimeError("Job failed")
+
+    monkeypatch.setenv("SQL_ROUTING_MODE", "template")
+    get_settings.cache_clear()
+    monkeypatch.setattr("src.nodes.execution.BigQueryRunner", FailingRunner)
+    monkeypatch.setattr("src.nodes.execution.get_result_cache", lambda: None)
+
+    result = execution_node({"sql_query": "SELECT 1", "metrics": {}})
 
+    assert result["execution_retry"] is False
+    assert _route_after_execution(result) == "error_end"
@@ -1,4 +1,8 @@
-from src.graph import build_agent_graph, compile_agent
+import inspect
+
+from src.config import get_settings
+from src.graph import build_agent_graph, compile_agent, compile_async_agent
+from src.nodes import reasoning_node
 
 
 def test_graph_compiles():
@@ -11,3 +15,47 @@ def test_compile_agent_returns_callable():
     agent = compile_agent()
     assert hasattr(agent, "invoke")
 
+
+
+def test_compile_async_agent_uses_coroutine_nodes():
+    graph = build_agent_graph(async_nodes=True)
+
+    assert all(inspect.iscoroutinefunction(spec.runnable.afunc) for spec in graph.nodes.values())
+    assert hasattr(compile_async_agent(), "ainvoke")
+
+
+def test_nodes_are_traced():
+    graph = build_agent_graph()
+
+    assert graph.nodes["reasoning"].runnable.func.__wrapped__ is reasoning_node
+
+
+def test_failed_regeneration_after_execution_error_ends_the_run(monkeypatch):
+    from src.nodes import sql_generation
+    from src.services.bigquery_runner import BigQueryRunner
+
+    monkeypatch.setenv("BIGQUERY_BACKEND", "fake")
+    monkeypatch.setenv("DEFAULT_LLM_PROVIDER", "fake")
+    monkeypatch.setenv("SQL_ROUTING_MODE", "llm")
+    get_settings.cache_clear()
+    model_for_attempt = sql_generation._model_for_attempt
+
+    def flaky_model(state):
+        if state.get("sql_generation_attempt", 1) > 1:
+            raise RuntimeError("LLM unavailable")
+        return model_for_attempt(state)
+
+    def failing_query(self, sql_query):
+        raise RuntimeError("Job failed")
+
+    monkeypatch.setattr(sql_generation, "_model_for_attempt", flaky_model)
+    monkeypatch.setattr(BigQueryRunner, "execute_query_arrow", failing_query)
+
+    result = compile_agent().invoke(
+        {"user_query": "Revenue by month", "metrics": {}, "validation_passed": False},
+        {"recursion_limit": 50},
+    )
+
+    assert result["validation_passed"] is False
+    assert result["execution_retry"] is False
+    assert result["error_message"] == "SQL query not set"
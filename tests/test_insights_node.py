@@ -0,0 +1,34 @@
+from langchain_core.messages import AIMessage
+
+from src.nodes import insights_node
+
+
+def _run(monkeypatch, preflight):
+    prompts = []
+
+    class ChatModel:
+        def invoke(self, messages):
+            prompts.append(messages[-1].content)
+            return AIMessage(content="Revenue grew.")
+
+    monkeypatch.setattr("src.nodes.insights.get_chat_model", lambda *args, **kwargs: ChatModel())
+    state = {
+        "bq_results": {"data": [{"country": "US", "revenue": 10.0}, {"country": "DE", "revenue": 4.0}]},
+        "preflight": preflight,
+        "metrics": {},
+    }
+    result = insights_node(state)
+    return prompts[0], result
+
+
+def test_insights_prompt_flags_sampled_results(monkeypatch):
+    prompt, result = _run(monkeypatch, {"route": "sample", "sample_percent": 5})
+
+    assert "5% TABLESAMPLE" in prompt
+    assert result["insights"] == "Revenue grew."
+
+
+def test_insights_prompt_marks_full_scans(monkeypatch):
+    prompt, _ = _run(monkeypatch, {"route": "execute"})
+
+    assert "data scope: full data" in prompt
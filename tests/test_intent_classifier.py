@@ -0,0 +1,48 @@
+import json
+
+from src.constants import AnalysisType
+from src.services.intent_classifier import (
+    SEED_EXAMPLES,
+    IntentClassifier,
+    IntentModel,
+    load_labelled_queries,
+)
+
+
+def test_keywords_decide_unambiguous_queries():
+    classifier = IntentClassifier(IntentModel.train(SEED_EXAMPLES), threshold=0.7)
+
+    decision = classifier.classify("Monthly revenue trend per product category")
+
+    assert decision["analysis_type"] == "product_trends"
+    assert decision["method"] == "keywords"
+    assert "trend" in decision["evidence"]
+
+
+def test_conflicting_keywords_defer_to_llm():
+    classifier = IntentClassifier(IntentModel.train(SEED_EXAMPLES), threshold=0.95)
+
+    decision = classifier.classify("Customer trends by country")
+
+    assert decision["analysis_type"] is None
+    assert decision["method"] == "llm"
+
+
+def test_model_trained_from_logs_round_trips(tmp_path):
+    log_path = tmp_path / "batch.jsonl"
+    rows = [
+        {"question": "warehouse stock turnover", "analysis_type": "product_trends", "status": "ok"},
+        {"question": "warehouse stock levels", "analysis_type": "product_trends", "status": "ok"},
+        {"question": "vip spenders", "analysis_type": "customer_segmentation", "status": "ok"},
+        {"question": "ignored", "analysis_type": "geo_analysis", "status": "ok", "metrics": {"intent_path": "keywords"}},
+    ]
+    log_path.write_text("\n".join(json.dumps(row) for row in rows) + "\n", encoding="utf-8")
+
+    examples = load_labelled_queries([log_path])
+    assert len(examples) == 3
+
+    model_path = tmp_path / "intent.json"
+    IntentModel.train(list(SEED_EXAMPLES) + examples).save(model_path)
+    probabilities = IntentModel.load(model_path).predict("warehouse stock")
+
+    assert max(probabilities, key=probabilities.get) == AnalysisType.PRODUCT_TRENDS.value
@@ -0,0 +1,88 @@
+import time
+
+from langchain_core.messages import HumanMessage
+
+from src.config import get_settings
+from src.nodes import reasoning_node
+from src.nodes.preflight import preflight_node
+from src.services.bigquery_runner import BigQueryRunner
+from src.services.fake_bigquery import FakeBigQueryClient
+from src.services.llm_cache import CachedChatModel, LLMResponseCache, get_llm_cache, with_response_cache
+
+
+class CountingModel:
+    model_name = "counting"
+    temperature = 0.0
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return type("Response", (), {"content": self.content})()
+
+
+def test_cache_expires_and_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache = LLMResponseCache(path=tmp_path / "llm.db", ttl_sec=60, max_entries=2)
+    cache.put("a", "A", 10)
+    cache.put("b", "B", 20)
+    assert cache.get("a") == ("A", 10)  # refreshes "a"
+
+    cache.put("c", "C", 30)
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    now = time.time()
+    monkeypatch.setattr("src.services.llm_cache.time.time", lambda: now + 120)
+    assert cache.get("a") is None
+
+
+def test_cached_model_reuses_response_across_instances(tmp_path):
+    model = CountingModel("answer")
+    messages = [HumanMessage(content="same prompt")]
+    CachedChatModel(model, LLMResponseCache(path=tmp_path / "llm.db", ttl_sec=60, max_entries=10)).invoke(messages)
+
+    reopened = CachedChatModel(model, LLMResponseCache(path=tmp_path / "llm.db", ttl_sec=60, max_entries=10))
+    response = reopened.invoke(messages)
+
+    assert model.calls == 1
+    assert response.content == "answer"
+    assert response.response_metadata["llm_cache_hit"] is True
+
+
+def test_reasoning_node_reports_cache_hits(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.db"))
+    monkeypatch.setenv("LLM_CACHE_NODES", "reasoning")
+    get_settings.cache_clear()
+    get_llm_cache.cache_clear()
+    model = CountingModel('{"analysis_type": "geo_analysis", "reasoning": "Regions"}')
+    monkeypatch.setattr("src.nodes.reasoning.get_chat_model", lambda **kwargs: model)
+
+    first = reasoning_node({"user_query": "How much did we sell?"})
+    second = reasoning_node({"user_query": "How much did we sell?"})
+
+    assert model.calls == 1
+    assert "llm_cache_hits" not in first.get("metrics", {})
+    assert second["analysis_type"] == "geo_analysis"
+    assert second["metrics"]["llm_cache_hits"] == 1
+    assert with_response_cache(model, "insights") is model
+
+
+def test_sql_rejected_by_preflight_is_evicted_from_the_cache(tmp_path, monkeypatch):
+    cache = LLMResponseCache(path=tmp_path / "llm.db", ttl_sec=60, max_entries=10)
+    monkeypatch.setattr("src.services.llm_cache.get_llm_cache", lambda: cache)
+    client = FakeBigQueryClient(table_bytes={"orders": 1_000})
+    monkeypatch.setattr("src.nodes.preflight.BigQueryRunner", lambda: BigQueryRunner(client=client))
+    messages = [HumanMessage(content="sql prompt")]
+    model = CachedChatModel(CountingModel("SELECT * FROM `p.d.missing_table`"), cache)
+    model.invoke(messages)
+    response = model.invoke(messages)  # the repeat is replayed from the cache
+    key = response.response_metadata["llm_cache_key"]
+
+    state = preflight_node({"sql_query": response.content, "llm_cache_key": key, "metrics": {}})
+
+    assert state["preflight"]["route"] == "regenerate"
+    assert cache.get(key) is None
+    assert state["llm_cache_key"] is None
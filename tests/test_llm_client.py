@@ -0,0 +1,19 @@
+from src.services.llm_client import evict_chat_models, get_chat_model
+
+
+def test_chat_models_are_cached_until_evicted(monkeypatch):
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("DEFAULT_LLM_PROVIDER", "openai")
+    evict_chat_models()
+
+    first = get_chat_model(temperature=0.0)
+    second = get_chat_model(temperature=0.0)
+    warmer = get_chat_model(temperature=0.1)
+
+    assert first is second
+    assert warmer is not first
+
+    evict_chat_models()
+    assert get_chat_model(temperature=0.0) is not first
+    evict_chat_models()
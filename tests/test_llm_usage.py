@@ -0,0 +1,63 @@
+from langchain_core.messages import AIMessage
+
+from src.nodes import reasoning_node
+from src.services.llm_usage import record_llm_usage, response_usage, token_cost_usd
+
+
+def test_provider_usage_metadata_is_preferred():
+    langchain = AIMessage(content="ok", usage_metadata={"input_tokens": 120, "output_tokens": 8, "total_tokens": 128})
+    openai = AIMessage(content="ok", response_metadata={"token_usage": {"prompt_tokens": 50, "completion_tokens": 5}})
+    gemini = AIMessage(
+        content="ok", response_metadata={"usage_metadata": {"prompt_token_count": 70, "candidates_token_count": 7}}
+    )
+
+    assert response_usage(langchain) == (120, 8)
+    assert response_usage(openai) == (50, 5)
+    assert response_usage(gemini) == (70, 7)
+    assert response_usage(AIMessage(content="ok")) is None
+
+
+def test_usage_accumulates_per_node_and_per_run():
+    state = {"metrics": {}}
+    priced = AIMessage(
+        content="SELECT 1",
+        usage_metadata={"input_tokens": 1_000, "output_tokens": 100, "total_tokens": 1_100},
+        response_metadata={"model_name": "gpt-4o-mini-2024-07-18"},
+    )
+
+    record_llm_usage(state, "sql_generation", "prompt", priced)
+    record_llm_usage(state, "sql_generation", "prompt", priced)
+    record_llm_usage(state, "insights", "x" * 400, AIMessage(content="y" * 40))
+
+    usage = state["metrics"]["llm_usage"]
+    assert usage["sql_generation"]["calls"] == 2
+    assert usage["sql_generation"]["prompt_tokens"] == 2_000
+    assert usage["sql_generation"]["cost_usd"] == round(2 * token_cost_usd("gpt-4o-mini", 1_000, 100), 6)
+    assert usage["insights"] == {"calls": 1, "prompt_tokens": 100, "completion_tokens": 10, "estimated_calls": 1}
+    assert state["metrics"]["llm_prompt_tokens"] == 2_100
+    assert state["metrics"]["llm_completion_tokens"] == 210
+
+
+def test_cache_hits_and_unpriced_models_cost_nothing():
+    state = {"metrics": {}}
+
+    record_llm_usage(state, "reasoning", "prompt", AIMessage(content="{}", response_metadata={"llm_cache_hit": True}))
+    assert "llm_usage" not in state["metrics"]
+
+    assert token_cost_usd("gpt-4o-mini-2024-07-18", 1_000_000, 0) == 0.15
+    assert token_cost_usd("my-local-model", 1_000, 10) is None
+
+
+def test_reasoning_node_records_estimated_usage(monkeypatch):
+    class ChatModel:
+        def invoke(self, messages):
+            return AIMessage(content='{"analysis_type": "geo_analysis", "reasoning": "Regions"}')
+
+    monkeypatch.setattr("src.nodes.reasoning.get_chat_model", lambda *args, **kwargs: ChatModel())
+    monkeypatch.setattr("src.nodes.reasoning.get_intent_classifier", lambda: None)
+
+    result = reasoning_node({"user_query": "Show sales by geography", "metrics": {}})
+
+    usage = result["metrics"]["llm_usage"]["reasoning"]
+    assert usage["calls"] == 1 and usage["estimated_calls"] == 1
+    assert usage["prompt_tokens"] > usage["completion_tokens"] > 0
@@ -0,0 +1,92 @@
+from src.config import get_settings
+from src.constants import SQL_TEMPLATES, AnalysisType
+from src.graph import _route_after_preflight
+from src.nodes.preflight import preflight_node
+from src.services.bigquery_runner import BigQueryRunner
+from src.services.fake_bigquery import FakeBigQueryClient
+
+
+def _use_fake_backend(monkeypatch, table_bytes):
+    client = FakeBigQueryClient(table_bytes=table_bytes)
+    monkeypatch.setattr("src.nodes.preflight.BigQueryRunner", lambda: BigQueryRunner(client=client))
+
+
+def test_preflight_routes_cheap_query_to_execution(monkeypatch):
+    _use_fake_backend(monkeypatch, {"orders": 1_000, "order_items": 2_000})
+    sql = SQL_TEMPLATES[AnalysisType.PRODUCT_TRENDS]
+
+    result = preflight_node({"sql_query": sql, "metrics": {}})
+
+    assert result["preflight"]["route"] == "execute"
+    assert result["metrics"]["estimated_bytes_processed"] == 3_000
+    assert result["sql_query"] == sql
+
+
+def test_preflight_samples_expensive_non_additive_query(monkeypatch):
+    _use_fake_backend(monkeypatch, {"orders": 2_000_000_000, "order_items": 3_000_000_000})
+    sql = (
+        "SELECT DATE_TRUNC(DATE(o.created_at), MONTH) AS month, AVG(oi.sale_price) AS avg_price "
+        "FROM `bigquery-public-data.thelook_ecommerce.order_items` AS oi "
+        "INNER JOIN `bigquery-public-data.thelook_ecommerce.orders` AS o ON oi.order_id = o.order_id "
+        "GROUP BY month"
+    )
+
+    result = preflight_node({"sql_query": sql, "metrics": {}})
+
+    assert result["preflight"]["route"] == "sample"
+    assert result["preflight"]["sample_percent"] == 10
+    assert result["metrics"]["sample_percent"] == 10
+    assert result["metrics"]["attempt_timings"][0]["preflight_ms"] >= 0
+    assert result["sql_query"].count("TABLESAMPLE SYSTEM (10 PERCENT)") == 2
+
+
+def test_preflight_regenerates_expensive_sums_instead_of_sampling(monkeypatch):
+    _use_fake_backend(monkeypatch, {"orders": 2_000_000_000, "order_items": 3_000_000_000})
+    sql = SQL_TEMPLATES[AnalysisType.PRODUCT_TRENDS]
+
+    result = preflight_node({"sql_query": sql, "metrics": {}})
+
+    assert result["preflight"]["route"] == "regenerate"
+    assert "SUM/COUNT" in result["last_execution_error"]
+    assert "sample_percent" not in result["metrics"]
+    assert "TABLESAMPLE" not in result["sql_query"]
+
+
+def test_preflight_requests_regeneration_on_dry_run_error(monkeypatch):
+    _use_fake_backend(monkeypatch, {"orders": 1_000})
+
+    result = preflight_node({"sql_query": "SELECT * FROM `p.d.missing_table`", "metrics": {}})
+
+    assert result["preflight"]["route"] == "regenerate"
+    assert result["sql_generation_attempt"] == 2
+    assert "missing_table" in result["last_execution_error"]
+
+
+def test_preflight_rejects_unknown_columns_before_dry_run(monkeypatch):
+    def _no_dry_run():
+        raise AssertionError("dry run should be skipped")
+
+    monkeypatch.setattr("src.nodes.preflight.BigQueryRunner", _no_dry_run)
+    schema_info = {"tables": {"orders": {"name": "orders", "columns": {"order_id": "INT64", "status": "STRING"}}}}
+
+    result = preflight_node(
+        {"sql_query": "SELECT o.region FROM `p.d.orders` AS o", "schema_info": schema_info, "metrics": {}}
+    )
+
+    assert result["preflight"]["route"] == "regenerate"
+    assert "o.region" in result["last_execution_error"]
+    assert result["metrics"]["attempt_timings"] == [
+        {"attempt": 1, "validation_ms": result["metrics"]["sql_validation_time_ms"], "outcome": "invalid_sql"}
+    ]
+
+
+def test_template_mode_ends_instead_of_regenerating(monkeypatch):
+    monkeypatch.setenv("SQL_ROUTING_MODE", "template")
+    get_settings.cache_clear()
+    _use_fake_backend(monkeypatch, {"orders": 1_000})
+
+    result = preflight_node({"sql_query": "SELECT * FROM `p.d.missing_table`", "metrics": {}})
+
+    assert result["preflight"]["route"] == "error"
+    assert _route_after_preflight(result) == "error_end"
+    assert "missing_table" in result["error_message"]
@@ -1,8 +1,9 @@
+import asyncio
 from typing import Any, List
 
 from langchain_core.messages import BaseMessage
 
-from src.nodes import reasoning_node
+from src.nodes import reasoning_node, reasoning_node_async
 
 
 class DummyChatModel:
@@ -20,6 +21,7 @@ def test_reasoning_node_classifies(monkeypatch):
         return DummyChatModel(dummy_response)
 
     monkeypatch.setattr("src.nodes.reasoning.get_chat_model", fake_get_chat_model)
+    monkeypatch.setattr("src.nodes.reasoning.get_intent_classifier", lambda: None)
 
     state = {"user_query": "Show sales by geography"}
     result = reasoning_node(state)
@@ -27,3 +29,40 @@ def test_reasoning_node_classifies(monkeypatch):
     assert result["analysis_type"] == "geo_analysis"
     assert "regions" in result["analysis_plan"]
 
+
+
+def test_reasoning_node_async_uses_ainvoke(monkeypatch):
+    class AsyncChatModel(DummyChatModel):
+        async def ainvoke(self, messages: List[BaseMessage]) -> Any:
+            return self.invoke(messages)
+
+    dummy_response = '{"analysis_type": "customer_segmentation", "reasoning": "Group buyers"}'
+    monkeypatch.setattr("src.nodes.reasoning.get_chat_model", lambda *args, **kwargs: AsyncChatModel(dummy_response))
+    monkeypatch.setattr("src.nodes.reasoning.get_intent_classifier", lambda: None)
+
+    result = asyncio.run(reasoning_node_async({"user_query": "Who are our best customers?"}))
+
+    assert result["analysis_type"] == "customer_segmentation"
+
+
+def test_reasoning_node_skips_llm_for_obvious_queries(monkeypatch):
+    def fail_get_chat_model(*args, **kwargs):
+        raise AssertionError("LLM should not be called")
+
+    monkeypatch.setattr("src.nodes.reasoning.get_chat_model", fail_get_chat_model)
+
+    result = reasoning_node({"user_query": "Where are regional sales growing?"})
+
+    assert result["analysis_type"] == "geo_analysis"
+    assert result["metrics"]["intent_path"] == "keywords"
+    assert "Classified locally" in result["analysis_plan"]
+
+
+def test_reasoning_node_asks_llm_when_ambiguous(monkeypatch):
+    dummy_response = '{"analysis_type": "customer_segmentation", "reasoning": "Spend per buyer"}'
+    monkeypatch.setattr("src.nodes.reasoning.get_chat_model", lambda *args, **kwargs: DummyChatModel(dummy_response))
+
+    result = reasoning_node({"user_query": "How much did we sell?"})
+
+    assert result["analysis_type"] == "customer_segmentation"
+    assert result["metrics"]["intent_path"] == "llm"
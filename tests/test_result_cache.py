@@ -0,0 +1,47 @@
+import os
+import time
+
+import pandas as pd
+
+from src.services.result_cache import QueryResultCache
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"value": list(range(rows))})
+
+
+def test_result_cache_evicts_least_recently_used_by_bytes():
+    frame_bytes = int(_frame(100).memory_usage(deep=True).sum())
+    cache = QueryResultCache(ttl_sec=60, max_bytes=frame_bytes * 2)
+
+    cache.put("a", _frame(100))
+    cache.put("b", _frame(100))
+    cache.get("a")
+    cache.put("c", _frame(100))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_result_cache_reads_parquet_tier(tmp_path):
+    key = QueryResultCache.make_key("SELECT 1", "ds", 10)
+    QueryResultCache(ttl_sec=60, max_bytes=1_000_000, cache_dir=tmp_path).put(key, _frame(3))
+
+    restarted = QueryResultCache(ttl_sec=60, max_bytes=1_000_000, cache_dir=tmp_path)
+
+    assert restarted.get(key)["value"].tolist() == [0, 1, 2]
+    assert restarted.get(QueryResultCache.make_key("SELECT 1", "ds", 20)) is None
+
+
+def test_result_cache_promotion_keeps_disk_store_time(tmp_path, monkeypatch):
+    key = QueryResultCache.make_key("SELECT 1", "ds", 10)
+    QueryResultCache(ttl_sec=60, max_bytes=1_000_000, cache_dir=tmp_path).put(key, _frame(3))
+    stored_at = time.time() - 58
+    os.utime(tmp_path / f"{key}.parquet", (stored_at, stored_at))
+
+    restarted = QueryResultCache(ttl_sec=60, max_bytes=1_000_000, cache_dir=tmp_path)
+    assert restarted.get(key) is not None
+
+    monkeypatch.setattr("src.services.result_cache.time.time", lambda: stored_at + 61)
+    assert restarted.get(key) is None
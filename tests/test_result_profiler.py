@@ -0,0 +1,64 @@
+import pandas as pd
+
+from src.services.result_profiler import profile_result, render_profile
+from src.services.tokens import estimate_tokens
+
+
+def _monthly_frame():
+    return pd.DataFrame(
+        {
+            "month": ["2024-01-01", "2024-01-01", "2024-02-01", "2024-03-01"],
+            "category": ["Jeans", "Tops", "Jeans", None],
+            "revenue": [100.0, 50.0, 180.0, 90.0],
+        }
+    )
+
+
+def test_profile_computes_column_statistics_and_period_deltas():
+    profile = profile_result(_monthly_frame())
+    columns = {column["name"]: column for column in profile["columns"]}
+
+    assert profile["row_count"] == 4
+    assert profile["completeness"] == round(1 - 1 / 12, 4)
+    assert profile["period_column"] == "month"
+    assert columns["category"]["null_rate"] == 0.25
+    assert columns["category"]["top_values"][0] == ("Jeans", 2)
+    assert columns["revenue"]["max"] == 180.0
+    assert [delta["change_pct"] for delta in columns["revenue"]["deltas"]] == [20.0, -50.0]
+
+
+def test_period_deltas_average_non_additive_columns():
+    frame = pd.DataFrame(
+        {
+            "month": ["2024-01-01", "2024-01-01", "2024-02-01", "2024-02-01"],
+            "order_count": [10, 30, 20, 40],
+            "avg_price": [10.0, 20.0, 30.0, 30.0],
+            "conversion_rate": [0.1, 0.3, 0.2, 0.2],
+        }
+    )
+
+    columns = {column["name"]: column for column in profile_result(frame)["columns"]}
+
+    assert columns["order_count"]["deltas"][0]["value"] == 60.0
+    assert columns["avg_price"]["deltas"][0] == {"period": "2024-02-01", "value": 30.0, "change_pct": 100.0}
+    assert columns["conversion_rate"]["deltas"][0]["value"] == 0.2
+
+
+def test_render_profile_respects_token_budget():
+    wide = pd.DataFrame({f"metric_{index}": range(100) for index in range(40)})
+    profile = profile_result(wide)
+
+    text = render_profile(profile, token_budget=120, sample_rows=wide.head())
+
+    assert estimate_tokens(text) <= 120
+    assert text.startswith("rows=100 columns=40")
+    assert "more columns" in text
+
+
+def test_render_profile_fills_spare_budget_with_sample_rows():
+    frame = _monthly_frame()
+
+    text = render_profile(profile_result(frame), token_budget=500, sample_rows=frame)
+
+    assert "sample rows:" in text
+    assert "2024-02-01,Jeans,180.00" in text
@@ -0,0 +1,66 @@
+from src.nodes.schema_retrieval import schema_retrieval_node
+from src.services.schema_cache import SchemaCache
+
+
+class DummyRunner:
+    calls = 0
+
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def get_tables_schema(self, table_names):
+        DummyRunner.calls += 1
+        return {
+            name: {"name": name, "columns": {"order_id": "INT64"}, "row_count": 10, "last_modified": 1.0}
+            for name in table_names
+        }
+
+
+def test_schema_cache_expires_and_invalidates_on_modification(tmp_path):
+    cache = SchemaCache(ttl_sec=60, max_entries=4, cache_dir=tmp_path)
+    cache.put("ds", "orders", {"name": "orders", "columns": {}, "last_modified": 1.0})
+
+    assert cache.get("ds", "orders", last_modified=1.0) is not None
+    assert cache.get("ds", "orders", last_modified=2.0) is None
+
+    cache.put("ds", "users", {"name": "users", "columns": {}}, retrieved_at=0.0)
+    assert cache.get("ds", "users") is None
+
+
+def test_schema_cache_reads_back_from_disk(tmp_path):
+    SchemaCache(ttl_sec=60, max_entries=4, cache_dir=tmp_path).put("ds", "orders", {"name": "orders"})
+
+    fresh_process_cache = SchemaCache(ttl_sec=60, max_entries=4, cache_dir=tmp_path)
+    cached = fresh_process_cache.get("ds", "orders")
+
+    assert cached is not None
+    assert cached[0]["name"] == "orders"
+
+
+def test_schema_retrieval_node_serves_second_call_from_cache(monkeypatch, tmp_path):
+    cache = SchemaCache(ttl_sec=60, max_entries=16, cache_dir=tmp_path)
+    monkeypatch.setattr("src.nodes.schema_retrieval.BigQueryRunner", DummyRunner)
+    monkeypatch.setattr("src.nodes.schema_retrieval.get_schema_cache", lambda: cache)
+
+    first = schema_retrieval_node({"analysis_type": "geo_analysis", "metrics": {}})
+    second = schema_retrieval_node({"analysis_type": "geo_analysis", "metrics": {}})
+
+    assert DummyRunner.calls == 1
+    assert first["metrics"]["schema_cache_hit"] is False
+    assert second["metrics"]["schema_cache_hit"] is True
+    assert second["schema_info"]["tables"]["orders"]["columns"]["order_id"] == "INT64"
+
+
+def test_schema_cache_rate_limits_modification_lookups():
+    calls = []
+
+    def fetch(table_names):
+        calls.append(list(table_names))
+        return {name: 5.0 for name in table_names}
+
+    cache = SchemaCache(ttl_sec=60, max_entries=4, modified_check_sec=60)
+    cache.put("ds", "orders", {"name": "orders", "columns": {}, "last_modified": 1.0})
+
+    assert cache.last_modified_times("ds", ["orders", "users"], fetch) == {"orders": 1.0, "users": 5.0}
+    assert cache.last_modified_times("ds", ["orders", "users"], fetch) == {"orders": 1.0, "users": 5.0}
+    assert calls == [["users"]]
@@ -0,0 +1,39 @@
+from src.services.fake_bigquery import FAKE_TABLE_COLUMNS
+from src.services.schema_context import build_schema_context
+
+SCHEMA = {"tables": {name: {"name": name, "columns": dict(columns)} for name, columns in FAKE_TABLE_COLUMNS.items()}}
+
+
+def test_small_schema_is_rendered_in_full():
+    schema = {"tables": {"orders": SCHEMA["tables"]["orders"]}}
+
+    context = build_schema_context(schema, "orders per month", "product_trends", token_budget=300)
+
+    assert context["text"].startswith("## orders\n- order_id: INT64\n- user_id: INT64")
+    assert context["omitted_columns"] == 0
+    assert context["tokens"] == context["full_tokens"]
+
+
+def test_wide_schema_keeps_relevant_columns_and_keys_within_budget():
+    context = build_schema_context(SCHEMA, "How many users per country?", "customer_segmentation", token_budget=120)
+    text = context["text"]
+
+    assert context["tokens"] <= 120 < context["full_tokens"]
+    assert text.startswith("## users\n- id: INT64")
+    for line in ("- country: STRING", "- created_at: TIMESTAMP", "- user_id: INT64"):
+        assert line in text
+    assert "## distribution_centers" not in text
+    assert "columns not shown" in text
+
+
+def test_prompt_size_does_not_grow_with_schema_width():
+    wide = {"tables": dict(SCHEMA["tables"])}
+    for index in range(20):
+        wide["tables"][f"extra_{index}"] = {"columns": {f"metric_{column}": "FLOAT64" for column in range(30)}}
+
+    narrow_context = build_schema_context(SCHEMA, "revenue by brand", "product_trends", token_budget=200)
+    wide_context = build_schema_context(wide, "revenue by brand", "product_trends", token_budget=200)
+
+    assert wide_context["tokens"] <= 200
+    assert "- brand: STRING" in wide_context["text"]
+    assert wide_context["full_tokens"] > 5 * narrow_context["full_tokens"]
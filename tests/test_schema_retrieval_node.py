@@ -0,0 +1,81 @@
+from src.nodes.schema_retrieval import FALLBACK_TABLES, schema_prefetch_node, schema_retrieval_node
+from src.services.bigquery_runner import BigQueryRunner
+from src.services.fake_bigquery import FAKE_TABLE_COLUMNS, FakeBigQueryClient
+from src.services.schema_cache import SchemaCache
+from src.services.table_index import TableIndexStore
+
+FAKE_TABLES = {name: {"name": name, "columns": dict(columns)} for name, columns in FAKE_TABLE_COLUMNS.items()}
+
+
+def test_prefetch_builds_index_and_fetches_only_selected_tables(monkeypatch):
+    store = TableIndexStore(path=None, ttl_sec=60)
+    monkeypatch.setattr("src.nodes.schema_retrieval.get_table_index_store", lambda: store)
+    monkeypatch.setattr("src.nodes.schema_retrieval.get_schema_cache", lambda: SchemaCache(ttl_sec=60, max_entries=16))
+    monkeypatch.setattr(
+        "src.nodes.schema_retrieval.BigQueryRunner",
+        lambda dataset_id: BigQueryRunner(dataset_id=dataset_id, client=FakeBigQueryClient()),
+    )
+
+    update = schema_prefetch_node({"user_query": "Revenue by country", "metrics": {}})
+
+    assert list(update) == ["schema_prefetch"]
+    assert sorted(update["schema_prefetch"]["tables"]) == ["order_items", "users"]
+    assert update["schema_prefetch"]["cache_hit"] is False
+    assert sorted(store.index.tables) == sorted(FAKE_TABLE_COLUMNS)
+
+
+def test_retrieval_narrows_prefetched_tables_without_fetching(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("prefetched schemas should be reused")
+
+    store = TableIndexStore(path=None, ttl_sec=60)
+    store.refresh(FAKE_TABLES)
+    monkeypatch.setattr("src.nodes.schema_retrieval.get_table_index_store", lambda: store)
+    monkeypatch.setattr("src.nodes.schema_retrieval.BigQueryRunner", fail)
+    state = {
+        "user_query": "Top 5 categories last quarter",
+        "analysis_type": "product_trends",
+        "metrics": {},
+        "schema_prefetch": {"tables": FAKE_TABLES, "retrieved_at": 100.0, "cache_hit": True, "time_ms": 42},
+    }
+
+    result = schema_retrieval_node(state)
+
+    assert result["available_tables"] == ["products", "order_items"]
+    assert result["schema_info"]["retrieved_at"] == 100.0
+    assert result["metrics"]["schema_cache_hit"] is True
+    assert result["metrics"]["schema_retrieval_time_ms"] >= 42
+
+
+def test_retrieval_falls_back_without_index(monkeypatch):
+    store = TableIndexStore(path=None, ttl_sec=60)
+    monkeypatch.setattr("src.nodes.schema_retrieval.get_table_index_store", lambda: store)
+    prefetched = {name: FAKE_TABLES[name] for name in FALLBACK_TABLES}
+
+    result = schema_retrieval_node(
+        {"user_query": "Anything", "metrics": {}, "schema_prefetch": {"tables": prefetched, "retrieved_at": 1.0}}
+    )
+
+    assert result["available_tables"] == FALLBACK_TABLES
+
+
+def test_retrieval_refetches_schema_of_modified_table(monkeypatch):
+    client = FakeBigQueryClient()
+    cache = SchemaCache(ttl_sec=3600, max_entries=16, modified_check_sec=0)
+    monkeypatch.setattr("src.nodes.schema_retrieval.get_table_index_store", lambda: TableIndexStore(path=None, ttl_sec=60))
+    monkeypatch.setattr("src.nodes.schema_retrieval.get_schema_cache", lambda: cache)
+    monkeypatch.setattr(
+        "src.nodes.schema_retrieval.BigQueryRunner",
+        lambda dataset_id: BigQueryRunner(dataset_id=dataset_id, client=client),
+    )
+    state = {"user_query": "Anything", "analysis_type": "product_trends"}
+
+    first = schema_retrieval_node({**state, "metrics": {}})
+    unchanged = schema_retrieval_node({**state, "metrics": {}})
+    client.last_modified_ms += 60_000
+    modified = schema_retrieval_node({**state, "metrics": {}})
+
+    assert first["metrics"]["schema_cache_hit"] is False
+    assert unchanged["metrics"]["schema_cache_hit"] is True
+    assert modified["metrics"]["schema_cache_hit"] is False
+    assert modified["schema_info"]["tables"]["orders"]["last_modified"] == client.last_modified_ms / 1000.0
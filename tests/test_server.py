@@ -0,0 +1,101 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.config import get_settings
+from src.server import AgentService, ServerBusyError, create_server
+from src.services.bigquery_pool import get_client_pool
+from src.services.llm_client import evict_chat_models
+from src.services.result_cache import get_result_cache
+from src.services.schema_cache import get_schema_cache
+
+
+def _reset_singletons():
+    evict_chat_models()
+    for factory in (get_client_pool, get_result_cache, get_schema_cache):
+        factory.cache_clear()
+
+
+@pytest.fixture
+def fake_backends(monkeypatch, tmp_path):
+    monkeypatch.setenv("BIGQUERY_BACKEND", "fake")
+    monkeypatch.setenv("DEFAULT_LLM_PROVIDER", "fake")
+    monkeypatch.setenv("QUERY_CACHE_ENABLED", "false")
+    monkeypatch.setenv("SCHEMA_CACHE_PERSIST", "false")
+    monkeypatch.setenv("PLOT_OUTPUT_DIR", str(tmp_path))
+    _reset_singletons()
+    yield
+    monkeypatch.undo()
+    _reset_singletons()
+    get_settings.cache_clear()
+
+
+def _post(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    return urllib.request.urlopen(request, timeout=60)
+
+
+def test_server_answers_and_streams_with_fake_backends(fake_backends):
+    server = create_server("127.0.0.1", 0, AgentService(workers=2, max_queue=2))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        result = json.load(_post(f"{base_url}/v1/analyze", {"question": "Revenue by country"}))
+        events = [json.loads(line) for line in _post(f"{base_url}/v1/analyze/stream", {"question": "Revenue trend"})]
+        stats = json.load(urllib.request.urlopen(f"{base_url}/v1/stats", timeout=10))
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.service.shutdown()
+
+    assert result["analysis_type"] == "geo_analysis"
+    assert result["validation_passed"] is True
+    assert result["results"]["row_count"] > 0
+    assert {event["node"] for event in events[:2]} == {"reasoning", "schema_prefetch"}
+    assert events[2]["node"] == "schema_retrieval"
+    assert events[-1]["event"] == "result"
+    assert events[-1]["state"]["insights"]
+    assert stats["completed"] == 2
+
+
+def test_service_rejects_requests_beyond_queue_depth():
+    release = threading.Event()
+
+    class SlowAgent:
+        def invoke(self, state):
+            release.wait(5)
+            return state
+
+    service = AgentService(agent=SlowAgent(), workers=1, max_queue=0)
+    worker = threading.Thread(target=service.run, args=("first",))
+    worker.start()
+    while service.stats()["in_flight"] == 0:
+        time.sleep(0.01)
+
+    with pytest.raises(ServerBusyError):
+        service.run("second")
+
+    release.set()
+    worker.join()
+    service.shutdown()
+    assert service.stats()["rejected"] == 1
+    assert service.stats()["completed"] == 1
+
+
+def test_server_returns_400_without_question():
+    server = create_server("127.0.0.1", 0, AgentService(agent=object(), workers=1, max_queue=0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _post(f"http://127.0.0.1:{server.server_address[1]}/v1/analyze", {})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert error.value.code == 400
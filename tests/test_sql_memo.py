@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import get_settings
+from src.constants import AnalysisType, PreflightRoute
+from src.graph import _route_after_planning
+from src.nodes import execution, planning
+from src.nodes.planning import planning_node
+from src.services.sql_memo import SQLMemo
+
+SQL = "SELECT u.gender, COUNT(*) AS buyers FROM `bigquery-public-data.thelook_ecommerce.users` AS u GROUP BY u.gender"
+QUESTION = "How many female buyers bought jackets from the Levi's brand?"
+
+
+def _memo(tmp_path, max_entries=10):
+    return SQLMemo(path=tmp_path / "memo.json", max_entries=max_entries)
+
+
+def test_search_ranks_near_duplicate_first(tmp_path):
+    memo = _memo(tmp_path)
+    memo.record_success(QUESTION, SQL, "customer_segmentation")
+    memo.record_success("Revenue from jeans sold in Brazil", "SELECT 1", "product_trends")
+
+    matches = memo.search("how many female buyers bought jacket from the levi's brand", "customer_segmentation")
+
+    assert matches[0]["entry"]["sql"] == SQL
+    assert matches[0]["similarity"] == 1.0
+    assert memo.search(QUESTION, "geo_analysis") == []
+
+
+def test_memo_persists_evicts_failures_and_caps_size(tmp_path):
+    memo = _memo(tmp_path, max_entries=2)
+    memo.record_success(QUESTION, SQL, "customer_segmentation")
+    memo.record_success("Jeans revenue in Brazil", "SELECT 2", "product_trends")
+    memo.record_success("Jeans revenue in Spain", "SELECT 3", "product_trends")
+
+    reloaded = _memo(tmp_path)
+    assert len(reloaded) == 2
+    assert not reloaded.search(QUESTION)
+
+    assert reloaded.evict_sql("select 2") == 1
+    assert [match["entry"]["sql"] for match in _memo(tmp_path).search("Jeans revenue")] == ["SELECT 3"]
+
+
+def test_planning_reuses_memo_sql_and_routes_to_preflight(monkeypatch, tmp_path):
+    memo = _memo(tmp_path)
+    memo.record_success(QUESTION, SQL, AnalysisType.CUSTOMER_SEGMENTATION.value)
+    monkeypatch.setenv("SQL_ROUTING_MODE", "hybrid")
+    get_settings.cache_clear()
+    monkeypatch.setattr(planning, "get_sql_memo", lambda: memo)
+
+    state = planning_node({"user_query": QUESTION, "analysis_type": AnalysisType.CUSTOMER_SEGMENTATION.value})
+    assert state["sql_query"] == SQL
+    assert state["sql_source"] == "memo"
+    assert state["metrics"]["sql_memo_hit"] is True
+    assert _route_after_planning(state) == "preflight"
+
+    other = planning_node({"user_query": QUESTION.replace("many", "many 5"), "analysis_type": "customer_segmentation"})
+    assert other["metrics"]["sql_memo_hit"] is False
+    assert _route_after_planning(other) == "sql_generation"
+
+
+def test_execution_records_llm_sql_but_not_sampled_runs(monkeypatch, tmp_path):
+    memo = _memo(tmp_path)
+    monkeypatch.setattr(execution, "get_sql_memo", lambda: memo)
+    state = {"user_query": QUESTION, "sql_query": SQL, "sql_source": "llm", "analysis_type": "customer_segmentation"}
+
+    execution._update_memo({**state, "preflight": {"route": PreflightRoute.SAMPLE.value}}, succeeded=True)
+    assert len(memo) == 0
+
+    execution._update_memo(state, succeeded=True)
+    assert len(memo) == 1
+
+    execution._update_memo(state, succeeded=False)
+    assert len(memo) == 0
+
+
+def test_concurrent_successes_persist_the_latest_state(tmp_path):
+    path = tmp_path / "memo.json"
+    memo = SQLMemo(path=path, max_entries=500)
+
+    def record(index):
+        memo.record_success(f"question {index}", f"SELECT {index}", "product_trends")
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(record, range(200)))
+
+    assert len(SQLMemo(path=path, max_entries=500)) == len(memo) == 200
@@ -0,0 +1,37 @@
+from src.services.sql_normalizer import canonicalize_sql, fingerprint_sql
+
+
+LLM_STYLE_SQL = """
+-- Monthly revenue
+select date_trunc(date(orders.created_at), month) as month, sum(items.sale_price) as revenue
+from bigquery-public-data.thelook_ecommerce.order_items items
+join `bigquery-public-data`.`thelook_ecommerce`.orders orders on items.order_id = orders.order_id
+where date(orders.created_at) >= '2024-01-01'
+group by month;
+"""
+
+TEMPLATE_STYLE_SQL = """
+SELECT
+    DATE_TRUNC(DATE(o.created_at), MONTH) AS month,
+    SUM(oi.sale_price) AS revenue  /* revenue per month */
+FROM `bigquery-public-data.thelook_ecommerce.order_items` AS oi
+JOIN `bigquery-public-data.thelook_ecommerce.orders` AS o
+    ON oi.order_id = o.order_id
+WHERE DATE(o.created_at) >= '2023-06-01'
+GROUP BY month
+"""
+
+
+def test_fingerprint_ignores_formatting_aliases_and_quoting():
+    assert canonicalize_sql(LLM_STYLE_SQL).startswith("SELECT DATE_TRUNC(DATE(t2.created_at), month) AS month")
+    assert fingerprint_sql(LLM_STYLE_SQL) != fingerprint_sql(TEMPLATE_STYLE_SQL)
+    assert fingerprint_sql(LLM_STYLE_SQL, parameterize_literals=True) == fingerprint_sql(
+        TEMPLATE_STYLE_SQL, parameterize_literals=True
+    )
+
+
+def test_canonical_form_keeps_literals_and_column_aliases():
+    canonical = canonicalize_sql("select u.country cnt from `p.d.users` u where u.age > 30 limit 5")
+
+    assert canonical == "SELECT t1.country cnt FROM `p.d.users` AS t1 WHERE t1.age > 30 LIMIT 5"
+    assert "?" in canonicalize_sql("SELECT 1 FROM t WHERE a = 'x'", parameterize_literals=True)
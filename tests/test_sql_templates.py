@@ -0,0 +1,66 @@
+from src.config import get_settings
+from src.constants import AnalysisType
+from src.graph import _route_after_planning
+from src.nodes.planning import planning_node
+from src.services.sql_templates import match_template
+
+
+def test_template_fills_window_limit_and_dimension():
+    match = match_template("Top 5 customer segments by gender over the past 6 months", AnalysisType.CUSTOMER_SEGMENTATION)
+
+    assert match is not None
+    assert match["template"] == "customer_segments"
+    assert match["slots"] == {"window": 6, "window_unit": "MONTH", "limit": 5, "dimension": "u.gender"}
+    assert "GROUP BY u.gender" in match["sql"]
+    assert "INTERVAL 6 MONTH" in match["sql"]
+    assert "LIMIT 5" in match["sql"]
+    # The window belongs in the LEFT JOIN, where it cannot drop customers without orders
+    assert "WHERE" not in match["sql"]
+
+
+def test_trend_grain_and_breakdown_selection():
+    trend = match_template("Weekly revenue trend for the last 3 months", AnalysisType.PRODUCT_TRENDS)
+    breakdown = match_template("Revenue by brand", AnalysisType.PRODUCT_TRENDS)
+
+    assert trend is not None and "DATE_TRUNC(DATE(o.created_at), WEEK)" in trend["sql"]
+    assert breakdown is not None and breakdown["template"] == "product_breakdown"
+    assert breakdown["chart_type"] == "bar"
+
+
+def test_uncovered_questions_fall_back_to_llm():
+    assert match_template("Revenue by country for women's jeans", AnalysisType.GEO_ANALYSIS) is None
+    assert match_template("Customers by gender and country", AnalysisType.CUSTOMER_SEGMENTATION) is None
+    assert match_template("Average order value since 2023", AnalysisType.PRODUCT_TRENDS) is None
+
+
+def test_ranking_questions_skip_the_trend_template():
+    assert match_template("top 5 products by revenue", AnalysisType.PRODUCT_TRENDS) is None
+    assert match_template("Best selling products", AnalysisType.PRODUCT_TRENDS) is None
+
+    ranked = match_template("Top 5 categories by revenue", AnalysisType.PRODUCT_TRENDS)
+    assert ranked is not None and ranked["template"] == "product_breakdown"
+    assert "LIMIT 5" in ranked["sql"]
+
+
+def test_change_over_time_questions_skip_snapshot_templates():
+    assert match_template("Where are we seeing the strongest regional sales growth?", AnalysisType.GEO_ANALYSIS) is None
+    assert match_template("Show brand revenue trend over the past year", AnalysisType.PRODUCT_TRENDS) is None
+    assert match_template("Revenue change by country", AnalysisType.GEO_ANALYSIS) is None
+    assert match_template("Customer growth by gender", AnalysisType.CUSTOMER_SEGMENTATION) is None
+
+    trend = match_template("Monthly revenue growth over the past year", AnalysisType.PRODUCT_TRENDS)
+    assert trend is not None and trend["template"] == "product_trend"
+
+
+def test_planning_routes_hits_and_misses(monkeypatch):
+    monkeypatch.setenv("SQL_ROUTING_MODE", "hybrid")
+    get_settings.cache_clear()
+
+    hit = planning_node({"user_query": "Sales by region", "analysis_type": "geo_analysis", "metrics": {}})
+    miss = planning_node({"user_query": "Return rate of jackets", "analysis_type": "product_trends", "metrics": {}})
+
+    assert hit["metrics"]["sql_template_hit"] is True
+    assert _route_after_planning(hit) == "preflight"
+    assert miss["metrics"]["sql_template_hit"] is False
+    assert "sql_query" not in miss
+    assert _route_after_planning(miss) == "sql_generation"
@@ -0,0 +1,48 @@
+from src.constants import SQL_TEMPLATES
+from src.services.fake_bigquery import FAKE_TABLE_COLUMNS
+from src.services.sql_validator import validate_sql
+
+SCHEMA = {
+    "tables": {name: {"name": name, "columns": dict(FAKE_TABLE_COLUMNS[name])} for name in ("orders", "order_items", "users")}
+}
+
+
+def test_template_sql_passes():
+    for sql in SQL_TEMPLATES.values():
+        assert validate_sql(sql, SCHEMA) == []
+
+
+def test_week_with_start_day_passes():
+    sql = (
+        "SELECT DATE_TRUNC(DATE(created_at), WEEK(MONDAY)) AS week, COUNT(*) AS orders "
+        "FROM `bigquery-public-data.thelook_ecommerce.orders` GROUP BY week"
+    )
+    assert validate_sql(sql, SCHEMA) == []
+
+
+def test_reports_unknown_tables_and_columns():
+    assert validate_sql("SELECT * FROM `p.d.missing`", SCHEMA) == [
+        "Unknown table p.d.missing; available tables: order_items, orders, users"
+    ]
+
+    sql = """
+    WITH monthly AS (
+        SELECT DATE_TRUNC(DATE(o.created_at), MONTH) AS month, SUM(oi.price) revenue, o.region
+        FROM bigquery-public-data.thelook_ecommerce.orders o
+        JOIN `bigquery-public-data.thelook_ecommerce.order_items` oi ON o.order_id = oi.order_id
+        WHERE EXTRACT(YEAR FROM created_at) = 2024
+        GROUP BY month
+    )
+    SELECT month, revenue, margin FROM monthly ORDER BY month DESC
+    """
+    assert validate_sql(sql, SCHEMA) == [
+        "Unknown column oi.price: table order_items has no column price",
+        "Unknown column o.region: table orders has no column region",
+        "Unrecognized name: margin",
+    ]
+
+
+def test_checks_shape_without_schema():
+    assert validate_sql("DELETE FROM orders", None) == ["Statement must start with SELECT or WITH"]
+    assert validate_sql("SELECT COUNT(*) FROM t WHERE (a = 1", None) == ["Unclosed parenthesis"]
+    assert validate_sql("SELECT missing_column FROM t", None) == []
@@ -0,0 +1,43 @@
+import time
+
+from src.services.fake_bigquery import FAKE_TABLE_COLUMNS
+from src.services.table_index import TableIndex, TableIndexStore
+
+FAKE_TABLES = {name: {"name": name, "columns": dict(columns)} for name, columns in FAKE_TABLE_COLUMNS.items()}
+
+
+def test_selects_minimal_joinable_tables():
+    index = TableIndex.build(FAKE_TABLES)
+
+    assert index.select_tables("Revenue by country", "geo_analysis") == ["users", "order_items"]
+    assert index.select_tables("Top 5 categories last quarter", "product_trends") == ["products", "order_items"]
+    assert index.select_tables("Which browsers do visitors use?") == ["events"]
+    # distribution_centers and inventory_items only join through products
+    assert index.select_tables("inventory cost by distribution center") == [
+        "distribution_centers",
+        "products",
+        "inventory_items",
+    ]
+    assert index.select_tables("weather tomorrow") == []
+
+
+def test_store_persists_index_and_rebuilds_when_stale(tmp_path):
+    path = tmp_path / "table_index.json"
+    calls = []
+
+    def fetch_tables():
+        calls.append(1)
+        return FAKE_TABLES
+
+    store = TableIndexStore(path=path, ttl_sec=60)
+    assert store.ensure_fresh(fetch_tables) is not None
+    assert store.ensure_fresh(fetch_tables) is not None
+    assert len(calls) == 1
+
+    started = time.perf_counter()
+    reloaded = TableIndexStore(path=path, ttl_sec=60)
+    assert (time.perf_counter() - started) < 0.05
+    assert not reloaded.is_stale()
+    assert sorted(reloaded.index.select_tables("Revenue by country")) == ["order_items", "users"]
+
+    assert TableIndexStore(path=path, ttl_sec=0).is_stale()
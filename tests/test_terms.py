@@ -0,0 +1,14 @@
+from src.services import schema_context, sql_memo, sql_templates, table_index
+from src.services.terms import STOPWORDS, words
+
+
+def test_words_fold_plurals_and_split_identifiers():
+    assert words("Top Categories by sale_price") == ["top", "categorie", "by", "sale", "price"]
+    assert words("Show the orders by class", STOPWORDS) == ["order", "class"]
+
+
+def test_matchers_share_one_tokenizer():
+    question = "How many users placed orders in 2024?"
+
+    assert table_index._words(question) == sql_memo._features(question)[:4] == ["user", "placed", "order", "2024"]
+    assert sql_templates.question_words is schema_context.words is words
@@ -0,0 +1,117 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.config import get_settings
+from src.services.tracing import (
+    OTLPJsonFileExporter,
+    current_span,
+    get_span_exporter,
+    start_span,
+    trace_request,
+    traced_node,
+)
+
+
+def _exported_spans():
+    lines = Path(get_settings().trace_export_path).read_text(encoding="utf-8").splitlines()
+    return [json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"] for line in lines]
+
+
+def _attributes(span):
+    return {item["key"]: next(iter(item["value"].values())) for item in span["attributes"]}
+
+
+def test_node_spans_nest_under_the_request_and_export_once():
+    node = traced_node("planning", lambda state: {**state, "sql_query": "SELECT 1"})
+
+    with trace_request("How many orders?"):
+        with start_span("bigquery.dry_run"):
+            pass
+        node({"user_query": "How many orders?"})
+
+    [spans] = _exported_spans()
+    by_name = {span["name"]: span for span in spans}
+    root = by_name["agent.request"]
+    assert "parentSpanId" not in root
+    assert {span["traceId"] for span in spans} == {root["traceId"]}
+    assert by_name["node.planning"]["parentSpanId"] == root["spanId"]
+    attributes = _attributes(by_name["node.planning"])
+    assert attributes["agent.state.keys"] == "2"
+    assert {"agent.node.wall_ms", "agent.node.cpu_ms", "agent.state.bytes"} <= set(attributes)
+    assert int(root["endTimeUnixNano"]) >= int(by_name["node.planning"]["endTimeUnixNano"])
+
+
+def test_errors_are_recorded_and_reraised():
+    def failing(state):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        with trace_request("q"):
+            traced_node("execution", failing)({})
+
+    [spans] = _exported_spans()
+    node_span = next(span for span in spans if span["name"] == "node.execution")
+    assert node_span["status"] == {"code": 2, "message": "boom"}
+    assert node_span["events"][0]["name"] == "exception"
+
+
+def test_async_nodes_stay_coroutines():
+    async def node(state):
+        return state
+
+    wrapped = traced_node("reasoning", node)
+
+    async def run():
+        with trace_request("q"):
+            return await wrapped({"user_query": "q"})
+
+    assert asyncio.iscoroutinefunction(wrapped)
+    assert asyncio.run(run()) == {"user_query": "q"}
+    assert [span["name"] for span in _exported_spans()[0]] == ["node.reasoning", "agent.request"]
+
+
+def test_tracing_disabled_exports_nothing(monkeypatch):
+    monkeypatch.setenv("TRACING_ENABLED", "false")
+    get_settings.cache_clear()
+    get_span_exporter.cache_clear()
+
+    with trace_request("q"):
+        pass
+
+    assert get_span_exporter() is None
+
+
+def test_exporter_rotates_when_file_reaches_max_bytes(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = OTLPJsonFileExporter(path, max_bytes=1_000)
+
+    for _ in range(6):
+        with start_span("node.planning") as span:
+            pass
+        exporter.export([span])
+
+    rotated = path.with_name("traces.jsonl.1")
+    assert rotated.exists()
+    assert path.stat().st_size <= 1_000
+    assert rotated.stat().st_size <= 1_000
+
+
+def test_run_agent_opens_request_span(monkeypatch):
+    import src.main as main
+
+    class Agent:
+        def invoke(self, state):
+            return {**state, "root": current_span().name}
+
+        async def ainvoke(self, state):
+            return self.invoke(state)
+
+    monkeypatch.setattr(main, "agent", Agent())
+    monkeypatch.setattr(main, "async_agent", Agent())
+
+    assert main.run_agent("q")["root"] == "agent.request"
+    assert asyncio.run(main.run_agent_async("q"))["root"] == "agent.request"
+    assert len(_exported_spans()) == 2
@@ -1,3 +1,4 @@
+from src.config import get_settings
 from src.nodes.visualization import visualization_node
 
 
@@ -18,3 +19,42 @@ def test_visualization_node_returns_chart_json():
 
     assert result["chart_json"] is not None
 
+
+
+def test_visualization_node_records_downsampling(monkeypatch, tmp_path):
+    monkeypatch.setenv("CHART_MAX_POINTS", "50")
+    monkeypatch.setenv("PLOT_OUTPUT_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    state = {
+        "validation_passed": True,
+        "chart_type": "line",
+        "bq_results": {"data": [{"day": i, "revenue": float(i % 7)} for i in range(1000)]},
+    }
+
+    try:
+        result = visualization_node(state)
+    finally:
+        get_settings.cache_clear()
+
+    assert result["chart_json"] is not None
+    assert result["chart_downsampled"] is True
+    assert result["chart_source_rows"] == 1000
+
+
+def test_visualization_node_skips_png_in_on_demand_mode(monkeypatch):
+    monkeypatch.setenv("CHART_IMAGE_MODE", "on_demand")
+    get_settings.cache_clear()
+    state = {
+        "validation_passed": True,
+        "chart_type": "bar",
+        "bq_results": {"data": [{"country": "France", "revenue": 10.0}, {"country": "Spain", "revenue": 7.0}]},
+    }
+
+    try:
+        result = visualization_node(state)
+    finally:
+        get_settings.cache_clear()
+
+    assert result["chart_json"] is not None
+    assert "chart_image_path" not in result
+    assert "chart_image_pending" not in result